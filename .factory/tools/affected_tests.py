@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""Test-impact selection for the verification-before-completion droid.
+
+Keeps a map from every Python and JavaScript/TypeScript file in the
+repository to the local files it imports, and answers "which tests can see
+this change?" by walking that graph backwards from the files ``git diff``
+reports. The map lives in ``.factory/.cache/affected-tests.json`` and is
+brought up to date on every run by re-parsing only files whose size or
+mtime changed. Optional coverage data adds edges static imports miss.
+
+When the map cannot vouch for a change the whole suite is selected instead:
+a test-wide configuration file changed (``conftest.py``, ``package.json``,
+lock files, ``tsconfig.json`` ...), a changed file is not code and not on
+the ``--ignore`` list, or no test reaches a changed source file.
+
+Usage::
+
+    python .factory/tools/affected_tests.py                      # tests affected by uncommitted changes
+    python .factory/tools/affected_tests.py --base main --run "python -m pytest -q"
+    python .factory/tools/affected_tests.py --coverage coverage.json --json
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import posixpath
+import re
+import shlex
+import subprocess
+import sys
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+CACHE_FILE = os.path.join(".factory", ".cache", "affected-tests.json")
+FORMAT = 1
+
+PYTHON_EXTENSIONS = (".py",)
+JS_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+CODE_EXTENSIONS = PYTHON_EXTENSIONS + JS_EXTENSIONS
+
+# Files every test depends on: a change selects the full suite
+GLOBAL_PATTERNS = (
+    "conftest.py", "pytest.ini", "tox.ini", "noxfile.py", "setup.py", "setup.cfg", "pyproject.toml",
+    "requirements*.txt", "Pipfile*", "poetry.lock", "package.json", "package-lock.json", "yarn.lock",
+    "pnpm-lock.yaml", "tsconfig*.json", "jest.config.*", "vitest.config.*", "babel.config.*", ".babelrc",
+    "Makefile",
+)
+# Files no test can observe
+DEFAULT_IGNORE = ("LICENSE*", "CHANGELOG*", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico")
+
+PY_IMPORT = re.compile(r"^[ \t]*import[ \t]+([\w. \t,]+)", re.M)
+PY_FROM = re.compile(r"^[ \t]*from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+(\([^)]*\)|[^\n#]+)", re.M)
+JS_IMPORT = re.compile(
+    r"""(?:import|export)\s[^'";]*?from\s*['"]([^'"]+)['"]"""
+    r"""|\bimport\s*\(?\s*['"]([^'"]+)['"]"""
+    r"""|\brequire\s*\(\s*['"]([^'"]+)['"]\s*\)"""
+)
+
+
+class Selection(NamedTuple):
+    tests: List[str]
+    full: bool
+    reason: str
+    changed: List[str]
+
+
+def is_test_file(path: str) -> bool:
+    name = posixpath.basename(path)
+    if name.endswith(PYTHON_EXTENSIONS):
+        return name.startswith("test_") or name.endswith("_test.py")
+    if name.endswith(JS_EXTENSIONS):
+        return ".test." in name or ".spec." in name or "/__tests__/" in f"/{path}"
+    return False
+
+
+def is_global(path: str) -> bool:
+    name = posixpath.basename(path)
+    return any(fnmatch.fnmatch(name, pattern) for pattern in GLOBAL_PATTERNS)
+
+
+def parse_imports(path: str, text: str) -> List[str]:
+    """Raw import specifiers in ``text``: dotted modules for Python, paths for JS."""
+    if path.endswith(PYTHON_EXTENSIONS):
+        found = []
+        for match in PY_IMPORT.finditer(text):
+            found += [name.split()[0] for name in match.group(1).split(",") if name.strip()]
+        for match in PY_FROM.finditer(text):
+            module, names = match.group(1), match.group(2).strip("() \t")
+            for name in names.replace("\n", " ").split(","):
+                name = name.split()[0] if name.split() else ""
+                if name and name != "*":
+                    # `from pkg import mod` may import a submodule; resolution tries both
+                    found.append(f"{module}.{name}" if not module.endswith(".") else module + name)
+            found.append(module)
+        return found
+    return [a or b or c for a, b, c in JS_IMPORT.findall(text)]
+
+
+class ImpactMap:
+    """Local import edges per file, refreshed incrementally from file signatures."""
+
+    def __init__(self, root: str, cache_path: Optional[str] = None):
+        self.root = root
+        self.cache_path = cache_path
+        self.files: Dict[str, dict] = {}  # path -> {"sig": [size, mtime_ns], "specs": [...]}
+        self.coverage: Dict[str, List[str]] = {}  # source -> tests that executed it
+        self._edges: Optional[Dict[str, Set[str]]] = None
+
+    @classmethod
+    def load(cls, root: str, cache_path: Optional[str] = None) -> "ImpactMap":
+        impact = cls(root, cache_path)
+        if cache_path:
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("format") == FORMAT:
+                    impact.files = data["files"]
+                    impact.coverage = data.get("coverage", {})
+            except (OSError, ValueError, KeyError):
+                pass
+        return impact
+
+    def save(self) -> None:
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(f"{self.cache_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"format": FORMAT, "files": self.files, "coverage": self.coverage}, f)
+        os.replace(f"{self.cache_path}.tmp", self.cache_path)
+
+    def update(self, paths: Iterable[str]) -> int:
+        """Sync the map with ``paths``; return how many files were (re)parsed."""
+        present = set()
+        parsed = 0
+        for path in paths:
+            if not path.endswith(CODE_EXTENSIONS):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.root, path))
+            except OSError:
+                continue
+            present.add(path)
+            signature = [stat.st_size, stat.st_mtime_ns]
+            entry = self.files.get(path)
+            if entry is not None and entry["sig"] == signature:
+                continue
+            with open(os.path.join(self.root, path), encoding="utf-8", errors="replace") as f:
+                self.files[path] = {"sig": signature, "specs": parse_imports(path, f.read())}
+            parsed += 1
+        for path in set(self.files) - present:
+            del self.files[path]
+        self._edges = None
+        return parsed
+
+    def add_coverage(self, path: str) -> int:
+        """Merge coverage data: coverage.py JSON with contexts, or ``{test: [sources]}``."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        pairs = []
+        if isinstance(data.get("files"), dict):
+            for source, details in data["files"].items():
+                for contexts in details.get("contexts", {}).values():
+                    for context in contexts:
+                        test = context.split("::")[0].split("|")[0]
+                        if test:
+                            pairs.append((source, test))
+        else:
+            pairs = [(source, test) for test, sources in data.items() for source in sources]
+        for source, test in pairs:
+            source = os.path.relpath(os.path.join(self.root, source), self.root).replace(os.sep, "/")
+            tests = self.coverage.setdefault(source, [])
+            if test not in tests:
+                tests.append(test)
+        self._edges = None
+        return len(pairs)
+
+    @property
+    def tests(self) -> List[str]:
+        return sorted(path for path in self.files if is_test_file(path))
+
+    def _module_index(self) -> Dict[str, List[str]]:
+        index: Dict[str, List[str]] = {}
+        for path in self.files:
+            if not path.endswith(".py"):
+                continue
+            module = path[:-3].replace("/", ".")
+            if module.endswith(".__init__"):
+                module = module[: -len(".__init__")]
+            parts = module.split(".")
+            # Importable from the root, from a src/lib layout, and by bare name from a sys.path entry
+            names = {module, parts[-1]}
+            if parts[0] in ("src", "lib") and len(parts) > 1:
+                names.add(".".join(parts[1:]))
+            for name in names:
+                index.setdefault(name, []).append(path)
+        return index
+
+    def _resolve_python(self, path: str, spec: str, index: Dict[str, List[str]]) -> List[str]:
+        if spec.startswith("."):
+            level = len(spec) - len(spec.lstrip("."))
+            package = path.split("/")[:-1]
+            package = package[: len(package) - (level - 1)] if level > 1 else package
+            rest = spec[level:]
+            spec = ".".join(package + ([rest] if rest else []))
+        candidates = index.get(spec, [])
+        # Several files share a bare name: prefer the one beside the importer, else keep them all
+        local = [c for c in candidates if posixpath.dirname(c) == posixpath.dirname(path)]
+        return local if len(local) == 1 else candidates
+
+    def _resolve_js(self, path: str, spec: str) -> List[str]:
+        if not spec.startswith((".", "/")):
+            return []  # A package, not a repository file
+        base = posixpath.normpath(posixpath.join(posixpath.dirname(path), spec)).lstrip("/")
+        for candidate in [base] + [base + ext for ext in JS_EXTENSIONS] + \
+                [f"{base}/index{ext}" for ext in JS_EXTENSIONS]:
+            if candidate in self.files:
+                return [candidate]
+        return []
+
+    def edges(self) -> Dict[str, Set[str]]:
+        """Reverse edges: file -> files (and tests) that import or executed it."""
+        if self._edges is None:
+            index = self._module_index()
+            reverse: Dict[str, Set[str]] = {}
+            for path, entry in self.files.items():
+                for spec in entry["specs"]:
+                    if path.endswith(".py"):
+                        targets = self._resolve_python(path, spec, index)
+                    else:
+                        targets = self._resolve_js(path, spec)
+                    for target in targets:
+                        if target != path:
+                            reverse.setdefault(target, set()).add(path)
+            for source, tests in self.coverage.items():
+                reverse.setdefault(source, set()).update(tests)
+            self._edges = reverse
+        return self._edges
+
+    def affected_tests(self, path: str) -> Set[str]:
+        """Tests that transitively import (or executed) ``path``."""
+        reverse = self.edges()
+        seen, stack = {path}, [path]
+        while stack:
+            for dependent in reverse.get(stack.pop(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return {p for p in seen if is_test_file(p)}
+
+
+def select(impact: ImpactMap, changed: Sequence[str], ignore: Sequence[str] = DEFAULT_IGNORE) -> Selection:
+    """Tests to run for ``changed``, or every test when the map cannot vouch for a change."""
+    selected: Set[str] = set()
+    changed = sorted(set(changed))
+
+    def full(reason: str) -> Selection:
+        return Selection(impact.tests, True, reason, changed)
+
+    for path in changed:
+        if any(fnmatch.fnmatch(path, p) or fnmatch.fnmatch(posixpath.basename(path), p) for p in ignore):
+            continue
+        if is_global(path):
+            return full(f"{path} affects every test")
+        if not path.endswith(CODE_EXTENSIONS):
+            return full(f"{path} is not code the import map can follow")
+        tests = impact.affected_tests(path)
+        if not tests:
+            return full(f"no test reaches {path}")
+        selected |= tests
+    # Deleted tests cannot run
+    return Selection(sorted(t for t in selected if t in impact.files), False, "", changed)
+
+
+def git_lines(args: Sequence[str], root: str) -> List[str]:
+    result = subprocess.run(["git", *args], cwd=root, check=True, capture_output=True, text=True)
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def changed_files(root: str, base: str = "HEAD") -> List[str]:
+    """Files that differ from ``base`` in the working tree, plus untracked files."""
+    changed = git_lines(["diff", "--name-only", base], root) + \
+        git_lines(["ls-files", "--others", "--exclude-standard"], root)
+    cache_dir = posixpath.dirname(CACHE_FILE.replace(os.sep, "/")) + "/"
+    return [path for path in changed if not path.startswith(cache_dir)]
+
+
+def repository_files(root: str) -> List[str]:
+    return git_lines(["ls-files", "--cached", "--others", "--exclude-standard"], root)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Select the tests affected by a change")
+    parser.add_argument("--base", default="HEAD", help="Compare the working tree against this ref (default: HEAD)")
+    parser.add_argument("--coverage", action="append", default=[],
+                        help="coverage.py JSON (with --show-contexts) or {test: [sources]} map to merge")
+    parser.add_argument("--ignore", action="append", default=[], help="Glob of changed files no test can observe")
+    parser.add_argument("--run", metavar="CMD", help="Run CMD with the selected tests (CMD alone for the full suite)")
+    parser.add_argument("--json", action="store_true", help="Print the selection as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        root = git_lines(["rev-parse", "--show-toplevel"], os.curdir)[0]
+        started = time.perf_counter()
+        impact = ImpactMap.load(root, os.path.join(root, CACHE_FILE))
+        parsed = impact.update(repository_files(root))
+        for path in args.coverage:
+            impact.add_coverage(path)
+        impact.save()
+        selection = select(impact, changed_files(root, args.base), DEFAULT_IGNORE + tuple(args.ignore))
+    except subprocess.CalledProcessError as error:
+        print(f"❌ {error.stderr or error}".strip(), file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if selection.full:
+        print(f"⚠️  Full suite ({len(selection.tests)} test files): {selection.reason}", file=sys.stderr)
+    else:
+        print(f"🔍 {len(selection.changed)} changed file(s) → {len(selection.tests)} of {len(impact.tests)} "
+              f"test files ({parsed} file(s) re-parsed in {elapsed:.2f}s)", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(selection._asdict(), indent=2))
+    elif not args.run:
+        print("\n".join(selection.tests))
+    if not args.run:
+        return 0
+    if selection.full:
+        command = args.run
+    elif selection.tests:
+        command = f"{args.run} {' '.join(shlex.quote(t) for t in selection.tests)}"
+    else:
+        print("✅ No tests affected", file=sys.stderr)
+        return 0
+    return subprocess.run(command, shell=True, cwd=root).returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
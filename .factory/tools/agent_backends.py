@@ -0,0 +1,103 @@
+"""Pluggable agent backends shared by the dispatch and scenario runner tools.
+
+A backend takes a prompt and a workspace directory and returns an
+:class:`AgentReply`. Two are provided:
+
+- ``stub``: a deterministic local agent for offline runs and tests. Its reply
+  and its simulated latency are derived from a hash of the prompt, so the
+  same input always gives the same output. Canned replies can be given per
+  prompt. It writes its reply to ``AGENT_REPLY.md`` in the workspace.
+- ``command``: runs a shell command (for example a headless agent CLI) in the
+  workspace with the prompt on stdin and ``AGENT_WORKSPACE`` set. The
+  command runs in its own process group, which is killed if the wait for it
+  is cancelled or times out.
+
+Backends are chosen with a spec string: ``stub``, ``stub:0.2`` (maximum
+simulated latency in seconds) or ``command:<shell command>``.
+"""
+
+import asyncio
+import hashlib
+import os
+import signal
+from typing import Dict, NamedTuple, Optional
+
+REPLY_FILE = "AGENT_REPLY.md"
+
+
+class AgentReply(NamedTuple):
+    """What an agent produced for one prompt."""
+
+    text: str
+    ok: bool = True
+
+
+class StubBackend:
+    """Deterministic offline agent: same prompt, same reply, same latency."""
+
+    name = "stub"
+
+    def __init__(self, max_latency: float = 0.05, reply: Optional[str] = None,
+                 replies: Optional[Dict[str, str]] = None):
+        self.max_latency = max_latency
+        self.reply = reply
+        self.replies = dict(replies or {})
+
+    def digest(self, prompt: str) -> str:
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def latency(self, prompt: str) -> float:
+        # Spread between half and all of max_latency, fixed per prompt
+        fraction = int(self.digest(prompt)[:8], 16) / 0xFFFFFFFF
+        return self.max_latency * (0.5 + fraction / 2)
+
+    async def run(self, prompt: str, workspace: str) -> AgentReply:
+        await asyncio.sleep(self.latency(prompt))
+        text = self.replies.get(prompt, self.reply)
+        if text is None:
+            text = f"stub reply {self.digest(prompt)[:12]}"
+        with open(os.path.join(workspace, REPLY_FILE), "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        return AgentReply(text)
+
+
+class CommandBackend:
+    """Run a shell command per prompt, in the workspace, prompt on stdin."""
+
+    name = "command"
+
+    def __init__(self, command: str):
+        self.command = command
+
+    async def run(self, prompt: str, workspace: str) -> AgentReply:
+        process = await asyncio.create_subprocess_shell(
+            self.command,
+            cwd=workspace,
+            env=dict(os.environ, AGENT_WORKSPACE=workspace),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            start_new_session=True,
+        )
+        try:
+            output, _ = await process.communicate(prompt.encode("utf-8"))
+        except asyncio.CancelledError:
+            # Timeouts arrive as cancellation; kill the shell and everything
+            # it started so no agent keeps writing into the workspace
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await process.wait()
+            raise
+        return AgentReply(output.decode("utf-8", "replace").strip(), process.returncode == 0)
+
+
+def load_backend(spec: str):
+    """Build a backend from ``stub``, ``stub:<max latency>`` or ``command:<cmd>``."""
+    kind, _, argument = spec.partition(":")
+    if kind == "stub":
+        return StubBackend(float(argument)) if argument else StubBackend()
+    if kind == "command" and argument:
+        return CommandBackend(argument)
+    raise ValueError(f"unknown agent backend {spec!r} (use 'stub', 'stub:<seconds>' or 'command:<cmd>')")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Batch pressure-scenario runner for testing-skills-with-subagents.
+
+Loads every scenario spec in a directory, runs them all concurrently
+against an agent backend (see ``agent_backends.py``), grades each reply and
+writes per-skill compliance rates and latency percentiles to a results file.
+
+A scenario is a ``.json`` file (one object or a list) or a ``.md`` file whose
+frontmatter holds the fields and whose body is the prompt::
+
+    ---
+    skill: test-driven-development
+    pressures: [time, sunk-cost]
+    expect: ["(?i)write (a|the) failing test first"]
+    forbid: ["(?i)skip (the )?tests?", "(?i)add tests later"]
+    runs: 3
+    ---
+    You spent 4 hours on this feature and the demo is in 10 minutes...
+
+A reply complies when every ``expect`` pattern matches and no ``forbid``
+pattern does. ``--mode green`` (the default) prepends the skill's droid to
+the prompt, ``--mode red`` runs the bare scenario as a baseline, and
+``--mode both`` does both so the report shows what the skill changes. With
+the stub backend a scenario's ``stub_reply`` is used as the agent's answer,
+which exercises grading offline.
+
+Usage::
+
+    python .factory/tools/scenario_runner.py scenarios/ --backend stub
+    python .factory/tools/scenario_runner.py scenarios/ --backend 'command:droid exec' \\
+        --mode both --jobs 8 --output scenario-results.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from agent_backends import StubBackend, load_backend
+from dispatch_agents import DEFAULT_TIMEOUT, Problem, Workspaces, dispatch
+
+DEFAULT_JOBS = 8
+DEFAULT_OUTPUT = "scenario-results.json"
+MODES = ("green", "red")
+
+
+class Scenario(NamedTuple):
+    id: str
+    skill: str
+    prompt: str
+    expect: Tuple[str, ...] = ()
+    forbid: Tuple[str, ...] = ()
+    pressures: Tuple[str, ...] = ()
+    runs: int = 1
+    stub_reply: Optional[str] = None
+
+
+class Outcome(NamedTuple):
+    scenario: str
+    skill: str
+    mode: str
+    run: int
+    status: str  # complied, violated, or the dispatch status (timeout, error ...)
+    elapsed: float
+    violations: List[str]
+
+
+def _frontmatter_value(raw: str):
+    raw = raw.strip()
+    if raw.startswith("[") and raw.endswith("]"):
+        return [_frontmatter_value(item) for item in re.findall(r'"(?:[^"\\]|\\.)*"|\'[^\']*\'|[^,]+', raw[1:-1])]
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in "\"'":
+        return raw[1:-1].replace('\\"', '"') if raw[0] == '"' else raw[1:-1]
+    return int(raw) if raw.isdigit() else raw
+
+
+def parse_markdown(text: str) -> dict:
+    """Frontmatter fields plus the body as ``prompt``."""
+    match = re.match(r"^---\n(.*?)\n---\n?(.*)$", text, re.S)
+    if not match:
+        return {"prompt": text.strip()}
+    fields: Dict[str, object] = {}
+    key = None
+    for line in match.group(1).splitlines():
+        item = re.match(r"^\s+-\s+(.*)$", line)
+        if item and key:
+            fields.setdefault(key, [])
+            fields[key].append(_frontmatter_value(item.group(1)))
+        elif ":" in line:
+            key, _, value = line.partition(":")
+            key = key.strip()
+            if value.strip():
+                fields[key] = _frontmatter_value(value)
+    fields["prompt"] = match.group(2).strip()
+    return fields
+
+
+def load_scenarios(directory: str) -> List[Scenario]:
+    """Every scenario spec under ``directory``, in path order."""
+    scenarios: List[Scenario] = []
+    seen = set()
+    paths = sorted(os.path.relpath(os.path.join(dirpath, name), directory).replace(os.sep, "/")
+                   for dirpath, _, filenames in os.walk(directory)
+                   for name in filenames if name.endswith((".json", ".md")))
+    for relative in paths:
+        path = os.path.join(directory, relative)
+        stem = os.path.splitext(relative)[0]
+        with open(path, encoding="utf-8") as f:
+            specs = json.load(f) if relative.endswith(".json") else parse_markdown(f.read())
+        specs = specs if isinstance(specs, list) else [specs]
+        for number, spec in enumerate(specs, 1):
+            scenario_id = str(spec.get("id") or (stem if len(specs) == 1 else f"{stem}#{number}"))
+            if scenario_id in seen:
+                raise ValueError(f"duplicate scenario id {scenario_id!r} in {path}")
+            if not spec.get("skill") or not spec.get("prompt"):
+                raise ValueError(f"scenario {scenario_id!r} in {path} needs 'skill' and 'prompt'")
+            for pattern in list(spec.get("expect", ())) + list(spec.get("forbid", ())):
+                re.compile(pattern)
+            seen.add(scenario_id)
+            scenarios.append(Scenario(
+                scenario_id, spec["skill"], spec["prompt"],
+                tuple(spec.get("expect", ())), tuple(spec.get("forbid", ())),
+                tuple(spec.get("pressures", ())), int(spec.get("runs", 1)), spec.get("stub_reply"),
+            ))
+    return scenarios
+
+
+def compose_prompt(scenario: Scenario, mode: str, droids_dir: str) -> str:
+    if mode == "red":
+        return scenario.prompt
+    with open(os.path.join(droids_dir, f"{scenario.skill}.md"), encoding="utf-8") as f:
+        skill = f.read()
+    return f"{skill.rstrip()}\n\n---\n\n{scenario.prompt}"
+
+
+def grade(scenario: Scenario, reply: str) -> List[str]:
+    """Reasons the reply does not comply; empty when it does."""
+    violations = [f"missing /{p}/" for p in scenario.expect if not re.search(p, reply)]
+    violations += [f"forbidden /{p}/" for p in scenario.forbid if re.search(p, reply)]
+    return violations
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered), max(1, math.ceil(fraction * len(ordered)))) - 1]
+
+
+def summarize(outcomes: Sequence[Outcome]) -> Dict[str, Dict[str, dict]]:
+    """Per skill and mode: compliance rate over graded runs and latency distribution."""
+    groups: Dict[Tuple[str, str], List[Outcome]] = {}
+    for outcome in outcomes:
+        groups.setdefault((outcome.skill, outcome.mode), []).append(outcome)
+    summary: Dict[str, Dict[str, dict]] = {}
+    for (skill, mode), runs in sorted(groups.items()):
+        graded = [o for o in runs if o.status in ("complied", "violated")]
+        complied = sum(o.status == "complied" for o in graded)
+        latencies = [o.elapsed for o in graded]
+        summary.setdefault(skill, {})[mode] = {
+            "runs": len(runs),
+            "complied": complied,
+            "violated": len(graded) - complied,
+            "errors": len(runs) - len(graded),
+            "compliance": round(complied / len(graded), 4) if graded else None,
+            "latency": {
+                "mean": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+                "p50": round(percentile(latencies, 0.5), 4),
+                "p90": round(percentile(latencies, 0.9), 4),
+                "p99": round(percentile(latencies, 0.99), 4),
+                "max": round(max(latencies, default=0.0), 4),
+            },
+        }
+    return summary
+
+
+async def run_scenarios(scenarios: Sequence[Scenario], backend, droids_dir: str, modes: Sequence[str] = ("green",),
+                        jobs: int = DEFAULT_JOBS, timeout: float = DEFAULT_TIMEOUT):
+    """Run every scenario in every mode concurrently; return outcomes and the dispatch report."""
+    problems, plan, stubbed = [], {}, {}
+    for scenario in scenarios:
+        for mode in modes:
+            prompt = compose_prompt(scenario, mode, droids_dir)
+            if scenario.stub_reply is not None and isinstance(backend, StubBackend):
+                # The stub only sees the prompt, so one prompt cannot carry two canned replies
+                owner = stubbed.setdefault(prompt, scenario)
+                if owner.stub_reply != scenario.stub_reply:
+                    raise ValueError(f"scenarios {owner.id!r} and {scenario.id!r} send the same {mode} prompt "
+                                     "with different stub replies")
+                backend.replies.setdefault(prompt, scenario.stub_reply)
+            for run in range(1, scenario.runs + 1):
+                problem_id = f"{scenario.id}[{mode}]#{run}"
+                problems.append(Problem(problem_id, prompt))
+                plan[problem_id] = (scenario, mode, run)
+
+    workspaces = Workspaces()
+    try:
+        report = await dispatch(problems, backend, workspaces, jobs, timeout)
+    finally:
+        workspaces.cleanup()
+
+    outcomes = []
+    for result in report.results:
+        scenario, mode, run = plan[result.id]
+        if result.status == "ok":
+            violations = grade(scenario, result.output)
+            status = "violated" if violations else "complied"
+        else:
+            violations, status = [result.output], result.status
+        outcomes.append(Outcome(scenario.id, scenario.skill, mode, run, status, result.elapsed, violations))
+    return outcomes, report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run skill pressure scenarios concurrently")
+    parser.add_argument("scenarios", help="Directory of .json / .md scenario specs")
+    parser.add_argument("--backend", default="stub", help="stub, stub:<seconds> or command:<cmd> (default: stub)")
+    parser.add_argument("--mode", choices=("green", "red", "both"), default="green",
+                        help="With the skill, without it (baseline), or both (default: green)")
+    parser.add_argument("--skill", action="append", help="Only run scenarios for this skill")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS, help=f"Agents at once (default: {DEFAULT_JOBS})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds per run (default: 600)")
+    parser.add_argument("--droids", default=os.path.join(".factory", "droids"), help="Droid directory")
+    parser.add_argument("--min-compliance", type=float, default=1.0,
+                        help="Required green compliance per skill (default: 1.0)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"Results file (default: {DEFAULT_OUTPUT})")
+    args = parser.parse_args(argv)
+
+    try:
+        scenarios = load_scenarios(args.scenarios)
+        backend = load_backend(args.backend)
+    except (OSError, ValueError, re.error) as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    if args.skill:
+        scenarios = [s for s in scenarios if s.skill in args.skill]
+    if not scenarios:
+        print("❌ No scenarios found", file=sys.stderr)
+        return 1
+    modes = MODES if args.mode == "both" else (args.mode,)
+    try:
+        outcomes, report = asyncio.run(run_scenarios(scenarios, backend, args.droids, modes, args.jobs, args.timeout))
+    except OSError as error:
+        print(f"❌ Cannot load skill: {error}", file=sys.stderr)
+        return 1
+    except ValueError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    summary = summarize(outcomes)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "backend": args.backend,
+            "modes": list(modes),
+            "wall_seconds": round(report.wall, 3),
+            "serial_seconds": round(report.serial, 3),
+            "skills": summary,
+            "runs": [o._asdict() for o in outcomes],
+        }, f, indent=2)
+
+    passed = True
+    for skill, by_mode in summary.items():
+        parts = [f"{mode} {stats['complied']}/{stats['runs']} "
+                 f"({'n/a' if stats['compliance'] is None else format(stats['compliance'], '.0%')})"
+                 for mode, stats in by_mode.items()]
+        green = by_mode.get("green")
+        ok = green is None or (green["compliance"] or 0.0) >= args.min_compliance
+        passed = passed and ok
+        latency = by_mode[modes[0]]["latency"]
+        print(f"{'✅' if ok else '❌'} {skill}: {', '.join(parts)}; "
+              f"p50 {latency['p50']:.2f}s p90 {latency['p90']:.2f}s")
+    for outcome in outcomes:
+        # Red-mode violations are the expected baseline; only show them for green or when a run broke
+        if outcome.status != "complied" and (outcome.mode == "green" or outcome.status != "violated"):
+            print(f"   ❌ {outcome.scenario} [{outcome.mode}] #{outcome.run}: {'; '.join(outcome.violations)[:160]}")
+    print(f"📊 {len(outcomes)} runs in {report.wall:.1f}s wall ({report.speedup:.1f}x speedup) → {args.output}")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Condition-based waiting for tests, backing the condition-based-waiting droid.
+
+``wait_for`` re-checks a condition until it returns something truthy. Between
+checks it sleeps with adaptive backoff, so a fast condition is seen within a
+millisecond and a slow one costs a few checks per second instead of a hundred.
+Given a wake source (a socket, pipe, file descriptor or :class:`Signal`), it
+blocks on that source through :mod:`selectors` and re-checks only when it
+becomes readable, so nothing is polled at all.
+
+``wait_for_file`` uses inotify on Linux to wake when the file appears and
+falls back to backoff polling elsewhere. ``Signal`` gives in-process events
+the same zero-poll behaviour: producers call ``notify()`` and waiters wake
+immediately.
+
+Every wait produces a :class:`WaitStats` record (checks, wakes, elapsed time,
+whether it timed out), passed to ``on_complete`` or to the reporter installed
+with :func:`set_reporter`, and attached to :class:`WaitTimeout`.
+
+Usage from a shell::
+
+    python .factory/tools/wait_for.py --file build/ready.flag --timeout 30
+    python .factory/tools/wait_for.py --port localhost:8080
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import selectors
+import socket
+import sys
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, TypeVar, Union
+
+T = TypeVar("T")
+WakeSource = Union[int, Any]
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_INTERVAL = 0.001
+DEFAULT_MAX_INTERVAL = 0.1
+DEFAULT_BACKOFF = 2.0
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_CREATE = 0x100
+_IN_MOVED_TO = 0x80
+_IN_CLOSE_WRITE = 0x8
+_IN_ATTRIB = 0x4
+
+
+class WaitStats(NamedTuple):
+    """Instrumentation for one wait."""
+
+    description: str
+    satisfied: bool
+    elapsed: float
+    checks: int
+    wakes: int
+    timeout: float
+    mode: str
+
+
+class WaitTimeout(TimeoutError):
+    """Raised when a condition is not met in time; carries the wait's stats."""
+
+    def __init__(self, stats: WaitStats):
+        super().__init__(f"Timeout waiting for {stats.description} after {stats.timeout:g}s "
+                         f"({stats.checks} checks, {stats.wakes} wakes)")
+        self.stats = stats
+
+
+_reporter: Optional[Callable[[WaitStats], None]] = None
+
+
+def set_reporter(reporter: Optional[Callable[[WaitStats], None]]) -> None:
+    """Send the stats of every wait without its own ``on_complete`` to ``reporter``."""
+    global _reporter
+    _reporter = reporter
+
+
+class Signal:
+    """A self-pipe that waiters can block on until a producer calls ``notify``."""
+
+    def __init__(self):
+        self._read, self._write = os.pipe()
+        os.set_blocking(self._read, False)
+        os.set_blocking(self._write, False)
+
+    def fileno(self) -> int:
+        return self._read
+
+    def notify(self) -> None:
+        try:
+            os.write(self._write, b"\0")
+        except BlockingIOError:
+            pass  # Pipe already full; waiters will wake anyway
+
+    def drain(self) -> None:
+        try:
+            while os.read(self._read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self._read)
+        os.close(self._write)
+
+    def __enter__(self) -> "Signal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _drain(source: WakeSource) -> None:
+    # Signal and inotify wake-ups are consumed here; sockets are left alone.
+    drain = getattr(source, "drain", None)
+    if drain is not None:
+        drain()
+
+
+def wait_for(
+    condition: Callable[[], T],
+    description: str = "condition",
+    timeout: float = DEFAULT_TIMEOUT,
+    *,
+    wake: Sequence[WakeSource] = (),
+    interval: float = DEFAULT_INTERVAL,
+    max_interval: Optional[float] = None,
+    backoff: float = DEFAULT_BACKOFF,
+    on_complete: Optional[Callable[[WaitStats], None]] = None,
+) -> T:
+    """Return ``condition()``'s first truthy result, or raise :class:`WaitTimeout`.
+
+    With ``wake`` sources the wait blocks until one of them is readable and
+    does not poll; pass ``max_interval`` as well to re-check periodically in
+    case the condition can change without a wake-up. Without wake sources the
+    sleep between checks starts at ``interval`` and grows by ``backoff`` up to
+    ``max_interval`` (default 0.1s). Sockets passed as wake sources are only
+    watched, never read; drain them in ``condition``.
+    """
+    selector = selectors.DefaultSelector() if wake else None
+    for source in wake:
+        selector.register(source, selectors.EVENT_READ)
+    cap = max_interval if max_interval is not None or wake else DEFAULT_MAX_INTERVAL
+    mode = "poll" if not wake else "event" if cap is None else "event+poll"
+
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = interval
+    checks = wakes = 0
+    try:
+        while True:
+            result = condition()
+            checks += 1
+            if result:
+                _report(WaitStats(description, True, time.monotonic() - started, checks, wakes, timeout, mode),
+                        on_complete)
+                return result
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                stats = WaitStats(description, False, time.monotonic() - started, checks, wakes, timeout, mode)
+                _report(stats, on_complete)
+                raise WaitTimeout(stats)
+
+            if selector is None:
+                time.sleep(min(delay, remaining))
+                delay = min(delay * backoff, cap)
+                continue
+
+            pause = remaining if cap is None else min(delay, remaining)
+            ready = selector.select(pause)
+            if ready:
+                wakes += 1
+                for key, _ in ready:
+                    _drain(key.fileobj)
+            elif cap is not None:
+                delay = min(delay * backoff, cap)
+    finally:
+        if selector is not None:
+            selector.close()
+
+
+def _report(stats: WaitStats, on_complete: Optional[Callable[[WaitStats], None]]) -> None:
+    reporter = on_complete or _reporter
+    if reporter is not None:
+        reporter(stats)
+
+
+class _Inotify:
+    """Minimal inotify binding (Linux only) used to wake on directory changes."""
+
+    _libc = None
+
+    def __init__(self, directory: str, mask: int):
+        libc = self._load()
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    @classmethod
+    def _load(cls):
+        if cls._libc is None:
+            if not sys.platform.startswith("linux"):
+                raise OSError("inotify is only available on Linux")
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            cls._libc = libc
+        return cls._libc
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def drain(self) -> None:
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def wait_for_file(path: str, timeout: float = DEFAULT_TIMEOUT, *,
+                  predicate: Optional[Callable[[str], bool]] = None, **kwargs) -> str:
+    """Wait until ``path`` exists (and satisfies ``predicate``), then return it.
+
+    On Linux the parent directory is watched with inotify, so the wait wakes
+    when the file is created, renamed into place or finishes being written.
+    """
+    check = predicate or os.path.exists
+    description = kwargs.pop("description", f"file {path}")
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        watch = _Inotify(directory, _IN_CREATE | _IN_MOVED_TO | _IN_CLOSE_WRITE | _IN_ATTRIB)
+    except (OSError, AttributeError):
+        watch = None  # No inotify here, or the directory does not exist yet
+
+    try:
+        wake = [watch] if watch is not None else []
+        return wait_for(lambda: path if check(path) else None, description, timeout, wake=wake, **kwargs)
+    finally:
+        if watch is not None:
+            watch.close()
+
+
+def wait_for_readable(source: WakeSource, timeout: float = DEFAULT_TIMEOUT, *,
+                      description: Optional[str] = None,
+                      on_complete: Optional[Callable[[WaitStats], None]] = None) -> WakeSource:
+    """Block without polling until ``source`` (socket, pipe, fd or Signal) has data to read.
+
+    The source is watched on its own selector rather than passed to
+    ``wait_for`` as a wake source, which would drain a Signal or inotify
+    source before the readiness check could see it. Nothing is read.
+    """
+    description = description or f"readable {source!r}"
+    started = time.monotonic()
+    with selectors.DefaultSelector() as selector:
+        selector.register(source, selectors.EVENT_READ)
+        ready = bool(selector.select(max(timeout, 0)))
+    stats = WaitStats(description, ready, time.monotonic() - started, 1, int(ready), timeout, "event")
+    _report(stats, on_complete)
+    if not ready:
+        raise WaitTimeout(stats)
+    return source
+
+
+def wait_for_port(host: str, port: int, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> bool:
+    """Wait until a TCP connection to ``host:port`` succeeds.
+
+    A refused connection gives nothing to block on, so this backs off
+    between attempts.
+    """
+    description = kwargs.pop("description", f"port {host}:{port}")
+
+    def accepting() -> bool:
+        try:
+            with socket.create_connection((host, port), timeout=min(1.0, timeout)):
+                return True
+        except OSError:
+            return False
+
+    return wait_for(accepting, description, timeout, **kwargs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Wait for a file or TCP port instead of sleeping")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--file", help="Wait until this file exists")
+    target.add_argument("--port", help="Wait until HOST:PORT accepts connections")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds before giving up (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--json", action="store_true", help="Print the wait's stats as JSON")
+    args = parser.parse_args(argv)
+
+    recorded: List[WaitStats] = []
+    try:
+        if args.file:
+            wait_for_file(args.file, args.timeout, on_complete=recorded.append)
+        else:
+            host, _, port = args.port.rpartition(":")
+            wait_for_port(host or "localhost", int(port), args.timeout, on_complete=recorded.append)
+    except WaitTimeout as error:
+        print(json.dumps(error.stats._asdict()) if args.json else f"❌ {error}")
+        return 1
+
+    stats = recorded[0]
+    if args.json:
+        print(json.dumps(stats._asdict()))
+    else:
+        print(f"✅ {stats.description} after {stats.elapsed * 1000:.0f}ms "
+              f"({stats.checks} checks, {stats.wakes} wakes, {stats.mode})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
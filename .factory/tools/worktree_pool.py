@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Pool of pre-warmed git worktrees for the using-git-worktrees droid.
+
+Creating a worktree is cheap; installing its dependencies is not. The pool
+keeps ``size`` worktrees checked out at a base commit with their dependency
+directories (``node_modules``, ``target`` ...) already populated by reflinking
+them from the main checkout, so handing one out is a ``git checkout -B`` and
+a ``git clean`` rather than a full install.
+
+Only reflinks are used by default: they are copy-on-write, so nothing a
+worktree does reaches the main checkout. Where the filesystem cannot reflink
+the directory is left to ``--setup``; hardlinking (``--link-mode hardlink``)
+shares inodes, so an in-place write such as ``npm install`` edits the main
+checkout too. Virtual environments are not shared by default because they
+are not relocatable: their scripts run the main checkout's interpreter and
+editable installs import the main checkout's sources. An explicitly shared
+directory with editable installs is skipped.
+
+State lives in ``<pool>/pool.json`` (default pool directory
+``.worktrees/.pool``) and is guarded by a lock file, so ``fill`` can run in
+the background while agents check worktrees out.
+
+Usage::
+
+    python .factory/tools/worktree_pool.py fill --size 4 --background
+    python .factory/tools/worktree_pool.py checkout feature/login
+    python .factory/tools/worktree_pool.py release .worktrees/.pool/wt-3
+    python .factory/tools/worktree_pool.py status
+    python .factory/tools/worktree_pool.py prune
+"""
+
+import argparse
+import contextlib
+import fcntl
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+
+DEFAULT_POOL_DIR = os.path.join(".worktrees", ".pool")
+STATE_FILE = "pool.json"
+LOCK_FILE = "pool.lock"
+DEFAULT_SIZE = 2
+
+# Dependency directories shared with pool worktrees, by the file that implies
+# them. No .venv: a virtual environment only works where it was created
+SHARED_BY_MARKER = {
+    "package.json": "node_modules",
+    "Cargo.toml": "target",
+}
+LINK_MODES = ("reflink", "hardlink", "copy")
+
+_FICLONE = 0x40049409
+
+
+def git(args: Sequence[str], cwd: str) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def repo_root(path: str = os.curdir) -> str:
+    return git(["rev-parse", "--show-toplevel"], path)
+
+
+def detect_shared(root: str) -> List[str]:
+    """Dependency directories that exist in the main checkout and can be shared."""
+    found = []
+    for marker, directory in SHARED_BY_MARKER.items():
+        if os.path.exists(os.path.join(root, marker)) and os.path.isdir(os.path.join(root, directory)):
+            if directory not in found:
+                found.append(directory)
+    return found
+
+
+def has_editable_installs(directory: str, root: str) -> bool:
+    """Whether a virtual environment under ``directory`` imports sources from ``root``."""
+    root = os.path.realpath(root)
+    for dirpath, _, filenames in os.walk(directory):
+        for name in filenames:
+            if name.startswith("__editable__") or name.endswith(".egg-link"):
+                return True
+            if name.endswith(".pth"):
+                try:
+                    with open(os.path.join(dirpath, name), encoding="utf-8", errors="replace") as f:
+                        lines = [line.strip() for line in f]
+                except OSError:
+                    continue
+                if any(os.path.isabs(line) and os.path.commonpath([root, os.path.realpath(line)]) == root
+                       for line in lines):
+                    return True
+    return False
+
+
+def _clone_file(src: str, dest: str, mode: str) -> str:
+    """Share one file's blocks with ``src``; return the method used."""
+    if mode == "reflink":
+        try:
+            with open(src, "rb") as fsrc, open(dest, "wb") as fdest:
+                fcntl.ioctl(fdest.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dest)
+            return "reflink"
+        except OSError:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(dest)
+            raise
+    if mode == "hardlink":
+        os.link(src, dest)
+        return "hardlink"
+    shutil.copy2(src, dest)
+    return "copy"
+
+
+def share_tree(src: str, dest: str, mode: str = "reflink") -> Dict[str, int]:
+    """Populate ``dest`` from ``src`` without copying file data where possible.
+
+    ``mode`` is ``reflink`` (copy-on-write, safe to modify; raises
+    ``OSError`` where the filesystem cannot reflink), ``hardlink`` (same
+    inode, so in-place edits reach ``src``) or ``copy``.
+    """
+    counts: Dict[str, int] = {}
+    for dirpath, dirnames, filenames in os.walk(src):
+        target = os.path.join(dest, os.path.relpath(dirpath, src))
+        os.makedirs(target, exist_ok=True)
+        for name in filenames:
+            source = os.path.join(dirpath, name)
+            destination = os.path.join(target, name)
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), destination)
+                method = "symlink"
+            else:
+                method = _clone_file(source, destination, mode)
+            counts[method] = counts.get(method, 0) + 1
+        for name in dirnames:
+            if os.path.islink(os.path.join(dirpath, name)):
+                os.symlink(os.readlink(os.path.join(dirpath, name)), os.path.join(target, name))
+        dirnames[:] = [d for d in dirnames if not os.path.islink(os.path.join(dirpath, d))]
+    return counts
+
+
+class WorktreePool:
+    """Ready and leased worktrees under one pool directory."""
+
+    def __init__(self, root: str, pool_dir: Optional[str] = None, shared: Optional[Sequence[str]] = None,
+                 link_mode: str = "reflink", setup: Optional[str] = None):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"link mode must be one of {', '.join(LINK_MODES)}, not {link_mode!r}")
+        self.root = root
+        self.pool_dir = os.path.join(root, pool_dir or DEFAULT_POOL_DIR)
+        self.shared = list(shared) if shared is not None else detect_shared(root)
+        self.link_mode = link_mode
+        self.setup = setup
+        self.skipped: Dict[str, str] = {}
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[dict]:
+        os.makedirs(self.pool_dir, exist_ok=True)
+        with open(os.path.join(self.pool_dir, LOCK_FILE), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            state = self._read_state()
+            yield state
+            self._write_state(state)
+
+    def _read_state(self) -> dict:
+        try:
+            with open(os.path.join(self.pool_dir, STATE_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"next": 1, "worktrees": {}}
+
+    def _write_state(self, state: dict) -> None:
+        path = os.path.join(self.pool_dir, STATE_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(f"{path}.tmp", path)
+
+    def status(self) -> Dict[str, dict]:
+        return self._read_state()["worktrees"]
+
+    def _create(self, path: str, base: str) -> None:
+        git(["worktree", "add", "--detach", path, base], self.root)
+        for directory in self.shared:
+            source = os.path.join(self.root, directory)
+            target = os.path.join(path, directory)
+            if not os.path.isdir(source) or os.path.exists(target) or directory in self.skipped:
+                continue
+            if has_editable_installs(source, self.root):
+                self._skip(directory, "it has editable installs of the main checkout")
+                continue
+            try:
+                share_tree(source, target, self.link_mode)
+            except OSError:
+                if self.link_mode != "reflink":
+                    raise
+                shutil.rmtree(target, ignore_errors=True)
+                self._skip(directory, "this filesystem cannot reflink; use --setup or --link-mode")
+        if self.setup:
+            subprocess.run(self.setup, shell=True, cwd=path, check=True)
+
+    def _skip(self, directory: str, reason: str) -> None:
+        # Once per pool; the worktree gets the directory from --setup instead
+        self.skipped[directory] = reason
+        print(f"⚠️  Not sharing {directory}: {reason}", file=sys.stderr)
+
+    def _reset(self, path: str, base: str, branch: Optional[str] = None) -> None:
+        if branch:
+            git(["checkout", "--force", "-B", branch, base], path)
+        else:
+            git(["checkout", "--force", "--detach", base], path)
+        excludes = [arg for directory in self.shared for arg in ("-e", f"/{directory}")]
+        git(["clean", "-fdx", *excludes], path)
+
+    def fill(self, size: int = DEFAULT_SIZE, base: str = "HEAD") -> List[str]:
+        """Create worktrees until ``size`` are ready; return the new paths."""
+        commit = git(["rev-parse", base], self.root)
+        created = []
+        while True:
+            with self._locked() as state:
+                ready = [w for w in state["worktrees"].values() if w["status"] in ("ready", "warming")]
+                if len(ready) >= size:
+                    return created
+                name = f"wt-{state['next']}"
+                state["next"] += 1
+                path = os.path.join(self.pool_dir, name)
+                state["worktrees"][name] = {"path": path, "status": "warming", "base": commit}
+            try:
+                self._create(path, commit)
+            except (OSError, subprocess.CalledProcessError):
+                with self._locked() as state:
+                    state["worktrees"].pop(name, None)
+                raise
+            with self._locked() as state:
+                state["worktrees"][name].update(status="ready", ready_at=time.time())
+            created.append(path)
+
+    def checkout(self, branch: Optional[str] = None, base: str = "HEAD") -> str:
+        """Lease a ready worktree reset to ``base`` (on ``branch`` if given)."""
+        commit = git(["rev-parse", base], self.root)
+        with self._locked() as state:
+            name = next((n for n, w in sorted(state["worktrees"].items()) if w["status"] == "ready"), None)
+            if name is None:
+                # Nothing warm: create one for this lease rather than fail
+                name = f"wt-{state['next']}"
+                state["next"] += 1
+                state["worktrees"][name] = {"path": os.path.join(self.pool_dir, name), "base": commit}
+                cold = True
+            else:
+                cold = False
+            entry = state["worktrees"][name]
+            entry.update(status="leased", branch=branch, leased_at=time.time())
+
+        try:
+            if cold:
+                self._create(entry["path"], commit)
+            self._reset(entry["path"], commit, branch)
+        except (OSError, subprocess.CalledProcessError):
+            self._unlease(name, drop=cold)
+            raise
+        with self._locked() as state:
+            state["worktrees"][name]["base"] = commit
+        return entry["path"]
+
+    def release(self, path: str) -> None:
+        """Return a leased worktree to the pool, detached at its base commit."""
+        path = os.path.abspath(path)
+        with self._locked() as state:
+            name = next((n for n, w in state["worktrees"].items() if os.path.abspath(w["path"]) == path), None)
+            if name is None:
+                raise KeyError(f"{path} is not a pool worktree")
+            entry = state["worktrees"][name]
+        try:
+            self._reset(path, entry["base"])
+        except (OSError, subprocess.CalledProcessError):
+            self._unlease(name)
+            raise
+        with self._locked() as state:
+            state["worktrees"][name].update(status="ready", branch=None)
+
+    def _unlease(self, name: str, drop: bool = False) -> None:
+        # A failed checkout or release must not strand the lease: warm entries
+        # go back to ready (checkout resets them anyway), cold ones are removed
+        with self._locked() as state:
+            entry = state["worktrees"].get(name)
+            if entry is None:
+                return
+            if drop:
+                subprocess.run(["git", "worktree", "remove", "--force", entry["path"]], cwd=self.root,
+                               capture_output=True)
+                shutil.rmtree(entry["path"], ignore_errors=True)
+                del state["worktrees"][name]
+            else:
+                entry.update(status="ready", branch=None)
+                entry.pop("leased_at", None)
+
+    def prune(self) -> int:
+        """Remove every pool worktree that is not leased."""
+        removed = 0
+        with self._locked() as state:
+            for name, entry in list(state["worktrees"].items()):
+                if entry["status"] == "leased":
+                    continue
+                subprocess.run(["git", "worktree", "remove", "--force", entry["path"]], cwd=self.root,
+                               capture_output=True)
+                shutil.rmtree(entry["path"], ignore_errors=True)
+                del state["worktrees"][name]
+                removed += 1
+        git(["worktree", "prune"], self.root)
+        return removed
+
+
+def _spawn_background(argv: List[str]) -> int:
+    args = [a for a in argv if a != "--background"]
+    subprocess.Popen([sys.executable, os.path.abspath(__file__), *args], start_new_session=True,
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    print("🔄 Warming worktrees in the background", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(description="Manage a pool of pre-warmed git worktrees")
+    parser.add_argument("--pool-dir", default=DEFAULT_POOL_DIR, help=f"Pool directory (default: {DEFAULT_POOL_DIR})")
+    parser.add_argument("--share", action="append",
+                        help="Dependency directory to share (default: detected node_modules and target). "
+                             "Virtual environments are not relocatable; ones with editable installs are skipped")
+    parser.add_argument("--link-mode", choices=LINK_MODES, default="reflink",
+                        help="How shared directories are populated (default: reflink, skipping directories "
+                             "the filesystem cannot reflink). hardlink shares inodes with the main checkout, "
+                             "so in-place writes such as npm install change it too")
+    parser.add_argument("--setup", help="Command run in each new worktree after sharing, e.g. 'npm install'")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fill = commands.add_parser("fill", help="Create worktrees until SIZE are ready")
+    fill.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    fill.add_argument("--base", default="HEAD")
+    fill.add_argument("--background", action="store_true", help="Warm worktrees in a detached process")
+
+    checkout = commands.add_parser("checkout", help="Lease a ready worktree and print its path")
+    checkout.add_argument("branch", nargs="?", help="Branch to create at the base commit")
+    checkout.add_argument("--base", default="HEAD")
+    checkout.add_argument("--refill", type=int, metavar="SIZE", help="Top the pool back up in the background")
+
+    release = commands.add_parser("release", help="Return a worktree to the pool")
+    release.add_argument("path")
+
+    commands.add_parser("status", help="List pool worktrees")
+    commands.add_parser("prune", help="Remove every worktree that is not leased")
+    args = parser.parse_args(argv)
+
+    try:
+        pool = WorktreePool(repo_root(), args.pool_dir, args.share, args.link_mode, args.setup)
+        if args.command == "fill":
+            if args.background:
+                return _spawn_background(argv)
+            created = pool.fill(args.size, args.base)
+            print(f"✅ {len(created)} worktree(s) warmed, pool holds {args.size} ready")
+        elif args.command == "checkout":
+            started = time.perf_counter()
+            path = pool.checkout(args.branch, args.base)
+            print(path)
+            print(f"✅ Worktree ready in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+            if args.refill:
+                options = ["--pool-dir", args.pool_dir, "--link-mode", args.link_mode]
+                options += [arg for directory in args.share or () for arg in ("--share", directory)]
+                options += ["--setup", args.setup] if args.setup else []
+                _spawn_background([*options, "fill", "--size", str(args.refill), "--base", args.base])
+        elif args.command == "release":
+            pool.release(args.path)
+            print(f"✅ Released {args.path}")
+        elif args.command == "status":
+            for name, entry in sorted(pool.status().items()):
+                print(f"{name}\t{entry['status']}\t{entry.get('branch') or '-'}\t{entry['path']}")
+        elif args.command == "prune":
+            print(f"🧹 Removed {pool.prune()} worktree(s)")
+    except subprocess.CalledProcessError as error:
+        print(f"❌ {error.stderr or error}".strip(), file=sys.stderr)
+        return 1
+    except KeyError as error:
+        print(f"❌ {error.args[0]}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
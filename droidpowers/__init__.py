@@ -0,0 +1 @@
+"""Python tooling for verifying and maintaining the Droidpowers skill library."""
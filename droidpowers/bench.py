@@ -0,0 +1,316 @@
+"""Benchmarks for the verifiers, the droid test suite and the installer.
+
+Usage::
+
+    python -m droidpowers.bench [--sizes 100,1000,10000] [--output FILE] [--compare OLD]
+
+For every size a synthetic project is generated whose ``.factory`` tree holds
+the real droids plus synthetic ones cloned from their frontmatter and section
+layout.  Each benchmark runs in a child process; wall time, peak RSS (from
+``wait4``) and the number of corpus files the child read are recorded and
+written as JSON, so runs from different commits can be compared with
+``--compare``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from droidpowers.corpus import FACTORY_DIR
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATES_DIR = os.path.join(REPO_ROOT, "templates")
+DEFAULT_SIZES = (100, 1000, 10000)
+RESULTS_SCHEMA = 1
+
+BENCHMARKS = ("verify-completeness", "pytest-droids", "install")
+
+# Runs a Python script or module with an audit hook that records every file
+# under BENCH_ROOT opened for reading, then writes the counts to argv[1].
+_PY_CHILD = r"""
+import atexit, json, os, runpy, sys
+stats_path, kind, target = sys.argv[1:4]
+sys.argv = [target] + sys.argv[4:]
+root = os.path.realpath(os.environ["BENCH_ROOT"]) + os.sep
+write_flags = os.O_WRONLY | os.O_RDWR
+opened = []
+def hook(event, args):
+    if event != "open" or not isinstance(args[0], str):
+        return
+    path, mode, flags = args
+    reading = (not any(c in mode for c in "wax+")) if isinstance(mode, str) else not (flags or 0) & write_flags
+    if reading and os.path.realpath(path).startswith(root) and not os.path.isdir(path):
+        opened.append(path)
+sys.addaudithook(hook)
+def report():
+    with open(stats_path, "w") as f:
+        json.dump({"file_opens": len(opened), "files_read": len(set(opened))}, f)
+atexit.register(report)
+if kind == "module":
+    runpy.run_module(target, run_name="__main__", alter_sys=True)
+else:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(target)))
+    runpy.run_path(target, run_name="__main__")
+"""
+
+_NODE_COUNTER = os.path.join(REPO_ROOT, "scripts", "bench-fs-counter.js")
+
+
+class BenchResult(NamedTuple):
+    """One benchmark measurement."""
+
+    benchmark: str
+    droids: int
+    files: int
+    wall_s: float
+    peak_rss_kb: int
+    files_read: int
+    file_opens: int
+    exit_code: int
+
+
+def _real_corpus(kind: str) -> Dict[str, str]:
+    directory = os.path.join(TEMPLATES_DIR, FACTORY_DIR, kind)
+    corpus = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".md"):
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                corpus[name[:-len(".md")]] = f.read()
+    return corpus
+
+
+def _synthesize(template: str, template_name: str, name: str) -> str:
+    """Clone a droid, renaming it while keeping its frontmatter and layout."""
+    text = template.replace(template_name, name)
+    text = re.sub(r"^name: .*$", f"name: {name}", text, count=1, flags=re.MULTILINE)
+    title = name.replace("-", " ").title()
+    return re.sub(r"^# .*$", f"# {title}", text, count=1, flags=re.MULTILINE)
+
+
+def generate_corpus(root: str, droids: int) -> int:
+    """Write a project with ``droids`` droids (and one command each) to ``root``.
+
+    The real droids and commands are always included so the verifiers pass;
+    the remainder are synthetic clones.  Returns the number of files written
+    under ``.factory``.
+    """
+    real_droids = _real_corpus("droids")
+    real_commands = _real_corpus("commands")
+    droids_dir = os.path.join(root, FACTORY_DIR, "droids")
+    commands_dir = os.path.join(root, FACTORY_DIR, "commands")
+    os.makedirs(droids_dir, exist_ok=True)
+    os.makedirs(commands_dir, exist_ok=True)
+
+    for name, text in real_droids.items():
+        _write(os.path.join(droids_dir, f"{name}.md"), text)
+    for name, text in real_commands.items():
+        _write(os.path.join(commands_dir, f"{name}.md"), text)
+
+    droid_templates = sorted(real_droids.items())
+    command_templates = sorted(real_commands.items())
+    written = len(real_droids) + len(real_commands)
+    for i in range(max(0, droids - len(real_droids))):
+        template_name, template = droid_templates[i % len(droid_templates)]
+        name = f"synthetic-{i:05d}-{template_name}"
+        _write(os.path.join(droids_dir, f"{name}.md"), _synthesize(template, template_name, name))
+        command_name, command = command_templates[i % len(command_templates)]
+        _write(os.path.join(commands_dir, f"{name}.md"), _synthesize(command, command_name, name))
+        written += 2
+
+    for extra in ("AGENTS.md.template", "DSM_README.md"):
+        shutil.copyfile(os.path.join(TEMPLATES_DIR, extra), os.path.join(root, extra))
+    _write(os.path.join(root, "package.json"), json.dumps({"name": "bench-project", "version": "1.0.0"}))
+    return written
+
+
+def _write(path: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _prepare_installer(work: str, project: str) -> str:
+    """Build a throwaway package whose templates are the synthetic corpus."""
+    package = os.path.join(work, "package")
+    shutil.copytree(os.path.join(REPO_ROOT, "src"), os.path.join(package, "src"))
+    shutil.copyfile(os.path.join(REPO_ROOT, "package.json"), os.path.join(package, "package.json"))
+    templates = os.path.join(package, "templates")
+    shutil.copytree(os.path.join(project, FACTORY_DIR), os.path.join(templates, FACTORY_DIR))
+    for extra in ("AGENTS.md.template", "DSM_README.md"):
+        shutil.copyfile(os.path.join(project, extra), os.path.join(templates, extra))
+    return package
+
+
+def measure(argv: Sequence[str], cwd: str, env: Dict[str, str], stats_path: str) -> Dict[str, int]:
+    """Run ``argv`` and return wall time, peak RSS and file counts."""
+    started = time.perf_counter()
+    process = subprocess.Popen(argv, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    peak = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    stats = {"file_opens": 0, "files_read": 0}
+    try:
+        with open(stats_path, "r") as f:
+            stats.update(json.load(f))
+        os.remove(stats_path)
+    except (OSError, ValueError):
+        pass
+    return {"wall_s": wall, "peak_rss_kb": peak, "exit_code": process.returncode, **stats}
+
+
+def _commands(benchmark: str, project: str, package: str, stats_path: str) -> Optional[List[str]]:
+    if benchmark == "verify-completeness":
+        script = os.path.join(REPO_ROOT, "scripts", "verify-completeness.py")
+        return [sys.executable, "-c", _PY_CHILD, stats_path, "path", script, "--no-cache"]
+    if benchmark == "pytest-droids":
+        return [sys.executable, "-c", _PY_CHILD, stats_path, "module", "pytest", "-q", "-p", "no:cacheprovider",
+                "--rootdir", REPO_ROOT, os.path.join(REPO_ROOT, "tests", "droids")]
+    if benchmark == "install":
+        node = shutil.which("node")
+        if node is None:
+            return None
+        script = "require(process.argv[1]).installDroidpowers(process.argv[2], { force: true })"
+        return [node, "--require", _NODE_COUNTER, "-e", script,
+                os.path.join(package, "src", "installer.js"), os.path.join(os.path.dirname(project), "install-target")]
+    raise ValueError(f"Unknown benchmark: {benchmark}")
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    benchmarks: Sequence[str] = BENCHMARKS,
+    repeat: int = 1,
+    work_dir: Optional[str] = None,
+) -> List[BenchResult]:
+    """Generate a corpus per size and run every benchmark against it.
+
+    With ``repeat`` > 1 the fastest wall time and the largest RSS are kept.
+    """
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"droidpowers-bench-{size}-", dir=work_dir) as work:
+            project = os.path.join(work, "project")
+            files = generate_corpus(project, size)
+            package = _prepare_installer(work, project)
+            os.makedirs(os.path.join(work, "install-target"))
+            stats_path = os.path.join(work, "stats.json")
+            env = dict(os.environ, BENCH_ROOT=work, BENCH_STATS=stats_path, DROIDPOWERS_ROOT=project,
+                       PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+
+            for benchmark in benchmarks:
+                argv = _commands(benchmark, project, package, stats_path)
+                if argv is None:
+                    continue
+                runs = [measure(argv, project, env, stats_path) for _ in range(max(1, repeat))]
+                results.append(BenchResult(
+                    benchmark=benchmark,
+                    droids=size,
+                    files=files,
+                    wall_s=round(min(run["wall_s"] for run in runs), 6),
+                    peak_rss_kb=max(run["peak_rss_kb"] for run in runs),
+                    files_read=runs[-1]["files_read"],
+                    file_opens=runs[-1]["file_opens"],
+                    exit_code=runs[-1]["exit_code"],
+                ))
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def results_document(results: Sequence[BenchResult]) -> dict:
+    """Wrap results with enough context to compare them across commits."""
+    return {
+        "schema": RESULTS_SCHEMA,
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": [result._asdict() for result in results],
+    }
+
+
+def compare(old: dict, new: dict) -> List[str]:
+    """Describe wall-time and RSS changes between two result documents."""
+    previous = {(r["benchmark"], r["droids"]): r for r in old.get("results", [])}
+    lines = []
+    for result in new.get("results", []):
+        before = previous.get((result["benchmark"], result["droids"]))
+        label = f"{result['benchmark']} @ {result['droids']} droids"
+        if before is None:
+            lines.append(f"{label}: new ({result['wall_s']:.3f}s)")
+            continue
+        wall_delta = _percent(before["wall_s"], result["wall_s"])
+        rss_delta = _percent(before["peak_rss_kb"], result["peak_rss_kb"])
+        lines.append(
+            f"{label}: {before['wall_s']:.3f}s -> {result['wall_s']:.3f}s ({wall_delta}), "
+            f"RSS {before['peak_rss_kb']} -> {result['peak_rss_kb']} KB ({rss_delta}), "
+            f"files read {before['files_read']} -> {result['files_read']}"
+        )
+    return lines
+
+
+def _percent(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m droidpowers.bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated droid counts (default: %(default)s)")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS),
+                        help="comma-separated benchmarks to run (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per benchmark; the fastest is kept")
+    parser.add_argument("--output", default="bench-results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    benchmarks = [name for name in args.benchmarks.split(",") if name]
+    unknown = sorted(set(benchmarks) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    document = results_document(run_benchmarks(sizes, benchmarks, args.repeat))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+
+    for result in document["results"]:
+        print(
+            f"⏱️  {result['benchmark']:<20} {result['droids']:>6} droids  {result['wall_s']:8.3f}s  "
+            f"{result['peak_rss_kb']:>8} KB  {result['files_read']:>6} files read"
+        )
+    print(f"📄 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        print(f"\n📊 Compared with {old.get('commit') or args.compare}:")
+        for line in compare(old, document):
+            print(f"  {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
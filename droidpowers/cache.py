@@ -0,0 +1,155 @@
+"""Persistent, content-hash keyed cache of parsed droids and check results.
+
+The cache lives in ``.factory/.cache/verify.json``.  Each entry is keyed by the
+file's path inside ``.factory`` and records its size, mtime and SHA-256 digest,
+the parsed frontmatter and section tree, and the result of every checker that
+has already looked at that exact content.  Check results are additionally keyed
+by the checker's rule version, so changing a rule invalidates only that rule's
+results.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from droidpowers.corpus import FACTORY_DIR, PARSER_VERSION, Document, Section, parse_document
+
+CACHE_DIR = ".cache"
+CACHE_FILE = "verify.json"
+CACHE_FORMAT = 1
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of a document's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _section_to_json(section: Section) -> list:
+    return [
+        section.title,
+        section.level,
+        section.start,
+        section.body,
+        section.end,
+        [_section_to_json(child) for child in section.children],
+    ]
+
+
+def _section_from_json(data: list) -> Section:
+    title, level, start, body, end, children = data
+    return Section(title, level, start, body, end, tuple(_section_from_json(c) for c in children))
+
+
+class VerificationCache:
+    """On-disk cache consulted by :meth:`CorpusIndex.load` and the verifiers."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @classmethod
+    def for_root(cls, root: str) -> "VerificationCache":
+        """Open the cache belonging to the project at ``root``."""
+        return cls(os.path.join(root, FACTORY_DIR, CACHE_DIR, CACHE_FILE))
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("format") == CACHE_FORMAT
+            and data.get("parser") == PARSER_VERSION
+            and isinstance(data.get("entries"), dict)
+        ):
+            self.entries = data["entries"]
+
+    def restore(self, key: str, name: str, kind: str, path: str, stat: os.stat_result) -> Optional[Document]:
+        """Rebuild a document without reading it if its stat is unchanged."""
+        entry = self.entries.get(key)
+        if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            return None
+        self.hits += 1
+        return self._document(entry, name, kind, path, None)
+
+    def parse(self, key: str, name: str, kind: str, path: str, text: str, stat: os.stat_result) -> Document:
+        """Parse ``text`` unless an entry with the same content hash exists."""
+        digest = content_hash(text)
+        entry = self.entries.get(key)
+        if entry is not None and entry["sha256"] == digest:
+            # Touched but unchanged: keep parse and results, refresh the stat.
+            self.hits += 1
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.dirty = True
+            return self._document(entry, name, kind, path, text)
+
+        self.misses += 1
+        document = parse_document(name, kind, path, text)
+        self.entries[key] = {
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "frontmatter": document.frontmatter,
+            "title": document.title,
+            "sections": [_section_to_json(s) for s in document.sections],
+            "results": {},
+        }
+        self.dirty = True
+        return document
+
+    def _document(self, entry: Dict[str, Any], name: str, kind: str, path: str, text: Optional[str]) -> Document:
+        sections = tuple(_section_from_json(s) for s in entry["sections"])
+        return Document(name, kind, path, text, entry["frontmatter"], entry["title"], sections)
+
+    def check(
+        self,
+        document: Document,
+        checker: str,
+        version: str,
+        run: Callable[[], Tuple[bool, str]],
+    ) -> Tuple[bool, str]:
+        """Return a cached check result for ``document`` or run and store it."""
+        entry = self.entries.get(self._key(document))
+        if entry is None:
+            return run()
+        result_key = f"{checker}@{version}"
+        cached = entry["results"].get(result_key)
+        if cached is not None:
+            return cached[0], cached[1]
+        success, message = run()
+        entry["results"][result_key] = [success, message]
+        self.dirty = True
+        return success, message
+
+    @staticmethod
+    def _key(document: Document) -> str:
+        return f"{document.kind}/{document.name}.md"
+
+    def prune(self, live_keys) -> None:
+        """Drop entries for files that no longer exist."""
+        for key in set(self.entries) - set(live_keys):
+            del self.entries[key]
+            self.dirty = True
+
+    def save(self) -> None:
+        """Atomically write the cache back to disk if anything changed."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"format": CACHE_FORMAT, "parser": PARSER_VERSION, "entries": self.entries},
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,70 @@
+"""Completeness and structure checks for an installed ``.factory`` tree.
+
+Which droids and commands must exist comes from the generated registry, and
+what their content must contain from the declarative spec in ``rules.json``.
+"""
+
+from typing import List, NamedTuple, Optional
+
+from droidpowers.cache import VerificationCache
+from droidpowers.corpus import CorpusIndex, Document
+from droidpowers.registry import default_registry
+from droidpowers.rules import RuleSet, default_rules
+
+RULES = default_rules()
+REGISTRY = default_registry()
+
+REQUIRED_DROIDS = list(REGISTRY.droids)
+
+# Command mappings from droid names to command names
+COMMAND_MAPPINGS = REGISTRY.command_mappings
+
+
+class CheckResult(NamedTuple):
+    """Outcome of one check against one droid or command."""
+
+    target: str
+    ok: bool
+    message: str
+
+
+def check_droid_structure(droid: Document, rules: RuleSet = RULES) -> CheckResult:
+    """Check a droid against the default droid profiles."""
+    ok, failures = rules.check(droid, rules.groups(rules.droid_profiles))
+    if ok:
+        return CheckResult(droid.name, True, f"Droid {droid.name} is properly structured")
+    return CheckResult(droid.name, False, f"Droid {droid.name} insufficient structure ({'; '.join(failures)})")
+
+
+def check_command_content(command: Document, rules: RuleSet = RULES) -> CheckResult:
+    """Check a command against the default command profiles."""
+    ok, failures = rules.check(command, rules.groups(rules.command_profiles))
+    if ok:
+        return CheckResult(command.name, True, f"Command {command.name} exists and has content")
+    return CheckResult(command.name, False, f"Command {command.name} is invalid ({'; '.join(failures)})")
+
+
+def _cached(cache: Optional[VerificationCache], document: Document, check: str, run) -> CheckResult:
+    if cache is None:
+        return run()
+    ok, message = cache.check(document, f"checks.{check}", RULES.version, lambda: tuple(run())[1:])
+    return CheckResult(document.name, ok, message)
+
+
+def check_project(index: CorpusIndex, cache: Optional[VerificationCache] = None) -> List[CheckResult]:
+    """Run every completeness and structure check against one project."""
+    results = []
+    for name in REQUIRED_DROIDS:
+        droid = index.droid(name)
+        if droid is None:
+            results.append(CheckResult(name, False, f"Missing droid: {name}"))
+        else:
+            results.append(_cached(cache, droid, "droid", lambda: check_droid_structure(droid)))
+
+    for droid_name, command_name in COMMAND_MAPPINGS.items():
+        command = index.command(command_name)
+        if command is None:
+            results.append(CheckResult(command_name, False, f"Missing command: {droid_name} -> {command_name}"))
+        else:
+            results.append(_cached(cache, command, "command", lambda: check_command_content(command)))
+    return results
@@ -0,0 +1,279 @@
+"""Single-pass index of the droid and command markdown under ``.factory``.
+
+Each droid and command file is read exactly once.  The YAML frontmatter and
+the heading tree are parsed up front, so verifiers and tests can answer every
+later question from memory instead of going back to the filesystem.
+"""
+
+import os
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from droidpowers.cache import VerificationCache
+
+FACTORY_DIR = ".factory"
+KINDS = ("droids", "commands")
+FRONTMATTER_KEYS = ("name", "description", "model", "tools")
+
+# Bump whenever parsing changes so cached parse results are discarded.
+PARSER_VERSION = 2
+
+
+class Section(NamedTuple):
+    """A markdown heading and the span of text it owns."""
+
+    title: str
+    level: int
+    start: int
+    body: int
+    end: int
+    children: Tuple["Section", ...]
+
+
+class Document:
+    """A parsed droid or command file.
+
+    ``text`` is loaded lazily when a document is restored from a verification
+    cache, so cached runs only touch the files they actually need.
+    """
+
+    __slots__ = ("name", "kind", "path", "frontmatter", "title", "sections", "_text")
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        path: str,
+        text: Optional[str],
+        frontmatter: Dict[str, object],
+        title: Optional[str],
+        sections: Tuple[Section, ...],
+    ):
+        self.name = name
+        self.kind = kind
+        self.path = path
+        self._text = text
+        self.frontmatter = frontmatter
+        self.title = title
+        self.sections = sections
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = _read_text(self.path)
+        return self._text
+
+    def walk(self) -> Iterator[Section]:
+        """Yield every section depth-first, in document order."""
+        stack = list(reversed(self.sections))
+        while stack:
+            section = stack.pop()
+            yield section
+            stack.extend(reversed(section.children))
+
+    def section(self, title: str, level: Optional[int] = None) -> Optional[Section]:
+        """Return the first section with this title (and level, if given)."""
+        for section in self.walk():
+            if section.title == title and (level is None or section.level == level):
+                return section
+        return None
+
+    def has_section(self, title: str, level: Optional[int] = None) -> bool:
+        """Check whether the document has a heading with this title."""
+        return self.section(title, level) is not None
+
+    def section_text(self, title: str, level: Optional[int] = None) -> str:
+        """Return the body of a section, including its subsections."""
+        section = self.section(title, level)
+        if section is None:
+            return ""
+        return self.text[section.body:section.end]
+
+    @property
+    def headings(self) -> List[str]:
+        """All section titles in document order."""
+        return [section.title for section in self.walk()]
+
+
+def parse_frontmatter(text: str) -> Tuple[Dict[str, object], int]:
+    """Parse a leading ``---`` block of flat ``key: value`` pairs.
+
+    Returns the parsed mapping and the offset where the body starts.  Only the
+    subset of YAML used by droids is understood: scalars, quoted scalars,
+    inline ``[a, b]`` lists and block ``- item`` lists.
+    """
+    if not text.startswith("---"):
+        return {}, 0
+    first_newline = text.find("\n")
+    if first_newline == -1 or text[:first_newline].strip() != "---":
+        return {}, 0
+
+    data: Dict[str, object] = {}
+    last_key = None
+    offset = first_newline + 1
+    while offset < len(text):
+        newline = text.find("\n", offset)
+        line_end = len(text) if newline == -1 else newline
+        line = text[offset:line_end]
+        offset = line_end + 1
+        if line.strip() == "---":
+            return data, min(offset, len(text))
+        stripped = line.strip()
+        if stripped.startswith("- ") and line[:1] in (" ", "\t") and last_key is not None:
+            # Block list item belonging to the previous key.
+            items = data[last_key] if isinstance(data[last_key], list) else []
+            items.append(_unquote(stripped[2:].strip()))
+            data[last_key] = items
+            continue
+        key, sep, value = line.partition(":")
+        if sep and key.strip() and not key.startswith((" ", "\t")):
+            last_key = key.strip()
+            data[last_key] = _parse_scalar(value.strip())
+
+    # Unterminated frontmatter is treated as plain body text.
+    return {}, 0
+
+
+def _parse_scalar(value: str) -> object:
+    if value.startswith("[") and value.endswith("]"):
+        inner = value[1:-1].strip()
+        if not inner:
+            return []
+        return [_unquote(item.strip()) for item in inner.split(",")]
+    return _unquote(value)
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+
+def parse_sections(text: str, start: int = 0) -> Tuple[Optional[str], Tuple[Section, ...]]:
+    """Parse the markdown heading tree of ``text`` from ``start`` onwards.
+
+    The first level-one heading becomes the document title; ``##`` and deeper
+    headings form the section tree.  Headings inside fenced code blocks are
+    ignored.
+    """
+    title = None
+    headings: List[Tuple[int, str, int, int]] = []
+    in_fence = False
+    offset = start
+    while offset < len(text):
+        newline = text.find("\n", offset)
+        line_end = len(text) if newline == -1 else newline
+        line = text[offset:line_end]
+        stripped = line.lstrip()
+        if stripped.startswith(("```", "~~~")):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("#"):
+            level = len(line) - len(line.lstrip("#"))
+            if level <= 6 and line[level:level + 1] in (" ", "\t"):
+                heading = line[level:].strip()
+                if level == 1:
+                    if title is None:
+                        title = heading
+                else:
+                    headings.append((level, heading, offset, min(line_end + 1, len(text))))
+        offset = line_end + 1
+
+    return title, _build_tree(headings, len(text))
+
+
+def _build_tree(headings: List[Tuple[int, str, int, int]], text_end: int) -> Tuple[Section, ...]:
+    # Each open entry is [level, title, start, body, children].
+    roots: List[Section] = []
+    stack: List[list] = []
+
+    def close(entry: list, end: int) -> None:
+        section = Section(entry[1], entry[0], entry[2], entry[3], end, tuple(entry[4]))
+        (stack[-1][4] if stack else roots).append(section)
+
+    for level, heading, start, body in headings:
+        while stack and stack[-1][0] >= level:
+            close(stack.pop(), start)
+        stack.append([level, heading, start, body, []])
+    while stack:
+        close(stack.pop(), text_end)
+    return tuple(roots)
+
+
+def _read_text(path: str) -> str:
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
+def parse_document(name: str, kind: str, path: str, text: str) -> Document:
+    """Parse already-loaded markdown text into a :class:`Document`."""
+    frontmatter, body_start = parse_frontmatter(text)
+    title, sections = parse_sections(text, body_start)
+    return Document(name, kind, path, text, frontmatter, title, sections)
+
+
+class CorpusIndex:
+    """In-memory index of every droid and command under a project's ``.factory``."""
+
+    def __init__(self, root: str, documents: Dict[str, Dict[str, Document]], files_read: int = 0):
+        self.root = root
+        self.documents = documents
+        self.files_read = files_read
+
+    @classmethod
+    def load(cls, root: str = os.curdir, cache: "Optional[VerificationCache]" = None) -> "CorpusIndex":
+        """Read and parse every markdown file under ``root/.factory`` once.
+
+        With a ``cache``, files whose size and mtime are unchanged are not read
+        at all, and files whose content hash is unchanged are not re-parsed.
+        """
+        documents: Dict[str, Dict[str, Document]] = {kind: {} for kind in KINDS}
+        live_keys = []
+        files_read = 0
+        for kind in KINDS:
+            directory = os.path.join(root, FACTORY_DIR, kind)
+            try:
+                entries = list(os.scandir(directory))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for entry in sorted(entries, key=lambda e: e.name):
+                if not entry.name.endswith(".md") or not entry.is_file():
+                    continue
+                name = entry.name[:-len(".md")]
+                key = f"{kind}/{entry.name}"
+                live_keys.append(key)
+                if cache is not None:
+                    stat = entry.stat()
+                    document = cache.restore(key, name, kind, entry.path, stat)
+                    if document is None:
+                        text = _read_text(entry.path)
+                        files_read += 1
+                        document = cache.parse(key, name, kind, entry.path, text, stat)
+                else:
+                    text = _read_text(entry.path)
+                    files_read += 1
+                    document = parse_document(name, kind, entry.path, text)
+                documents[kind][name] = document
+        if cache is not None:
+            cache.prune(live_keys)
+        return cls(root, documents, files_read)
+
+    @property
+    def droids(self) -> Dict[str, Document]:
+        return self.documents["droids"]
+
+    @property
+    def commands(self) -> Dict[str, Document]:
+        return self.documents["commands"]
+
+    def droid(self, name: str) -> Optional[Document]:
+        return self.droids.get(name)
+
+    def command(self, name: str) -> Optional[Document]:
+        return self.commands.get(name)
+
+    def __iter__(self) -> Iterator[Document]:
+        for kind in KINDS:
+            yield from self.documents[kind].values()
+
+    def __len__(self) -> int:
+        return sum(len(docs) for docs in self.documents.values())
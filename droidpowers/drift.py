@@ -0,0 +1,190 @@
+"""Detect drift between the mirrored ``.factory`` trees of this repository.
+
+Usage::
+
+    python -m droidpowers.drift [REFERENCE MIRROR ...] [--jobs N] [--json]
+
+``templates/.factory`` is the reference and ``.factory`` and
+``test/test-project/.factory`` are its mirrors unless other trees are given.
+Each tree is streamed once with ``os.scandir``.  Only files present on both
+sides with equal sizes are hashed, each at most once and in parallel, so a
+clean run touches little beyond the directory listings and is fast enough for
+a pre-commit hook::
+
+    python3 -m droidpowers.drift || exit 1
+
+Files generated at install time and local caches are ignored.  Files that
+share an inode are still hashed: a hard link says nothing about whether the
+mirror was meant to change with the reference.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_TREES = (os.path.join("templates", ".factory"), ".factory", os.path.join("test", "test-project", ".factory"))
+
+# Written into installed trees only; see src/manifest.js and src/droid-index.js.
+IGNORED_FILES = {".droidpowers-manifest.json", "droid-index.json"}
+IGNORED_DIRS = {".cache", "__pycache__"}
+
+
+class Entry(NamedTuple):
+    """A file in a tree: its absolute path and size."""
+
+    path: str
+    size: int
+
+
+class TreeDrift(NamedTuple):
+    """How one mirror differs from the reference, by relative path."""
+
+    root: str
+    files: int
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+class DriftReport(NamedTuple):
+    """Drift of every mirror against one reference tree."""
+
+    reference: str
+    files: int
+    trees: List[TreeDrift]
+    hashed: int
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return all(tree.ok for tree in self.trees)
+
+    def to_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "reference": self.reference,
+            "files": self.files,
+            "hashed": self.hashed,
+            "elapsed": round(self.elapsed, 6),
+            "trees": [
+                {"root": tree.root, "ok": tree.ok, "files": tree.files,
+                 "added": tree.added, "removed": tree.removed, "changed": tree.changed}
+                for tree in self.trees
+            ],
+        }
+
+
+def scan_tree(root: str) -> Dict[str, Entry]:
+    """Every file under ``root`` keyed by its ``/``-separated relative path."""
+    files: Dict[str, Entry] = {}
+    stack = [(root, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                relative = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORED_DIRS:
+                        stack.append((entry.path, relative + "/"))
+                elif entry.is_file() and relative not in IGNORED_FILES:
+                    files[relative] = Entry(entry.path, entry.stat().st_size)
+    return files
+
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def detect_drift(reference: str, mirrors: Sequence[str], jobs: Optional[int] = None) -> DriftReport:
+    """Compare each mirror with ``reference`` in one pass over every tree."""
+    started = time.perf_counter()
+    roots = [reference, *mirrors]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        reference_files, *mirror_files = pool.map(scan_tree, roots)
+
+        # Sizes settle most comparisons; only equal sizes are hashed.
+        pending: List[Tuple[int, str, Entry, Entry]] = []
+        for index, files in enumerate(mirror_files):
+            for relative, entry in files.items():
+                source = reference_files.get(relative)
+                if source is not None and source.size == entry.size:
+                    pending.append((index, relative, source, entry))
+        to_hash = sorted({path for _, _, source, entry in pending for path in (source.path, entry.path)})
+        digests = dict(zip(to_hash, pool.map(hash_file, to_hash)))
+
+    differs = {(index, relative) for index, relative, source, entry in pending
+               if digests[source.path] != digests[entry.path]}
+    trees = []
+    for index, (root, files) in enumerate(zip(mirrors, mirror_files)):
+        changed = sorted(
+            relative for relative, entry in files.items()
+            if relative in reference_files
+            and (reference_files[relative].size != entry.size or (index, relative) in differs)
+        )
+        trees.append(TreeDrift(
+            root,
+            len(files),
+            sorted(set(files) - set(reference_files)),
+            sorted(set(reference_files) - set(files)),
+            changed,
+        ))
+    return DriftReport(reference, len(reference_files), trees, len(to_hash), time.perf_counter() - started)
+
+
+def print_report(report: DriftReport) -> None:
+    print(f"🔍 Drift against {report.reference} ({report.files} files)")
+    for tree in report.trees:
+        if tree.ok:
+            print(f"  ✅ {tree.root}: in sync")
+            continue
+        print(f"  ❌ {tree.root}: {len(tree.changed)} changed, {len(tree.added)} added, {len(tree.removed)} removed")
+        for marker, paths in (("~", tree.changed), ("+", tree.added), ("-", tree.removed)):
+            for path in paths:
+                print(f"     {marker} {path}")
+    total = report.files + sum(tree.files for tree in report.trees)
+    print(f"📊 {len(report.trees) + 1} trees, {total} files, {report.hashed} hashed in {report.elapsed * 1000:.1f}ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m droidpowers.drift",
+        description="Report files added, removed or changed between mirrored .factory trees.",
+    )
+    parser.add_argument("trees", nargs="*", help=f"reference tree then mirrors (default: {' '.join(DEFAULT_TREES)})")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="hashing threads (default: Python's choice)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    trees = args.trees or list(DEFAULT_TREES)
+    if len(trees) < 2:
+        parser.error("give a reference tree and at least one mirror")
+    missing = [tree for tree in trees if not os.path.isdir(tree)]
+    if missing:
+        print(f"❌ Not a directory: {', '.join(missing)}")
+        return 1
+
+    report = detect_drift(trees[0], trees[1:], jobs=args.jobs)
+    if args.json:
+        json.dump(report.to_dict(), sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Loader for the precomputed droid registry in ``templates/registry.json``.
+
+``npm run build:registry`` scans the templates once and joins them with the
+droid -> command links in ``rules.json``.  The registry records every droid
+and command with its path, SHA-256 digest and size, each droid's frontmatter
+and the per-droid test module that covers it, so verifiers and tests read one
+JSON file instead of keeping their own lists.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+REGISTRY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "registry.json"
+)
+REGISTRY_FORMAT = 1
+
+
+class DroidEntry(NamedTuple):
+    """A registered droid and the command that runs it."""
+
+    name: str
+    command: Optional[str]
+    path: str
+    sha256: str
+    size: int
+    frontmatter: Dict[str, object]
+    test: Optional[str]
+
+
+class CommandEntry(NamedTuple):
+    """A registered command and the droid it runs."""
+
+    name: str
+    droid: Optional[str]
+    path: str
+    sha256: str
+    size: int
+
+
+class Registry:
+    """The parsed contents of ``registry.json``; droids keep spec order."""
+
+    def __init__(self, droids: Dict[str, DroidEntry], commands: Dict[str, CommandEntry], extras: Tuple[str, ...]):
+        self.droids = droids
+        self.commands = commands
+        self.extras = extras
+
+    @classmethod
+    def load(cls, path: str = REGISTRY_PATH) -> "Registry":
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{path} not found - run npm run build:registry") from None
+        if data.get("format") != REGISTRY_FORMAT:
+            raise ValueError(f"{path} has format {data.get('format')}, expected {REGISTRY_FORMAT}")
+        droids = {
+            name: DroidEntry(name, entry["command"], entry["path"], entry["sha256"], entry["size"],
+                             entry.get("frontmatter", {}), entry.get("test"))
+            for name, entry in data["droids"].items()
+        }
+        commands = {
+            name: CommandEntry(name, entry["droid"], entry["path"], entry["sha256"], entry["size"])
+            for name, entry in data["commands"].items()
+        }
+        return cls(droids, commands, tuple(data.get("extras", ())))
+
+    @property
+    def command_mappings(self) -> Dict[str, str]:
+        return {name: entry.command for name, entry in self.droids.items() if entry.command}
+
+    @property
+    def tested_droids(self) -> List[str]:
+        """Droids covered by a module under ``tests/droids``."""
+        return [name for name, entry in self.droids.items() if entry.test]
+
+    def stale(self, factory_dir: str) -> List[str]:
+        """Registered files under ``factory_dir`` whose content no longer matches."""
+        changed = []
+        for entry in [*self.droids.values(), *self.commands.values()]:
+            try:
+                with open(os.path.join(factory_dir, *entry.path.split("/")), "rb") as f:
+                    content = f.read()
+            except FileNotFoundError:
+                changed.append(entry.path)
+                continue
+            if len(content) != entry.size or hashlib.sha256(content).hexdigest() != entry.sha256:
+                changed.append(entry.path)
+        return changed
+
+
+@functools.lru_cache(maxsize=1)
+def default_registry() -> Registry:
+    """The registry generated next to the shipped templates."""
+    return Registry.load()
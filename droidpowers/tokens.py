@@ -0,0 +1,266 @@
+"""Prompt-token cost of the droids, per section and per routing path.
+
+Usage::
+
+    python -m droidpowers.tokens [ROOT] [--path using-droids,skill-checker,test-driven-development]
+                                 [--top 10] [--section-budget 300] [--budget 8000] [--json]
+
+Token counts are estimated with a stdlib approximation of a BPE tokenizer
+(words, digit groups, punctuation runs, line breaks), close enough to rank
+droids and sections and to track growth between commits.  Every section is
+counted without its subsections, so a droid's sections add up to its total.
+
+A routing path is the chain of droids an agent loads for one task.  The
+default paths follow the gateway: ``using-droids`` then ``skill-checker``
+then each task droid.  Per-file results are cached in
+``.factory/.cache/tokens.json`` by content hash, so only edited droids are
+re-counted.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from droidpowers.cache import CACHE_DIR, content_hash
+from droidpowers.corpus import FACTORY_DIR, CorpusIndex, Document, Section
+
+CACHE_FILE = "tokens.json"
+CACHE_FORMAT = 1
+
+# Bump whenever the estimate changes so cached counts are discarded.
+ESTIMATOR_VERSION = 1
+
+GATEWAY = ("using-droids", "skill-checker")
+PREAMBLE = "(frontmatter and title)"
+DEFAULT_TOP = 10
+DEFAULT_SECTION_BUDGET = 300
+
+_PIECES = re.compile(
+    r"(?P<word>[A-Za-z]+)"
+    r"|(?P<digits>\d+)"
+    r"|(?P<space>\n+[ \t]*|[ \t]{2,})"
+    r"|(?P<punct>(?P<mark>[!-/:-@\[-`{-~])(?P=mark)*)"
+    r"|(?P<other>\S)"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of BPE tokens in ``text``."""
+    count = 0
+    for match in _PIECES.finditer(text):
+        kind = match.lastgroup
+        piece = match.group()
+        if kind == "word":
+            # Common words are one token; long or rare ones split into pieces.
+            count += 1 if len(piece) <= 8 else math.ceil(len(piece) / 6)
+        elif kind == "digits":
+            count += math.ceil(len(piece) / 3)
+        elif kind == "space":
+            count += 1
+        elif kind == "punct":
+            count += math.ceil(len(piece) / 4)
+        else:
+            count += max(1, len(piece.encode("utf-8")) // 2)
+    return count
+
+
+class SectionCost(NamedTuple):
+    """Tokens spent on one section's own text (subsections excluded)."""
+
+    droid: str
+    title: str
+    level: int
+    tokens: int
+    bytes: int
+
+
+class DroidCost(NamedTuple):
+    """Tokens spent on one droid file."""
+
+    name: str
+    tokens: int
+    bytes: int
+    sections: List[SectionCost]
+
+
+class PathCost(NamedTuple):
+    """Tokens an agent loads following one routing path."""
+
+    droids: Tuple[str, ...]
+    tokens: int
+    missing: Tuple[str, ...]
+
+
+def _own_spans(sections: Sequence[Section], parents: Tuple[str, ...] = ()) -> List[Tuple[str, int, int, int]]:
+    spans = []
+    for section in sections:
+        titles = parents + (section.title,)
+        own_end = section.children[0].start if section.children else section.end
+        spans.append((" > ".join(titles), section.level, section.start, own_end))
+        spans.extend(_own_spans(section.children, titles))
+    return spans
+
+
+def profile_document(document: Document) -> dict:
+    """Token and byte counts for a document and each of its sections."""
+    text = document.text
+    spans = _own_spans(document.sections)
+    first = spans[0][2] if spans else len(text)
+    rows = [[PREAMBLE, 1, estimate_tokens(text[:first]), len(text[:first].encode("utf-8"))]]
+    for title, level, start, end in spans:
+        chunk = text[start:end]
+        rows.append([title, level, estimate_tokens(chunk), len(chunk.encode("utf-8"))])
+    return {
+        "tokens": sum(row[2] for row in rows),
+        "bytes": len(text.encode("utf-8")),
+        "sections": rows,
+    }
+
+
+class TokenCache:
+    """Profiles keyed by content hash, stored in ``.factory/.cache/tokens.json``."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        self.used: set = set()
+        self.hits = 0
+        self.misses = 0
+        if path is None:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("format") == CACHE_FORMAT and data.get("estimator") == ESTIMATOR_VERSION:
+            self.entries = data.get("entries", {})
+
+    def profile(self, document: Document) -> dict:
+        digest = content_hash(document.text)
+        self.used.add(digest)
+        entry = self.entries.get(digest)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = self.entries[digest] = profile_document(document)
+        return entry
+
+    def save(self) -> None:
+        """Write back the profiles of the files seen in this run."""
+        if self.path is None or (not self.misses and set(self.entries) == self.used):
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        entries = {digest: self.entries[digest] for digest in sorted(self.used)}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "estimator": ESTIMATOR_VERSION, "entries": entries}, f,
+                      separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+
+def profile_droids(corpus: CorpusIndex, cache: Optional[TokenCache] = None) -> Dict[str, DroidCost]:
+    """Cost of every droid in ``corpus``, by name."""
+    cache = cache or TokenCache(None)
+    costs = {}
+    for name, document in corpus.droids.items():
+        profile = cache.profile(document)
+        sections = [SectionCost(name, *row) for row in profile["sections"]]
+        costs[name] = DroidCost(name, profile["tokens"], profile["bytes"], sections)
+    return costs
+
+
+def catalog_tokens(corpus: CorpusIndex) -> int:
+    """Tokens of the name and description every droid advertises in its frontmatter."""
+    return sum(
+        estimate_tokens(f"{doc.frontmatter.get('name', name)}: {doc.frontmatter.get('description', '')}")
+        for name, doc in corpus.droids.items()
+    )
+
+
+def path_cost(costs: Dict[str, DroidCost], droids: Sequence[str]) -> PathCost:
+    """Tokens loaded following ``droids``; each droid counts once."""
+    unique = tuple(dict.fromkeys(droids))
+    missing = tuple(name for name in unique if name not in costs)
+    return PathCost(unique, sum(costs[name].tokens for name in unique if name in costs), missing)
+
+
+def gateway_paths(costs: Dict[str, DroidCost]) -> List[PathCost]:
+    """The gateway path to every task droid, heaviest first."""
+    gateway = tuple(name for name in GATEWAY if name in costs)
+    paths = [path_cost(costs, gateway + (name,)) for name in costs if name not in GATEWAY]
+    return sorted(paths, key=lambda path: (-path.tokens, path.droids))
+
+
+def heaviest_sections(costs: Dict[str, DroidCost], top: int = DEFAULT_TOP) -> List[SectionCost]:
+    sections = [section for cost in costs.values() for section in cost.sections]
+    return sorted(sections, key=lambda s: (-s.tokens, s.droid, s.title))[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m droidpowers.tokens", description=__doc__.split("\n\n")[0])
+    parser.add_argument("root", nargs="?", default=os.curdir, help="project containing .factory (default: .)")
+    parser.add_argument("--path", action="append", default=[],
+                        help="comma-separated droids loaded for one task (default: the gateway paths)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="sections and paths to list")
+    parser.add_argument("--section-budget", type=int, default=DEFAULT_SECTION_BUDGET,
+                        help="flag sections above this many tokens")
+    parser.add_argument("--budget", type=int, help="fail when a routing path exceeds this many tokens")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update .factory/.cache")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    corpus = CorpusIndex.load(args.root)
+    if not corpus.droids:
+        print(f"❌ No droids found under {os.path.join(args.root, FACTORY_DIR)}")
+        return 1
+    cache = TokenCache(None if args.no_cache else os.path.join(args.root, FACTORY_DIR, CACHE_DIR, CACHE_FILE))
+    costs = profile_droids(corpus, cache)
+    cache.save()
+
+    if args.path:
+        paths = [path_cost(costs, [name.strip() for name in spec.split(",") if name.strip()]) for spec in args.path]
+    else:
+        paths = gateway_paths(costs)
+    sections = heaviest_sections(costs, args.top)
+    over_budget = [path for path in paths if args.budget is not None and path.tokens > args.budget]
+    catalog = catalog_tokens(corpus)
+
+    if args.json:
+        json.dump({
+            "catalog_tokens": catalog,
+            "total_tokens": sum(cost.tokens for cost in costs.values()),
+            "droids": {name: cost._replace(sections=[s._asdict() for s in cost.sections])._asdict()
+                       for name, cost in sorted(costs.items())},
+            "paths": [path._asdict() for path in paths],
+            "heaviest_sections": [section._asdict() for section in sections],
+            "over_budget": [" → ".join(path.droids) for path in over_budget],
+        }, sys.stdout, indent=2)
+        print()
+        return 1 if over_budget else 0
+
+    print(f"📊 {len(costs)} droids, ~{sum(c.tokens for c in costs.values()):,} tokens; "
+          f"catalog descriptions ~{catalog:,} tokens")
+    for cost in sorted(costs.values(), key=lambda c: (-c.tokens, c.name)):
+        print(f"   {cost.tokens:>6,}  {cost.name} ({cost.bytes / 1024:.1f} KiB)")
+    print("🔍 Heaviest sections:")
+    for section in sections:
+        flag = "⚠️ " if section.tokens > args.section_budget else "   "
+        print(f"{flag}{section.tokens:>6,}  {section.droid}: {section.title}")
+    print("🔄 Routing paths:")
+    for path in paths[:args.top] if not args.path else paths:
+        flag = "❌" if path in over_budget else "  "
+        note = f" (missing: {', '.join(path.missing)})" if path.missing else ""
+        print(f"{flag}{path.tokens:>7,}  {' → '.join(path.droids)}{note}")
+    if over_budget:
+        print(f"❌ {len(over_budget)} path(s) over the {args.budget:,}-token budget")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Verify many installed ``.factory`` trees in parallel.
+
+Usage::
+
+    python -m droidpowers.verify [ROOT_OR_GLOB ...] [--jobs N] [--json]
+
+Each argument is a directory or a glob pattern.  Every directory beneath it
+that contains a ``.factory`` tree is discovered by streaming ``os.scandir``,
+checked in a worker process, and folded into a single report.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from droidpowers.cache import VerificationCache
+from droidpowers.checks import CheckResult, check_project
+from droidpowers.corpus import FACTORY_DIR, CorpusIndex
+
+# Directories that never contain installed projects worth verifying.
+SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv", ".tox"}
+
+
+class ProjectReport(NamedTuple):
+    """All check results for one project."""
+
+    root: str
+    results: List[CheckResult]
+    files_read: int
+    elapsed: float
+
+    @property
+    def failures(self) -> List[CheckResult]:
+        return [result for result in self.results if not result.ok]
+
+
+class Report(NamedTuple):
+    """Merged results for every verified project."""
+
+    projects: List[ProjectReport]
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return all(not project.failures for project in self.projects)
+
+    def to_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "elapsed": round(self.elapsed, 6),
+            "projects": [
+                {
+                    "root": project.root,
+                    "ok": not project.failures,
+                    "files_read": project.files_read,
+                    "elapsed": round(project.elapsed, 6),
+                    "results": [result._asdict() for result in project.results],
+                }
+                for project in self.projects
+            ],
+        }
+
+
+def expand_roots(patterns: Iterable[str]) -> Iterator[str]:
+    """Expand glob patterns; plain paths are passed through unchanged."""
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            yield from sorted(path for path in glob.glob(pattern) if os.path.isdir(path))
+        else:
+            yield pattern
+
+
+def discover_projects(roots: Iterable[str], max_depth: Optional[int] = None) -> Iterator[str]:
+    """Yield every directory under ``roots`` that holds a ``.factory`` tree.
+
+    Directories are streamed with ``os.scandir`` so discovery starts producing
+    projects before the whole tree has been walked.  Each project is yielded
+    once even if several roots overlap.
+    """
+    seen = set()
+    for root in expand_roots(roots):
+        stack = [(os.path.normpath(root), 0)]
+        while stack:
+            directory, depth = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+            children = []
+            for entry in entries:
+                if entry.name == FACTORY_DIR:
+                    real = os.path.realpath(directory)
+                    if real not in seen:
+                        seen.add(real)
+                        yield directory
+                elif entry.name not in SKIP_DIRS:
+                    children.append(entry.path)
+            if max_depth is None or depth < max_depth:
+                stack.extend((child, depth + 1) for child in sorted(children, reverse=True))
+
+
+def verify_project(root: str, use_cache: bool = True) -> ProjectReport:
+    """Index and check a single project."""
+    started = time.perf_counter()
+    cache = VerificationCache.for_root(root) if use_cache else None
+    index = CorpusIndex.load(root, cache=cache)
+    results = check_project(index, cache)
+    if cache is not None:
+        cache.save()
+    return ProjectReport(root, results, index.files_read, time.perf_counter() - started)
+
+
+def _verify_cached(root: str) -> ProjectReport:
+    return verify_project(root, use_cache=True)
+
+
+def _verify_uncached(root: str) -> ProjectReport:
+    return verify_project(root, use_cache=False)
+
+
+def verify_projects(
+    roots: Iterable[str],
+    jobs: Optional[int] = None,
+    use_cache: bool = True,
+    max_depth: Optional[int] = None,
+) -> Report:
+    """Discover projects under ``roots`` and verify them across a process pool."""
+    started = time.perf_counter()
+    worker = _verify_cached if use_cache else _verify_uncached
+    projects = discover_projects(roots, max_depth)
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1:
+        reports = [worker(root) for root in projects]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # Feeding the pool from the discovery generator overlaps the
+            # directory walk with verification.
+            futures = [executor.submit(worker, root) for root in projects]
+            reports = [future.result() for future in futures]
+    return Report(reports, time.perf_counter() - started)
+
+
+def print_report(report: Report, verbose: bool = False) -> None:
+    """Print a human-readable summary of ``report``."""
+    passed = failed = 0
+    for project in report.projects:
+        failures = project.failures
+        passed += len(project.results) - len(failures)
+        failed += len(failures)
+        if failures:
+            print(f"❌ {project.root}: {len(failures)} of {len(project.results)} checks failed")
+            for result in failures:
+                print(f"    ❌ {result.message}")
+        else:
+            print(f"✅ {project.root}: all {len(project.results)} checks passed")
+        if verbose:
+            for result in project.results:
+                if result.ok:
+                    print(f"    ✅ {result.message}")
+
+    print("=" * 50)
+    print(
+        f"📊 Results: {len(report.projects)} projects, {passed} passed, {failed} failed "
+        f"in {report.elapsed:.3f}s"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m droidpowers.verify",
+        description="Verify Droidpowers installations under one or more roots.",
+    )
+    parser.add_argument("roots", nargs="*", default=[os.curdir], help="directories or glob patterns to search")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-depth", type=int, default=None, help="limit how deep to search for .factory trees")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update .factory/.cache")
+    parser.add_argument("--json", action="store_true", help="print the merged report as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="list passing checks as well")
+    args = parser.parse_args(argv)
+
+    report = verify_projects(args.roots, jobs=args.jobs, use_cache=not args.no_cache, max_depth=args.max_depth)
+    if args.json:
+        json.dump(report.to_dict(), sys.stdout, indent=2)
+        print()
+    else:
+        if not report.projects:
+            print(f"❌ No .factory directories found under: {', '.join(args.roots)}")
+        print_report(report, verbose=args.verbose)
+    return 0 if report.ok and report.projects else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+// scripts/bench-fs-counter.js
+// Preloaded with `node --require` by droidpowers.bench. Counts files under
+// BENCH_ROOT that the process reads and writes the totals to BENCH_STATS on exit.
+const fs = require('fs');
+const path = require('path');
+
+const root = path.resolve(process.env.BENCH_ROOT || '/') + path.sep;
+const opened = [];
+
+function record(file) {
+  if (typeof file === 'string' && path.resolve(file).startsWith(root)) {
+    opened.push(path.resolve(file));
+  }
+}
+
+function isReadFlag(flags) {
+  return flags === undefined || flags === 'r' || flags === fs.constants.O_RDONLY;
+}
+
+function wrap(target, name, pathArgs = [0], check = () => true) {
+  const original = target[name];
+  if (typeof original !== 'function') {
+    return;
+  }
+  target[name] = function (...args) {
+    if (check(args)) {
+      pathArgs.forEach(index => record(args[index]));
+    }
+    return original.apply(this, args);
+  };
+}
+
+wrap(fs, 'readFileSync');
+wrap(fs, 'readFile');
+wrap(fs, 'createReadStream');
+wrap(fs, 'copyFileSync');
+wrap(fs, 'copyFile');
+wrap(fs, 'openSync', [0], args => isReadFlag(args[1]));
+wrap(fs, 'open', [0], args => typeof args[1] === 'function' || isReadFlag(args[1]));
+wrap(fs.promises, 'readFile');
+wrap(fs.promises, 'copyFile');
+wrap(fs.promises, 'open', [0], args => isReadFlag(args[1]));
+
+process.on('exit', () => {
+  if (process.env.BENCH_STATS) {
+    fs.writeFileSync(process.env.BENCH_STATS, JSON.stringify({
+      file_opens: opened.length,
+      files_read: new Set(opened).size
+    }));
+  }
+});
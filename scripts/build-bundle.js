@@ -0,0 +1,28 @@
+#!/usr/bin/env node
+// scripts/build-bundle.js - Pack templates/ into templates/templates.bundle
+const fs = require('fs').promises;
+const path = require('path');
+const { BUNDLE_FILE, collectTemplateFiles, packBundle, unpackBundle } = require('../src/bundle');
+
+async function main() {
+  const compress = !process.argv.includes('--no-compress');
+  const templatesDir = path.join(__dirname, '..', 'templates');
+  const files = await collectTemplateFiles(templatesDir);
+
+  const bundle = packBundle(files, { compress });
+  const unpacked = unpackBundle(bundle).files;
+  const broken = [...files].filter(([name, content]) => !content.equals(unpacked.get(name) || Buffer.alloc(0)));
+  if (broken.length > 0) {
+    throw new Error(`unpacking does not restore ${broken.map(([name]) => name).join(', ')}`);
+  }
+  await fs.writeFile(path.join(templatesDir, BUNDLE_FILE), bundle);
+
+  const sourceBytes = [...files.values()].reduce((sum, content) => sum + content.length, 0);
+  console.log(`✅ Wrote ${BUNDLE_FILE} (${files.size} files${compress ? ', gzip' : ''})`);
+  console.log(`📊 ${(sourceBytes / 1024).toFixed(1)} KiB → ${(bundle.length / 1024).toFixed(1)} KiB in one file`);
+}
+
+main().catch(error => {
+  console.error(`❌ Failed to build template bundle: ${error.message}`);
+  process.exit(1);
+});
@@ -0,0 +1,34 @@
+#!/usr/bin/env node
+// scripts/build-context-pack.js - Regenerate templates/context-pack.json
+const fs = require('fs').promises;
+const path = require('path');
+const { CONTEXT_PACK_FILE, SHARED_FILE, compileContextPack, verifyRoundTrip } = require('../src/context-pack');
+
+async function main() {
+  const templatesDir = path.join(__dirname, '..', 'templates');
+  const droidsDir = path.join(templatesDir, '.factory', 'droids');
+  const droids = new Map();
+  for (const name of (await fs.readdir(droidsDir)).filter(name => name.endsWith('.md')).sort()) {
+    droids.set(`droids/${name}`, await fs.readFile(path.join(droidsDir, name), 'utf8'));
+  }
+
+  const pack = compileContextPack(droids);
+  const problems = verifyRoundTrip(droids, pack);
+  if (problems.length > 0) {
+    throw new Error(`round-trip check failed:\n  ${problems.join('\n  ')}`);
+  }
+  await fs.writeFile(path.join(templatesDir, CONTEXT_PACK_FILE), JSON.stringify(pack, null, 2) + '\n');
+
+  const { sourceBytes, packBytes, shared, sessionTokens } = pack.stats;
+  const smaller = (before, after) => `${((1 - after / before) * 100).toFixed(1)}% smaller`;
+  console.log(`✅ Wrote ${CONTEXT_PACK_FILE} (${droids.size} droids, ${shared} shared passages)`);
+  console.log(`📊 ${(sourceBytes / 1024).toFixed(1)} KiB → ${(packBytes / 1024).toFixed(1)} KiB ` +
+    `(${smaller(sourceBytes, packBytes)}), round trip verified`);
+  console.log(`📊 ~${sessionTokens.source} → ~${sessionTokens.pack} tokens per session including ` +
+    `${SHARED_FILE} (${smaller(sessionTokens.source, sessionTokens.pack)})`);
+}
+
+main().catch(error => {
+  console.error(`❌ Failed to build context pack: ${error.message}`);
+  process.exit(1);
+});
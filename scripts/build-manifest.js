@@ -0,0 +1,16 @@
+#!/usr/bin/env node
+// scripts/build-manifest.js - Regenerate templates/manifest.json
+const path = require('path');
+const { MANIFEST_FILE, buildManifest, writeManifest } = require('../src/manifest');
+
+async function main() {
+  const templatesDir = path.join(__dirname, '..', 'templates');
+  const manifest = await buildManifest(path.join(templatesDir, '.factory'));
+  await writeManifest(path.join(templatesDir, MANIFEST_FILE), manifest);
+  console.log(`✅ Wrote ${MANIFEST_FILE} (${Object.keys(manifest.files).length} files)`);
+}
+
+main().catch(error => {
+  console.error(`❌ Failed to build manifest: ${error.message}`);
+  process.exit(1);
+});
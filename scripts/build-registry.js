@@ -0,0 +1,27 @@
+#!/usr/bin/env node
+// scripts/build-registry.js - Regenerate templates/registry.json
+const fs = require('fs').promises;
+const path = require('path');
+const { REGISTRY_FILE, buildRegistry, findDroidTests, readLinks, serializeRegistry } = require('../src/registry');
+
+async function main() {
+  const templatesDir = path.join(__dirname, '..', 'templates');
+  const contents = new Map();
+  for (const kind of ['droids', 'commands']) {
+    const dir = path.join(templatesDir, '.factory', kind);
+    for (const name of (await fs.readdir(dir)).filter(name => name.endsWith('.md')).sort()) {
+      contents.set(`${kind}/${name}`, await fs.readFile(path.join(dir, name)));
+    }
+  }
+
+  const registry = buildRegistry(contents, await readLinks(), await findDroidTests());
+  await fs.writeFile(path.join(templatesDir, REGISTRY_FILE), serializeRegistry(registry));
+  const linked = Object.values(registry.droids).filter(droid => droid.command).length;
+  console.log(`✅ Wrote ${REGISTRY_FILE} (${Object.keys(registry.droids).length} droids, ` +
+    `${Object.keys(registry.commands).length} commands, ${linked} linked)`);
+}
+
+main().catch(error => {
+  console.error(`❌ Failed to build registry: ${error.message}`);
+  process.exit(1);
+});
@@ -4,37 +4,15 @@
 import os
 import sys
 
-REQUIRED_DROIDS = [
-    "test-driven-development",
-    "systematic-debugging", 
-    "brainstorming",
-    "verification-before-completion",
-    "condition-based-waiting",
-    "defense-in-depth",
-    "writing-plans",
-    "executing-plans",
-    "requesting-code-review",
-    "receiving-code-review",
-    "using-git-worktrees",
-    "subagent-driven-development",
-    "root-cause-tracing",           # NEW
-    "finishing-a-development-branch", # NEW
-    "dispatching-parallel-agents",  # NEW
-    "testing-anti-patterns",        # NEW
-    "testing-skills-with-subagents", # NEW
-    "sharing-skills",               # NEW
-    "writing-skills",
-    "using-droids",
-    "skill-checker"
-]
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-def verify_droids():
+from droidpowers.cache import VerificationCache
+from droidpowers.checks import COMMAND_MAPPINGS, REQUIRED_DROIDS
+from droidpowers.corpus import CorpusIndex
+
+def verify_droids(index):
     """Check that all required droids exist."""
-    missing = []
-    for droid in REQUIRED_DROIDS:
-        droid_path = f".factory/droids/{droid}.md"
-        if not os.path.exists(droid_path):
-            missing.append(droid)
+    missing = [droid for droid in REQUIRED_DROIDS if index.droid(droid) is None]
     
     if missing:
         print(f"❌ Missing droids: {missing}")
@@ -43,44 +21,19 @@ def verify_droids():
         print(f"✅ All {len(REQUIRED_DROIDS)} droids implemented")
         return True
 
-def verify_commands():
+def verify_commands(index):
     """Check that all required commands exist."""
-    # Command mappings from droid names to command names
-    command_mappings = {
-        "test-driven-development": "tdd",
-        "systematic-debugging": "debug",
-        "brainstorming": "brainstorm", 
-        "verification-before-completion": "verify",
-        "condition-based-waiting": "condition-wait",
-        "defense-in-depth": "defense-in-depth",
-        "writing-plans": "plan",
-        "executing-plans": "execute",
-        "requesting-code-review": "review",
-        "receiving-code-review": "handle-review",
-        "using-git-worktrees": "worktree",
-        "subagent-driven-development": "subdev",
-        "root-cause-tracing": "root-cause-tracing",
-        "finishing-a-development-branch": "finish-branch",
-        "dispatching-parallel-agents": "parallel",
-        "testing-anti-patterns": "anti-patterns",
-        "testing-skills-with-subagents": "test-skills",
-        "sharing-skills": "share",
-        "writing-skills": "write-droid",
-        "using-droids": "droids",
-        "skill-checker": "skill-checker"
-    }
-    
-    missing = []
-    for droid, command in command_mappings.items():
-        command_path = f".factory/commands/{command}.md"
-        if not os.path.exists(command_path):
-            missing.append(f"{droid} -> {command}")
+    missing = [
+        f"{droid} -> {command}"
+        for droid, command in COMMAND_MAPPINGS.items()
+        if index.command(command) is None
+    ]
     
     if missing:
         print(f"❌ Missing commands: {missing}")
         return False
     else:
-        print(f"✅ All {len(command_mappings)} commands implemented")
+        print(f"✅ All {len(COMMAND_MAPPINGS)} commands implemented")
         return True
 
 def main():
@@ -88,8 +41,14 @@ def main():
     print("🔍 Droidpowers Completeness Verification")
     print("=" * 50)
     
-    droids_ok = verify_droids()
-    commands_ok = verify_commands()
+    # Existence checks only need the directory listing; the cache lets
+    # unchanged files be indexed without being read.
+    cache = None if "--no-cache" in sys.argv else VerificationCache.for_root(os.curdir)
+    index = CorpusIndex.load(os.curdir, cache=cache)
+    droids_ok = verify_droids(index)
+    commands_ok = verify_commands(index)
+    if cache is not None:
+        cache.save()
     
     print("=" * 50)
     if droids_ok and commands_ok:
@@ -4,90 +4,70 @@
 import os
 import sys
 
-# Define the 6 new droids and their commands
-NEW_DROIDS = [
-    "root-cause-tracing",
-    "finishing-a-development-branch", 
-    "dispatching-parallel-agents",
-    "testing-anti-patterns",
-    "testing-skills-with-subagents",
-    "sharing-skills"
-]
-
-DROID_COMMANDS = {
-    "root-cause-tracing": "root-cause-tracing",
-    "finishing-a-development-branch": "finish-branch",
-    "dispatching-parallel-agents": "parallel", 
-    "testing-anti-patterns": "anti-patterns",
-    "testing-skills-with-subagents": "test-skills",
-    "sharing-skills": "share"
-}
-
-def check_droid_exists(droid_name):
+from droidpowers.cache import VerificationCache
+from droidpowers.corpus import CorpusIndex
+from droidpowers.registry import default_registry
+from droidpowers.rules import default_rules
+
+# Verify the checkout this script lives in unless a root is given.
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+if len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
+    REPO_ROOT = sys.argv[1]
+
+RULES = default_rules()
+REGISTRY = default_registry()
+
+# The new droids are those with their own test module under tests/droids
+NEW_DROIDS = REGISTRY.tested_droids
+
+DROID_COMMANDS = {droid: REGISTRY.droids[droid].command for droid in NEW_DROIDS}
+
+def check_droid_exists(index, droid_name):
     """Check if a droid file exists and has basic structure."""
-    droid_path = f"/mnt/e/Projects/obra/droidpowers/.factory/droids/{droid_name}.md"
-    
-    if not os.path.exists(droid_path):
-        return False, f"Droid file {droid_path} does not exist"
-    
-    with open(droid_path, 'r') as f:
-        content = f.read()
-    
-    # Basic checks - just ensure the file has meaningful content
-    checks = []
-    
-    # Check for YAML frontmatter
-    if content.startswith("---"):
-        checks.append("YAML frontmatter")
-    
-    # Check for main content sections (flexible)
-    has_any_overview = any(word in content for word in ["## Overview", "# ", "## Description", droid_name.replace("-", " ").title()])
-    if has_any_overview:
-        checks.append("Overview section")
-    
-    has_any_process = any(word in content for word in [
-        "## Process", "## The Process", "## Common Anti-Patterns", 
-        "## RED-GREEN-REFACTOR", "## Contribution Process", "## When to Use",
-        "## Usage", "## How it Works"
-    ])
-    if has_any_process:
-        checks.append("Process/Usage section")
-    
-    # File should be substantial (> 500 chars for a real droid)
-    if len(content) > 500:
-        checks.append("Substantial content")
-    
-    if len(checks) >= 3:
-        return True, f"Droid {droid_name} is properly structured ({', '.join(checks)})"
-    else:
-        return False, f"Droid {droid_name} insufficient structure (found: {', '.join(checks)})"
+    droid = index.droid(droid_name)
 
-def check_command_exists(command_name):
+    if droid is None:
+        return False, f"Droid file {droid_name}.md does not exist in {index.root}"
+
+    ok, failures = RULES.check(droid, RULES.groups(["structure"]))
+    if not ok:
+        return False, f"Droid {droid_name} failed rules: {failures}"
+
+    return True, f"Droid {droid_name} is properly structured"
+
+def check_command_exists(index, command_name):
     """Check if a command file exists."""
-    command_path = f"/mnt/e/Projects/obra/droidpowers/.factory/commands/{command_name}.md"
-    
-    if not os.path.exists(command_path):
-        return False, f"Command file {command_path} does not exist"
-    
-    with open(command_path, 'r') as f:
-        content = f.read()
-    
-    if len(content.strip()) == 0:
-        return False, f"Command file {command_name} is empty"
-    
+    command = index.command(command_name)
+
+    if command is None:
+        return False, f"Command file {command_name}.md does not exist in {index.root}"
+
+    ok, failures = RULES.check(command, RULES.groups(RULES.command_profiles))
+    if not ok:
+        return False, f"Command file {command_name} failed rules: {failures}"
+
     return True, f"Command {command_name} exists and has content"
 
+def cached_check(cache, document, check, run):
+    """Run a check, reusing the cached result for unchanged documents."""
+    if cache is None or document is None:
+        return run()
+    return cache.check(document, f"simple_verify.{check}", RULES.version, run)
+
 def main():
     """Run verification tests."""
-    print("🔍 Verifying 6 new droids implementation...")
+    print(f"🔍 Verifying {len(NEW_DROIDS)} new droids implementation...")
     
+    cache = None if "--no-cache" in sys.argv else VerificationCache.for_root(REPO_ROOT)
+    index = CorpusIndex.load(REPO_ROOT, cache=cache)
     passed = 0
     failed = 0
     
     # Test droids
     print("\n📋 Testing Droids:")
     for droid_name in NEW_DROIDS:
-        success, message = check_droid_exists(droid_name)
+        success, message = cached_check(cache, index.droid(droid_name), "droid",
+                                        lambda: check_droid_exists(index, droid_name))
         if success:
             print(f"  ✅ {message}")
             passed += 1
@@ -98,7 +78,8 @@ def main():
     # Test commands  
     print("\n⚙️  Testing Commands:")
     for droid_name, command_name in DROID_COMMANDS.items():
-        success, message = check_command_exists(command_name)
+        success, message = cached_check(cache, index.command(command_name), "command",
+                                        lambda: check_command_exists(index, command_name))
         if success:
             print(f"  ✅ {message}")
             passed += 1
@@ -108,17 +89,10 @@ def main():
     
     # Test test files
     print("\n🧪 Testing Test Files:")
-    test_files = [
-        "test_root_cause_tracing.py",
-        "test_finishing_branch.py", 
-        "test_dispatching_parallel.py",
-        "test_testing_anti_patterns.py",
-        "test_testing_skills.py",
-        "test_sharing_skills.py"
-    ]
-    
+    test_files = [os.path.basename(REGISTRY.droids[droid].test) for droid in NEW_DROIDS]
+
     for test_file in test_files:
-        test_path = f"/mnt/e/Projects/obra/droidpowers/tests/droids/{test_file}"
+        test_path = os.path.join(REPO_ROOT, "tests", "droids", test_file)
         if os.path.exists(test_path):
             print(f"  ✅ Test file {test_file} exists")
             passed += 1
@@ -126,10 +100,13 @@ def main():
             print(f"  ❌ Test file {test_file} missing")
             failed += 1
     
+    if cache is not None:
+        cache.save()
+
     print(f"\n📊 Results: {passed} passed, {failed} failed")
     
     if failed == 0:
-        print("🎉 All tests passed! The 6 new droids are properly implemented with test coverage.")
+        print(f"🎉 All tests passed! The {len(NEW_DROIDS)} new droids are properly implemented with test coverage.")
         return True
     else:
         print("💥 Some tests failed. Please check the issues above.")
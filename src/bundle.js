@@ -0,0 +1,123 @@
+// src/bundle.js
+// Published packages ship the templates as one packed file: a header, a JSON
+// offset index and every file's bytes back to back, optionally gzipped. One
+// read and one inflate replace a readdir, stat and read per template file
+const fs = require('fs').promises;
+const path = require('path');
+const zlib = require('zlib');
+const { MANIFEST_FORMAT, buildManifest, hashContent } = require('./manifest');
+
+// Built into templates/ by `npm pack` (scripts/build-bundle.js); not tracked
+const BUNDLE_FILE = 'templates.bundle';
+const BUNDLE_FORMAT = 1;
+const BUNDLE_MAGIC = Buffer.from('DPBUNDLE');
+const HEADER_SIZE = BUNDLE_MAGIC.length + 4;
+
+// Files next to .factory that the installer reads; manifest.json is not
+// needed because the index records every file's hash and size
+const TEMPLATE_FILES = ['AGENTS.md.template', 'DSM_README.md', 'context-pack.json', 'registry.json'];
+const FACTORY_PREFIX = '.factory/';
+
+async function collectTemplateFiles(templatesDir) {
+  // Paths relative to templates/ mapped to their content
+  const factoryDir = path.join(templatesDir, '.factory');
+  const files = new Map();
+  for (const file of Object.keys((await buildManifest(factoryDir)).files)) {
+    files.set(FACTORY_PREFIX + file, await fs.readFile(path.join(factoryDir, ...file.split('/'))));
+  }
+  for (const name of TEMPLATE_FILES) {
+    try {
+      files.set(name, await fs.readFile(path.join(templatesDir, name)));
+    } catch (error) {
+      if (error.code !== 'ENOENT') throw error;
+    }
+  }
+  return files;
+}
+
+function packBundle(files, options = {}) {
+  const { compress = true } = options;
+  const entries = {};
+  const blobs = [];
+  // Identical files are stored once and share an offset
+  const offsets = new Map();
+  let size = 0;
+  for (const name of [...files.keys()].sort()) {
+    const content = files.get(name);
+    const sha256 = hashContent(content);
+    if (!offsets.has(sha256)) {
+      offsets.set(sha256, size);
+      blobs.push(content);
+      size += content.length;
+    }
+    entries[name] = { offset: offsets.get(sha256), size: content.length, sha256 };
+  }
+
+  const raw = Buffer.concat(blobs, size);
+  const payload = compress ? zlib.gzipSync(raw, { level: 9 }) : raw;
+  const index = Buffer.from(JSON.stringify({
+    format: BUNDLE_FORMAT,
+    compression: compress ? 'gzip' : 'none',
+    size,
+    files: entries
+  }));
+  const header = Buffer.alloc(HEADER_SIZE);
+  BUNDLE_MAGIC.copy(header);
+  header.writeUInt32LE(index.length, BUNDLE_MAGIC.length);
+  return Buffer.concat([header, index, payload]);
+}
+
+function unpackBundle(buffer) {
+  if (buffer.length < HEADER_SIZE || !buffer.subarray(0, BUNDLE_MAGIC.length).equals(BUNDLE_MAGIC)) {
+    throw new Error('Not a droidpowers template bundle');
+  }
+  const indexEnd = HEADER_SIZE + buffer.readUInt32LE(BUNDLE_MAGIC.length);
+  const index = JSON.parse(buffer.toString('utf8', HEADER_SIZE, indexEnd));
+  if (index.format !== BUNDLE_FORMAT) {
+    throw new Error(`Unsupported template bundle format ${index.format}`);
+  }
+  const packed = buffer.subarray(indexEnd);
+  const payload = index.compression === 'gzip' ? zlib.gunzipSync(packed) : packed;
+  if (payload.length !== index.size) {
+    throw new Error('Template bundle is truncated');
+  }
+
+  // Views into the one payload buffer; nothing is copied per file
+  const files = new Map();
+  for (const [name, entry] of Object.entries(index.files)) {
+    files.set(name, payload.subarray(entry.offset, entry.offset + entry.size));
+  }
+  return { index, files };
+}
+
+async function readBundle(bundlePath) {
+  try {
+    return unpackBundle(await fs.readFile(bundlePath));
+  } catch (error) {
+    if (error.code === 'ENOENT') return null;
+    throw error;
+  }
+}
+
+function bundleTemplates(bundle) {
+  // The .factory manifest and contents the installer needs, from the index
+  const files = {};
+  const contents = new Map();
+  for (const name of Object.keys(bundle.index.files).sort()) {
+    if (!name.startsWith(FACTORY_PREFIX)) continue;
+    const file = name.slice(FACTORY_PREFIX.length);
+    const { sha256, size } = bundle.index.files[name];
+    files[file] = { sha256, size };
+    contents.set(file, bundle.files.get(name));
+  }
+  return { manifest: { format: MANIFEST_FORMAT, algorithm: 'sha256', files }, contents };
+}
+
+module.exports = {
+  BUNDLE_FILE,
+  bundleTemplates,
+  collectTemplateFiles,
+  packBundle,
+  readBundle,
+  unpackBundle
+};
@@ -0,0 +1,301 @@
+// src/context-pack.js
+const { hashContent } = require('./manifest');
+
+// Shipped next to templates/.factory and regenerated by `npm run build:context-pack`
+const CONTEXT_PACK_FILE = 'context-pack.json';
+const CONTEXT_PACK_FORMAT = 1;
+// Appendix installed with the compact droids, relative to .factory
+const SHARED_FILE = 'context/shared.md';
+// A passage is hoisted only when it appears in this many droids and saves
+// more tokens than its references and its entry in the shared file cost
+const MIN_SHARED_DROIDS = 2;
+// Agents load the gateway droids and then one task droid per session, as in
+// droidpowers.tokens; the shared file is read once per session that needs it
+const GATEWAY = ['droids/using-droids.md', 'droids/skill-checker.md'];
+
+// References name the file so compact droids need no note explaining them
+const REFERENCE = /^\[context\/shared\.md#(S\d+)\]$/;
+const PASSAGE = /^\[(S\d+)\]$/;
+const FENCE = /^\s*(```|~~~)/;
+const RULE = /^\s*([-*_])(\s*\1){2,}\s*$/;
+const TABLE_SEPARATOR = /^\s*\|?(\s*:?-+:?\s*\|)+\s*(:?-+:?)?\s*$/;
+
+function splitFrontmatter(text) {
+  const match = /^---\n[\s\S]*?\n---\n/.exec(text);
+  return match ? [match[0], text.slice(match[0].length)] : ['', text];
+}
+
+function stripInline(line) {
+  // Bold markers only outside `inline code`
+  return line.split('`').map((part, i) => (i % 2 ? part : part.replace(/\*\*(\S(?:.*?\S)?)\*\*/g, '$1'))).join('`');
+}
+
+// The body as lines without decorative markup: blank lines, horizontal rules,
+// bold markers, table padding and trailing whitespace. Code is kept as is.
+function stripLines(body) {
+  const lines = [];
+  let fenced = false;
+  for (const raw of body.split('\n')) {
+    if (FENCE.test(raw)) {
+      fenced = !fenced;
+      lines.push({ text: raw.trimEnd(), code: true });
+    } else if (fenced) {
+      lines.push({ text: raw, code: true });
+    } else if (!raw.trim() || RULE.test(raw)) {
+      continue;
+    } else if (TABLE_SEPARATOR.test(raw) && raw.includes('|')) {
+      lines.push({ text: raw.trim().replace(/:?-+:?/g, cell => cell.replace(/-+/, '---')).replace(/\s+/g, ''), code: false });
+    } else if (raw.trimStart().startsWith('|')) {
+      lines.push({ text: stripInline(raw.trim()).replace(/\s*\|\s*/g, '|'), code: false });
+    } else {
+      lines.push({ text: stripInline(raw.trimEnd()), code: false });
+    }
+  }
+  return lines;
+}
+
+function stripDecoration(text) {
+  const [frontmatter, body] = splitFrontmatter(text);
+  return frontmatter + stripLines(body).map(line => line.text).join('\n') + '\n';
+}
+
+// Words and numbers in order; decoration never adds or removes any
+function contentWords(text) {
+  return text.match(/[\p{L}\p{N}]+/gu) || [];
+}
+
+// The stdlib BPE approximation of droidpowers.tokens.estimate_tokens
+const PIECES = /([A-Za-z]+)|(\d+)|(\n+[ \t]*|[ \t]{2,})|(([!-/:-@[-`{-~])\5*)|(\S)/gu;
+
+function estimateTokens(text) {
+  let count = 0;
+  for (const [piece, word, digits, space, punct] of text.matchAll(PIECES)) {
+    if (word) count += word.length <= 8 ? 1 : Math.ceil(word.length / 6);
+    else if (digits) count += Math.ceil(digits.length / 3);
+    else if (space) count += 1;
+    else if (punct) count += Math.ceil(punct.length / 4);
+    else count += Math.max(1, Math.floor(Buffer.byteLength(piece) / 2));
+  }
+  return count;
+}
+
+function reference(id) {
+  return `[${SHARED_FILE}#${id}]`;
+}
+
+function sameText(a, b) {
+  return Boolean(a && b && !a.code && !b.code && a.text === b.text);
+}
+
+// Every maximal run of prose lines that two droids have in common, so a
+// repeated paragraph or section is found whole rather than line by line
+function commonRuns(stripped) {
+  const places = new Map();
+  for (const [name, { lines }] of stripped) {
+    lines.forEach((line, index) => {
+      if (line.code) return;
+      if (!places.has(line.text)) places.set(line.text, []);
+      places.get(line.text).push({ name, index });
+    });
+  }
+  const runs = new Map();
+  for (const found of places.values()) {
+    for (const a of found) {
+      for (const b of found) {
+        if (a.name >= b.name) continue;
+        const left = stripped.get(a.name).lines;
+        const right = stripped.get(b.name).lines;
+        if (sameText(left[a.index - 1], right[b.index - 1])) continue;
+        let length = 1;
+        while (sameText(left[a.index + length], right[b.index + length])) length++;
+        const text = left.slice(a.index, a.index + length).map(line => line.text);
+        runs.set(text.join('\n'), text);
+      }
+    }
+  }
+  return [...runs.values()];
+}
+
+function findRun(lines, claimed, run) {
+  // Unclaimed starts of `run` among a droid's prose lines
+  const starts = [];
+  for (let i = 0; i + run.length <= lines.length; i++) {
+    if (run.every((text, j) => !claimed[i + j] && sameText(lines[i + j], { text, code: false }))) {
+      starts.push(i);
+      i += run.length - 1;
+    }
+  }
+  return starts;
+}
+
+function sessionTokens(tokens, sharedTokens, referencing) {
+  // Mean tokens an agent reads per session: the gateway, one task droid and
+  // the shared file when any of them references it
+  const names = [...tokens.keys()];
+  const gateway = GATEWAY.filter(name => tokens.has(name));
+  const tasks = names.filter(name => !GATEWAY.includes(name));
+  const paths = tasks.length > 0 ? tasks.map(name => [...gateway, name]) : [gateway];
+  const total = paths.reduce((sum, path) => sum + path.reduce((cost, name) => cost + tokens.get(name), 0) +
+    (path.some(name => referencing.has(name)) ? sharedTokens : 0), 0);
+  return Math.round(total / paths.length);
+}
+
+function compileContextPack(droids) {
+  // `droids` maps manifest paths such as 'droids/tdd.md' to their text
+  const names = [...droids.keys()].sort();
+  const stripped = new Map();
+  for (const name of names) {
+    const [frontmatter, body] = splitFrontmatter(droids.get(name));
+    const lines = stripLines(body);
+    for (const line of lines) {
+      if (REFERENCE.test(line.text.trim()) || PASSAGE.test(line.text)) {
+        throw new Error(`${name} contains a reserved context-pack line: ${line.text}`);
+      }
+    }
+    stripped.set(name, { frontmatter, lines, claimed: [], hoisted: new Map() });
+  }
+
+  // Largest savings first; a passage keeps the lines it claims, so shorter
+  // runs only count where they are not already part of a longer one
+  const saving = run => estimateTokens(run.join('\n'));
+  const referenceTokens = estimateTokens(reference('S1'));
+  const hoisted = [];
+  for (const run of commonRuns(stripped).sort((a, b) => saving(b) - saving(a) || a.join('\n').localeCompare(b.join('\n')))) {
+    const found = names.map(name => [name, findRun(stripped.get(name).lines, stripped.get(name).claimed, run)])
+      .filter(([, starts]) => starts.length > 0);
+    const uses = found.reduce((sum, [, starts]) => sum + starts.length, 0);
+    const entryTokens = estimateTokens(`[S1]\n${run.join('\n')}\n`);
+    if (found.length < MIN_SHARED_DROIDS || uses * (saving(run) - referenceTokens) <= entryTokens) continue;
+    const passage = { run };
+    for (const [name, starts] of found) {
+      const droid = stripped.get(name);
+      for (const start of starts) {
+        run.forEach((_, j) => { droid.claimed[start + j] = true; });
+        droid.hoisted.set(start, passage);
+      }
+    }
+    hoisted.push(passage);
+  }
+
+  // Ids follow first appearance so the output is stable across runs
+  let nextId = 1;
+  for (const name of names) {
+    const { hoisted: starts } = stripped.get(name);
+    for (const start of [...starts.keys()].sort((a, b) => a - b)) {
+      const passage = starts.get(start);
+      if (!passage.id) passage.id = `S${nextId++}`;
+    }
+  }
+
+  const files = {};
+  const sources = {};
+  const sourceTokens = new Map();
+  const packTokens = new Map();
+  const referencing = new Set();
+  let sourceBytes = 0;
+  for (const name of names) {
+    const { frontmatter, lines, claimed, hoisted: starts } = stripped.get(name);
+    const body = [];
+    lines.forEach((line, index) => {
+      if (starts.has(index)) body.push(reference(starts.get(index).id));
+      else if (!claimed[index]) body.push(line.text);
+    });
+    if (starts.size > 0) referencing.add(name);
+    files[name] = frontmatter + body.join('\n') + '\n';
+    sources[name] = hashContent(droids.get(name));
+    sourceBytes += Buffer.byteLength(droids.get(name));
+    sourceTokens.set(name, estimateTokens(droids.get(name)));
+    packTokens.set(name, estimateTokens(files[name]));
+  }
+  const passages = [...hoisted].sort((a, b) => Number(a.id.slice(1)) - Number(b.id.slice(1)));
+  if (passages.length > 0) {
+    const entries = passages.map(passage => `[${passage.id}]\n${passage.run.join('\n')}`);
+    files[SHARED_FILE] = ['# Shared Droid Passages', ...entries].join('\n') + '\n';
+  }
+
+  const packBytes = Object.values(files).reduce((sum, text) => sum + Buffer.byteLength(text), 0);
+  const sharedTokens = passages.length > 0 ? estimateTokens(files[SHARED_FILE]) : 0;
+  const total = tokens => [...tokens.values()].reduce((sum, count) => sum + count, 0);
+  const stats = {
+    sourceBytes,
+    packBytes,
+    shared: passages.length,
+    sourceTokens: total(sourceTokens),
+    packTokens: total(packTokens) + sharedTokens,
+    sessionTokens: {
+      source: sessionTokens(sourceTokens, 0, new Set()),
+      pack: sessionTokens(packTokens, sharedTokens, referencing)
+    }
+  };
+  return { format: CONTEXT_PACK_FORMAT, sources, stats, files };
+}
+
+function parseShared(text = '') {
+  // Each passage runs from its [Sn] line to the next one
+  const passages = new Map();
+  let lines = null;
+  for (const line of text.replace(/\n$/, '').split('\n')) {
+    const match = PASSAGE.exec(line);
+    if (match) passages.set(match[1], (lines = []));
+    else if (lines) lines.push(line);
+  }
+  return new Map([...passages].map(([id, passage]) => [id, passage.join('\n')]));
+}
+
+function expandDroid(text, passages) {
+  const [frontmatter, body] = splitFrontmatter(text);
+  const lines = body.split('\n').map(line => {
+    const match = REFERENCE.exec(line.trim());
+    if (!match) return line;
+    if (!passages.has(match[1])) throw new Error(`Unknown shared passage ${match[1]}`);
+    return passages.get(match[1]);
+  });
+  return frontmatter + lines.join('\n');
+}
+
+// Problems found expanding every compact droid and comparing it with its source
+function verifyRoundTrip(droids, pack) {
+  const passages = parseShared(pack.files[SHARED_FILE]);
+  const problems = [];
+  for (const [name, source] of droids) {
+    if (!(name in pack.files)) {
+      problems.push(`${name} is missing from the context pack`);
+      continue;
+    }
+    const expanded = expandDroid(pack.files[name], passages);
+    if (expanded !== stripDecoration(source)) {
+      problems.push(`${name} does not expand back to its source`);
+    } else if (contentWords(expanded).join(' ') !== contentWords(source).join(' ')) {
+      problems.push(`${name} lost words while being compacted`);
+    }
+  }
+  return problems;
+}
+
+async function loadContextPack(readTemplate, droids) {
+  // `readTemplate` resolves a file next to .factory to its content or null.
+  // A stale or missing pack (e.g. a development checkout) is compiled in memory
+  try {
+    const pack = JSON.parse((await readTemplate(CONTEXT_PACK_FILE)).toString('utf8'));
+    const current = pack.format === CONTEXT_PACK_FORMAT &&
+      Object.keys(pack.sources).length === droids.size &&
+      [...droids].every(([name, text]) => pack.sources[name] === hashContent(text));
+    if (current) return pack;
+  } catch {
+    // Fall through and compile
+  }
+  return compileContextPack(droids);
+}
+
+module.exports = {
+  CONTEXT_PACK_FILE,
+  SHARED_FILE,
+  compileContextPack,
+  contentWords,
+  estimateTokens,
+  expandDroid,
+  loadContextPack,
+  parseShared,
+  stripDecoration,
+  verifyRoundTrip
+};
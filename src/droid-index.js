@@ -0,0 +1,83 @@
+// src/droid-index.js
+// Generated into every installed .factory: one row per droid so the
+// using-droids gateway can route from ~2 KB instead of reading every droid
+const DROID_INDEX_FILE = 'droid-index.json';
+const DROID_INDEX_FORMAT = 1;
+const DROID_INDEX_FIELDS = ['name', 'tier', 'bytes', 'trigger'];
+
+// The droid whose "Core Droids Overview" assigns the tiers; it is the gateway itself
+const GATEWAY_DROID = 'using-droids';
+const TIER_ORDER = ['gateway', 'core', 'advanced', 'other'];
+const MAX_TRIGGER = 80;
+
+// Bullets may have lost their bold markers in a compact install
+const BULLET = /^\s*[-*]\s+(?:\*\*)?([a-z0-9-]+)(?:\*\*)?\s*[:\-–]\s*(.+)$/;
+
+function frontmatterField(text, key) {
+  const match = /^---\n([\s\S]*?)\n---\n/.exec(text);
+  if (!match) return '';
+  for (const line of match[1].split('\n')) {
+    const [name, ...rest] = line.split(':');
+    if (name.trim() === key && rest.length > 0) return rest.join(':').trim().replace(/^(['"])(.*)\1$/, '$2');
+  }
+  return '';
+}
+
+function tierOf(heading) {
+  if (/gateway/i.test(heading)) return 'gateway';
+  if (/^core/i.test(heading)) return 'core';
+  if (/^advanced/i.test(heading)) return 'advanced';
+  return null;
+}
+
+// Tier and one-line summary per droid from the gateway's overview section
+function overviewEntries(gatewayText) {
+  const entries = new Map();
+  let inOverview = false;
+  let tier = null;
+  for (const line of gatewayText.split('\n')) {
+    if (/^##\s/.test(line)) {
+      inOverview = /core droids overview/i.test(line);
+      tier = null;
+    } else if (inOverview && /^###\s/.test(line)) {
+      tier = tierOf(line.replace(/^#+\s*/, ''));
+    } else if (inOverview && tier) {
+      const match = BULLET.exec(line);
+      if (match) entries.set(match[1], { tier, summary: match[2].trim() });
+    }
+  }
+  return entries;
+}
+
+function shorten(text) {
+  const clause = text.split(' - ')[0].trim();
+  if (clause.length <= MAX_TRIGGER) return clause;
+  return clause.slice(0, MAX_TRIGGER).replace(/\s+\S*$/, '') + '…';
+}
+
+function buildDroidIndex(contents) {
+  // `contents` maps .factory paths to the buffers that will be installed
+  const droids = new Map();
+  for (const [file, content] of contents) {
+    const match = /^droids\/([^/]+)\.md$/.exec(file);
+    if (match) droids.set(match[1], content.toString('utf8'));
+  }
+  const overview = overviewEntries(droids.get(GATEWAY_DROID) || '');
+
+  const rows = [...droids].map(([name, text]) => {
+    const entry = overview.get(name);
+    const tier = name === GATEWAY_DROID ? 'gateway' : entry ? entry.tier : 'other';
+    const trigger = shorten((entry && entry.summary) || frontmatterField(text, 'description') || name);
+    return [name, tier, Buffer.byteLength(text), trigger];
+  });
+  rows.sort((a, b) => TIER_ORDER.indexOf(a[1]) - TIER_ORDER.indexOf(b[1]) || a[0].localeCompare(b[0]));
+  return { format: DROID_INDEX_FORMAT, fields: DROID_INDEX_FIELDS, droids: rows };
+}
+
+function serializeDroidIndex(index) {
+  // One droid per line: compact for the prompt, readable in a diff
+  const rows = index.droids.map(row => `  ${JSON.stringify(row)}`).join(',\n');
+  return `{"format":${index.format},"fields":${JSON.stringify(index.fields)},"droids":[\n${rows}\n]}\n`;
+}
+
+module.exports = { DROID_INDEX_FILE, buildDroidIndex, serializeDroidIndex };
@@ -1,9 +1,69 @@
 // src/file-operations.js
-const fs = require('fs').promises;
+const fsSync = require('fs');
+const fs = fsSync.promises;
 const path = require('path');
+const { pipeline } = require('stream');
+const { promisify } = require('util');
+
+const pipelineAsync = promisify(pipeline);
+
+// Files copied at once; enough to keep network filesystems busy
+const DEFAULT_CONCURRENCY = 16;
+
+// Errors after which a kernel-side copy is retried as a stream copy
+const COPY_FALLBACK_CODES = new Set(['ENOSYS', 'ENOTSUP', 'EOPNOTSUPP', 'EXDEV', 'EPERM', 'EINVAL']);
+
+function createLimiter(concurrency = DEFAULT_CONCURRENCY) {
+  const limit = Math.max(1, concurrency);
+  const queue = [];
+  let active = 0;
+
+  function next() {
+    if (active >= limit || queue.length === 0) return;
+    active++;
+    const { task, resolve, reject } = queue.shift();
+    Promise.resolve()
+      .then(task)
+      .then(resolve, reject)
+      .finally(() => {
+        active--;
+        next();
+      });
+  }
+
+  return (task) => new Promise((resolve, reject) => {
+    queue.push({ task, resolve, reject });
+    next();
+  });
+}
+
+function createDirectoryMaker() {
+  // Each directory is created once, however many files are queued for it
+  const pending = new Map();
+  return (dir) => {
+    if (!pending.has(dir)) {
+      pending.set(dir, fs.mkdir(dir, { recursive: true }));
+    }
+    return pending.get(dir);
+  };
+}
+
+async function streamCopy(src, dest) {
+  await pipelineAsync(fsSync.createReadStream(src), fsSync.createWriteStream(dest));
+}
+
+async function copyFileContents(src, dest) {
+  try {
+    // Reflink where the filesystem supports it, kernel-side copy otherwise
+    await fs.copyFile(src, dest, fsSync.constants.COPYFILE_FICLONE);
+  } catch (error) {
+    if (!COPY_FALLBACK_CODES.has(error.code)) throw error;
+    await streamCopy(src, dest);
+  }
+}
 
 async function copyDirectory(src, dest, options = {}) {
-  const { force = false, skipExisting = true } = options;
+  const { force = false, skipExisting = true, concurrency = DEFAULT_CONCURRENCY } = options;
 
   try {
     // Check if destination exists
@@ -16,43 +76,53 @@ async function copyDirectory(src, dest, options = {}) {
       await fs.rmdir(dest, { recursive: true });
     }
 
-    // Create destination directory
-    await fs.mkdir(dest, { recursive: true });
+    // Directory listing and file copies overlap: each file starts as soon as
+    // its directory exists, with at most `concurrency` copies in flight
+    const limit = createLimiter(concurrency);
+    const makeDirectory = createDirectoryMaker();
+    const copies = [];
 
-    // Copy all files and subdirectories
-    const entries = await fs.readdir(src, { withFileTypes: true });
+    async function walk(srcDir, destDir) {
+      const [entries] = await Promise.all([
+        fs.readdir(srcDir, { withFileTypes: true }),
+        makeDirectory(destDir)
+      ]);
+      const subdirectories = [];
 
-    for (const entry of entries) {
-      const srcPath = path.join(src, entry.name);
-      const destPath = path.join(dest, entry.name);
+      for (const entry of entries) {
+        const srcPath = path.join(srcDir, entry.name);
+        const destPath = path.join(destDir, entry.name);
 
-      if (entry.isDirectory()) {
-        await copyDirectory(srcPath, destPath, options);
-      } else {
-        await copyFile(srcPath, destPath, { skipExisting });
+        if (entry.isDirectory()) {
+          subdirectories.push(walk(srcPath, destPath));
+        } else {
+          copies.push(limit(() => copyFile(srcPath, destPath, { skipExisting, makeDirectory })));
+        }
       }
+      await Promise.all(subdirectories);
     }
+
+    await walk(src, dest);
+    await Promise.all(copies);
   } catch (error) {
     throw new Error(`Failed to copy directory ${src} to ${dest}: ${error.message}`);
   }
 }
 
 async function copyFile(src, dest, options = {}) {
-  const { skipExisting = true } = options;
+  const { skipExisting = true, makeDirectory = null } = options;
 
   try {
     // Check if destination exists and should be skipped
-    if (await fileExists(dest) && skipExisting) {
+    if (skipExisting && await fileExists(dest)) {
       return; // Skip existing files
     }
 
     // Ensure destination directory exists
     const destDir = path.dirname(dest);
-    await fs.mkdir(destDir, { recursive: true });
+    await (makeDirectory ? makeDirectory(destDir) : fs.mkdir(destDir, { recursive: true }));
 
-    // Copy the file using read/write approach (more compatible)
-    const content = await fs.readFile(src);
-    await fs.writeFile(dest, content);
+    await copyFileContents(src, dest);
   } catch (error) {
     throw new Error(`Failed to copy file ${src} to ${dest}: ${error.message}`);
   }
@@ -77,8 +147,12 @@ async function directoryExists(dirPath) {
 }
 
 module.exports = {
+  DEFAULT_CONCURRENCY,
   copyDirectory,
   copyFile,
+  copyFileContents,
+  createDirectoryMaker,
+  createLimiter,
   fileExists,
   directoryExists
 };
\ No newline at end of file
@@ -1,67 +1,181 @@
 // src/installer.js
+const fs = require('fs').promises;
 const path = require('path');
-const { copyDirectory, copyFile, directoryExists, fileExists } = require('./file-operations');
-
-async function installDroidpowers(targetDir = process.cwd(), options = {}) {
-  const { force = false } = options;
+const { BUNDLE_FILE, bundleTemplates, readBundle } = require('./bundle');
+const { loadContextPack } = require('./context-pack');
+const { DROID_INDEX_FILE, buildDroidIndex, serializeDroidIndex } = require('./droid-index');
+const { createLimiter, directoryExists, fileExists } = require('./file-operations');
+const { hashContent, loadManifest, syncDirectory } = require('./manifest');
+const { EXTRA_FILES, readRegistry } = require('./registry');
+
+// Templates directory (relative to this file)
+const TEMPLATES_DIR = path.join(__dirname, '..', 'templates');
+
+// Targets installed at once in fleet mode
+const DEFAULT_JOBS = 8;
+
+function addGeneratedFiles(manifest, contents, generated) {
+  // Generated files are installed and tracked like any template file
+  const files = { ...manifest.files };
+  for (const [file, text] of Object.entries(generated)) {
+    const content = Buffer.from(text);
+    contents.set(file, content);
+    files[file] = { sha256: hashContent(content), size: content.length };
+  }
+  const sorted = {};
+  for (const file of Object.keys(files).sort()) sorted[file] = files[file];
+  return { ...manifest, files: sorted };
+}
 
-  try {
-    // Validate target directory
-    await validateTargetDirectory(targetDir);
+async function applyContextPack(readTemplate, manifest, contents) {
+  // Swap each droid for its compact variant and add the shared appendix
+  const droids = new Map();
+  for (const [file, content] of contents) {
+    if (file.startsWith('droids/') && file.endsWith('.md')) droids.set(file, content.toString('utf8'));
+  }
+  const pack = await loadContextPack(readTemplate, droids);
+  return addGeneratedFiles(manifest, contents, pack.files);
+}
 
-    // Get templates directory (relative to this file)
-    const templatesDir = path.join(__dirname, '..', 'templates');
+async function openTemplateTree(templatesDir, factoryDir) {
+  // Check if templates directory exists
+  if (!(await directoryExists(templatesDir))) {
+    throw new Error(`Templates directory not found: ${templatesDir}`);
+  }
 
-    // Check if templates directory exists
-    if (!(await directoryExists(templatesDir))) {
-      throw new Error(`Templates directory not found: ${templatesDir}`);
+  if (!(await directoryExists(factoryDir))) {
+    // Published packages ship templates/.factory packed into one bundle
+    const bundle = await readBundle(path.join(templatesDir, BUNDLE_FILE));
+    if (!bundle) {
+      throw new Error('.factory template not found');
     }
+    return { ...bundleTemplates(bundle), readTemplate: async (name) => bundle.files.get(name) || null };
+  }
 
-    // Install .factory directory
-    const factorySrc = path.join(templatesDir, '.factory');
-    const factoryDest = path.join(targetDir, '.factory');
+  // Read and hash the tree once; every target is written from memory
+  const manifest = await loadManifest(templatesDir);
+  const contents = new Map();
+  await Promise.all(Object.keys(manifest.files).map(async (file) => {
+    contents.set(file, await fs.readFile(path.join(factoryDir, ...file.split('/'))));
+  }));
+  const readTemplate = async (name) => {
+    const src = path.join(templatesDir, name);
+    return (await fileExists(src)) ? fs.readFile(src) : null;
+  };
+  return { manifest, contents, readTemplate };
+}
 
-    if (await directoryExists(factorySrc)) {
-      await copyDirectory(factorySrc, factoryDest, { force, skipExisting: false });
-    } else {
-      throw new Error('.factory template not found');
+async function loadTemplates(templatesDir = TEMPLATES_DIR, options = {}) {
+  const { compact = false } = options;
+
+  const factoryDir = path.join(templatesDir, '.factory');
+  let { manifest, contents, readTemplate } = await openTemplateTree(templatesDir, factoryDir);
+  if (compact) {
+    manifest = await applyContextPack(readTemplate, manifest, contents);
+  }
+  // Sizes are those of the droids actually installed, compact or not
+  manifest = addGeneratedFiles(manifest, contents, {
+    [DROID_INDEX_FILE]: serializeDroidIndex(buildDroidIndex(contents))
+  });
+
+  // The registry names the files installed next to .factory
+  const registry = await readRegistry(readTemplate);
+  const extras = new Map();
+  for (const name of registry ? registry.extras : EXTRA_FILES) {
+    const content = await readTemplate(name);
+    if (content) {
+      extras.set(name, content);
     }
+  }
 
-    // Install AGENTS.md.template
-    const agentsTemplateSrc = path.join(templatesDir, 'AGENTS.md.template');
-    const agentsTemplateDest = path.join(targetDir, 'AGENTS.md.template');
+  return { templatesDir, factoryDir, manifest, registry, contents, extras };
+}
 
-    if (await fileExists(agentsTemplateSrc)) {
-      await copyFile(agentsTemplateSrc, agentsTemplateDest, { skipExisting: true });
+async function installExtraFile(targetDir, name, content) {
+  try {
+    // 'wx' fails if the file exists, so local customisations are kept
+    await fs.writeFile(path.join(targetDir, name), content, { flag: 'wx' });
+    return true;
+  } catch (error) {
+    if (error.code === 'EEXIST') return false;
+    throw error;
+  }
+}
+
+async function installDroidpowers(targetDir = process.cwd(), options = {}) {
+  const { force = false, concurrency, quiet = false, compact = false } = options;
+
+  try {
+    // Validate target directory
+    const warnings = await validateTargetDirectory(targetDir);
+    if (!quiet) {
+      warnings.forEach(warning => console.warn(`⚠️  Warning: ${warning}`));
     }
 
-    // Install DSM_README.md
-    const readmeSrc = path.join(templatesDir, 'DSM_README.md');
-    const readmeDest = path.join(targetDir, 'DSM_README.md');
+    const templates = options.templates || await loadTemplates(TEMPLATES_DIR, { compact });
 
-    if (await fileExists(readmeSrc)) {
-      await copyFile(readmeSrc, readmeDest, { skipExisting: true });
+    // Install .factory directory
+    const factoryDest = path.join(targetDir, '.factory');
+    if (await directoryExists(factoryDest) && !force) {
+      throw new Error(`Directory ${factoryDest} already exists. Use --force to overwrite.`);
     }
 
-    console.log('✅ Droidpowers installed successfully!');
-    console.log('📁 .factory/ directory added');
-    console.log('📄 AGENTS.md.template added');
-    console.log('📄 DSM_README.md added');
-    console.log('');
-    console.log('Next steps:');
-    console.log('1. Copy AGENTS.md.template to AGENTS.md and customize');
-    console.log('2. Start with /droid using-droids for any task');
+    // Write only missing or changed files and drop files removed upstream
+    const stats = await syncDirectory(templates.factoryDir, factoryDest, templates.manifest, {
+      concurrency,
+      contents: templates.contents
+    });
+
+    // Install AGENTS.md.template and DSM_README.md
+    const added = [];
+    for (const [name, content] of templates.extras) {
+      if (await installExtraFile(targetDir, name, content)) {
+        added.push(name);
+      }
+    }
+
+    if (!quiet) {
+      console.log('✅ Droidpowers installed successfully!');
+      console.log(`📁 .factory/ directory synced (${stats.written.length} written, ${stats.unchanged} unchanged, ${stats.removed.length} removed)${compact ? ' with compact droids' : ''}`);
+      console.log('📄 AGENTS.md.template added');
+      console.log('📄 DSM_README.md added');
+      console.log('');
+      console.log('Next steps:');
+      console.log('1. Copy AGENTS.md.template to AGENTS.md and customize');
+      console.log('2. Start with /droid using-droids for any task');
+    }
 
+    return { ...stats, added, warnings };
   } catch (error) {
-    console.error(`❌ Installation failed: ${error.message}`);
-    process.exit(1);
+    throw new Error(`Installation failed: ${error.message}`);
   }
 }
 
+async function installFleet(targets, options = {}) {
+  const { jobs = DEFAULT_JOBS, onResult = null } = options;
+  const templates = options.templates || await loadTemplates(TEMPLATES_DIR, { compact: options.compact });
+  const limit = createLimiter(jobs);
+
+  // One failing target is recorded and the others carry on
+  return Promise.all(targets.map(target => limit(async () => {
+    const started = Date.now();
+    const result = { target, ok: true, stats: null, error: null, durationMs: 0 };
+    try {
+      result.stats = await installDroidpowers(target, { ...options, templates, quiet: true });
+    } catch (error) {
+      result.ok = false;
+      result.error = error.message;
+    }
+    result.durationMs = Date.now() - started;
+    if (onResult) onResult(result);
+    return result;
+  })));
+}
+
 async function validateTargetDirectory(dir) {
   // Check if directory exists
   try {
-    const stat = await require('fs').promises.stat(dir);
+    const stat = await fs.stat(dir);
     if (!stat.isDirectory()) {
       throw new Error('Target is not a directory');
     }
@@ -71,15 +185,13 @@ async function validateTargetDirectory(dir) {
 
   // Basic validation that this looks like a project
   // At least one of: package.json, .git, or any source code file
-  const { fileExists, directoryExists } = require('./file-operations');
-
   const hasPackageJson = await fileExists(path.join(dir, 'package.json'));
   const hasGit = await directoryExists(path.join(dir, '.git'));
 
   if (!hasPackageJson && !hasGit) {
-    console.warn('⚠️  Warning: This does not appear to be a project directory');
-    console.warn('   Consider running this in a directory with package.json or .git');
+    return ['This does not appear to be a project directory (no package.json or .git)'];
   }
+  return [];
 }
 
-module.exports = { installDroidpowers };
\ No newline at end of file
+module.exports = { DEFAULT_JOBS, installDroidpowers, installFleet, loadTemplates };
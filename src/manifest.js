@@ -0,0 +1,151 @@
+// src/manifest.js
+const crypto = require('crypto');
+const fs = require('fs').promises;
+const path = require('path');
+const {
+  DEFAULT_CONCURRENCY,
+  copyFileContents,
+  createDirectoryMaker,
+  createLimiter
+} = require('./file-operations');
+
+// Shipped next to templates/.factory and regenerated by `npm run build:manifest`
+const MANIFEST_FILE = 'manifest.json';
+// Written into every installed .factory so the next install knows what it owns
+const INSTALLED_MANIFEST_FILE = '.droidpowers-manifest.json';
+const MANIFEST_FORMAT = 1;
+// Local caches that never ship, e.g. bytecode left by running the tools
+const IGNORED_DIRS = new Set(['.cache', '__pycache__']);
+
+function hashContent(content) {
+  return crypto.createHash('sha256').update(content).digest('hex');
+}
+
+async function hashFile(filePath) {
+  return hashContent(await fs.readFile(filePath));
+}
+
+async function listFiles(root, relative = '') {
+  const entries = await fs.readdir(path.join(root, relative), { withFileTypes: true });
+  const files = [];
+
+  for (const entry of entries) {
+    const entryPath = path.posix.join(relative, entry.name);
+    if (entry.isDirectory()) {
+      if (IGNORED_DIRS.has(entry.name)) continue;
+      files.push(...await listFiles(root, entryPath));
+    } else if (entry.isFile() && entryPath !== INSTALLED_MANIFEST_FILE) {
+      files.push(entryPath);
+    }
+  }
+  return files;
+}
+
+async function buildManifest(factoryDir) {
+  const files = {};
+  const paths = (await listFiles(factoryDir)).sort();
+
+  await Promise.all(paths.map(async (file) => {
+    const content = await fs.readFile(path.join(factoryDir, ...file.split('/')));
+    files[file] = { sha256: hashContent(content), size: content.length };
+  }));
+
+  const sorted = {};
+  for (const file of paths) sorted[file] = files[file];
+  return { format: MANIFEST_FORMAT, algorithm: 'sha256', files: sorted };
+}
+
+async function readManifest(manifestPath) {
+  try {
+    const manifest = JSON.parse(await fs.readFile(manifestPath, 'utf8'));
+    return manifest.format === MANIFEST_FORMAT && manifest.files ? manifest : null;
+  } catch {
+    return null;
+  }
+}
+
+async function loadManifest(templatesDir) {
+  // Development checkouts may not have generated the manifest yet
+  const shipped = await readManifest(path.join(templatesDir, MANIFEST_FILE));
+  return shipped || buildManifest(path.join(templatesDir, '.factory'));
+}
+
+async function writeManifest(manifestPath, manifest) {
+  await fs.writeFile(manifestPath, JSON.stringify(manifest, null, 2) + '\n');
+}
+
+async function isCurrent(destPath, entry) {
+  try {
+    const stat = await fs.stat(destPath);
+    return stat.isFile() && stat.size === entry.size && await hashFile(destPath) === entry.sha256;
+  } catch {
+    return false;
+  }
+}
+
+async function removeEmptyParents(dest, file) {
+  let dir = path.dirname(file);
+  while (dir !== '.') {
+    try {
+      await fs.rmdir(path.join(dest, ...dir.split('/')));
+    } catch {
+      return; // Not empty, or already gone
+    }
+    dir = path.dirname(dir);
+  }
+}
+
+async function syncDirectory(src, dest, manifest, options = {}) {
+  // `contents` maps manifest paths to preloaded buffers, written instead of copied
+  const { concurrency = DEFAULT_CONCURRENCY, contents = null } = options;
+  const stats = { written: [], unchanged: 0, removed: [] };
+  const previous = await readManifest(path.join(dest, INSTALLED_MANIFEST_FILE));
+  const limit = createLimiter(concurrency);
+  const makeDirectory = createDirectoryMaker();
+
+  await makeDirectory(dest);
+
+  await Promise.all(Object.entries(manifest.files).map(([file, entry]) => limit(async () => {
+    const destPath = path.join(dest, ...file.split('/'));
+    if (await isCurrent(destPath, entry)) {
+      stats.unchanged++;
+      return;
+    }
+    await makeDirectory(path.dirname(destPath));
+    if (contents && contents.has(file)) {
+      await fs.writeFile(destPath, contents.get(file));
+    } else {
+      await copyFileContents(path.join(src, ...file.split('/')), destPath);
+    }
+    stats.written.push(file);
+  })));
+
+  // Only files a previous install recorded are ours to delete
+  if (previous) {
+    for (const file of Object.keys(previous.files)) {
+      if (file in manifest.files) continue;
+      try {
+        await fs.unlink(path.join(dest, ...file.split('/')));
+        stats.removed.push(file);
+        await removeEmptyParents(dest, file);
+      } catch (error) {
+        if (error.code !== 'ENOENT') throw error;
+      }
+    }
+  }
+
+  await writeManifest(path.join(dest, INSTALLED_MANIFEST_FILE), manifest);
+  return stats;
+}
+
+module.exports = {
+  MANIFEST_FILE,
+  INSTALLED_MANIFEST_FILE,
+  MANIFEST_FORMAT,
+  buildManifest,
+  hashContent,
+  loadManifest,
+  readManifest,
+  writeManifest,
+  syncDirectory
+};
@@ -0,0 +1,143 @@
+// src/registry.js
+// One scan of templates/.factory joined with the droid -> command links in
+// droidpowers/rules.json, so the installer, verifiers and tests stop keeping
+// their own lists of droids, commands and files
+const fs = require('fs').promises;
+const path = require('path');
+const { hashContent } = require('./manifest');
+
+// Shipped next to templates/.factory and regenerated by `npm run build:registry`
+const REGISTRY_FILE = 'registry.json';
+const REGISTRY_FORMAT = 1;
+// Installed next to .factory; never overwritten once they exist
+const EXTRA_FILES = ['AGENTS.md.template', 'DSM_README.md'];
+
+const ROOT_DIR = path.join(__dirname, '..');
+const RULES_FILE = path.join(ROOT_DIR, 'droidpowers', 'rules.json');
+// Per-droid test modules declare the droid they cover as DROID = "name"
+const DROID_TESTS_DIR = path.join(ROOT_DIR, 'tests', 'droids');
+const DROID_CONSTANT = /^DROID\s*=\s*["']([a-z0-9-]+)["']/m;
+
+function unquote(value) {
+  return value.replace(/^(['"])(.*)\1$/, '$2');
+}
+
+// The same YAML subset droidpowers.corpus understands: scalars, quoted
+// scalars, inline [a, b] lists and block "- item" lists
+function parseFrontmatter(text) {
+  const match = /^---\n([\s\S]*?)\n---(?:\n|$)/.exec(text);
+  if (!match) return {};
+  const data = {};
+  let lastKey = null;
+  for (const line of match[1].split('\n')) {
+    const stripped = line.trim();
+    if (stripped.startsWith('- ') && /^\s/.test(line) && lastKey !== null) {
+      data[lastKey] = [...(Array.isArray(data[lastKey]) ? data[lastKey] : []), unquote(stripped.slice(2).trim())];
+      continue;
+    }
+    const colon = line.indexOf(':');
+    if (colon > 0 && !/^\s/.test(line)) {
+      lastKey = line.slice(0, colon).trim();
+      const value = line.slice(colon + 1).trim();
+      if (value.startsWith('[') && value.endsWith(']')) {
+        const inner = value.slice(1, -1).trim();
+        data[lastKey] = inner ? inner.split(',').map(item => unquote(item.trim())) : [];
+      } else {
+        data[lastKey] = unquote(value);
+      }
+    }
+  }
+  return data;
+}
+
+function entry(file, content) {
+  return { path: file, sha256: hashContent(content), size: content.length };
+}
+
+function buildRegistry(contents, links, tests = {}) {
+  // `contents` maps .factory paths to their buffers, `links` maps droid names
+  // to command names in spec order and `tests` maps droids to test modules
+  const found = { droids: new Map(), commands: new Map() };
+  for (const [file, content] of contents) {
+    const match = /^(droids|commands)\/([^/]+)\.md$/.exec(file);
+    if (match) found[match[1]].set(match[2], { file, content });
+  }
+
+  const problems = [];
+  for (const [droid, command] of Object.entries(links)) {
+    if (!found.droids.has(droid)) problems.push(`droid ${droid} is in rules.json but not in templates`);
+    if (command && !found.commands.has(command)) problems.push(`command ${command} for ${droid} is not in templates`);
+  }
+  if (problems.length > 0) {
+    throw new Error(problems.join('; '));
+  }
+
+  // Spec order first so the verifiers report in the order rules.json lists
+  // droids; droids without a spec entry follow alphabetically
+  const linked = Object.keys(links);
+  const names = [...linked, ...[...found.droids.keys()].filter(name => !(name in links)).sort()];
+  const owners = new Map(linked.filter(name => links[name]).map(name => [links[name], name]));
+
+  const droids = {};
+  for (const name of names) {
+    const { file, content } = found.droids.get(name);
+    droids[name] = {
+      command: links[name] || null,
+      ...entry(file, content),
+      frontmatter: parseFrontmatter(content.toString('utf8')),
+      test: tests[name] || null
+    };
+  }
+  const commands = {};
+  for (const name of [...found.commands.keys()].sort()) {
+    const { file, content } = found.commands.get(name);
+    commands[name] = { droid: owners.get(name) || null, ...entry(file, content) };
+  }
+  return { format: REGISTRY_FORMAT, algorithm: 'sha256', droids, commands, extras: EXTRA_FILES };
+}
+
+async function readLinks(rulesFile = RULES_FILE) {
+  const spec = JSON.parse(await fs.readFile(rulesFile, 'utf8'));
+  return Object.fromEntries(Object.entries(spec.droids || {}).map(([name, droid]) => [name, droid.command || null]));
+}
+
+async function findDroidTests(testsDir = DROID_TESTS_DIR) {
+  // Published packages ship without tests; the registry then links none
+  let names;
+  try {
+    names = (await fs.readdir(testsDir)).filter(name => /^test_.*\.py$/.test(name)).sort();
+  } catch {
+    return {};
+  }
+  const tests = {};
+  for (const name of names) {
+    const match = DROID_CONSTANT.exec(await fs.readFile(path.join(testsDir, name), 'utf8'));
+    if (match) tests[match[1]] = path.posix.join('tests', 'droids', name);
+  }
+  return tests;
+}
+
+async function readRegistry(readTemplate) {
+  // `readTemplate` resolves a file next to .factory to its content or null
+  try {
+    const registry = JSON.parse((await readTemplate(REGISTRY_FILE)).toString('utf8'));
+    return registry.format === REGISTRY_FORMAT && registry.droids ? registry : null;
+  } catch {
+    return null;
+  }
+}
+
+function serializeRegistry(registry) {
+  return JSON.stringify(registry, null, 2) + '\n';
+}
+
+module.exports = {
+  EXTRA_FILES,
+  REGISTRY_FILE,
+  buildRegistry,
+  findDroidTests,
+  parseFrontmatter,
+  readLinks,
+  readRegistry,
+  serializeRegistry
+};
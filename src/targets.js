@@ -0,0 +1,111 @@
+// src/targets.js
+const fs = require('fs').promises;
+const path = require('path');
+
+// Never descended into when expanding `**`
+const SKIP_DIRS = new Set(['.git', 'node_modules', '.factory']);
+
+function hasMagic(segment) {
+  return /[*?[]/.test(segment);
+}
+
+function segmentToRegExp(segment) {
+  let source = '';
+  for (let i = 0; i < segment.length; i++) {
+    const char = segment[i];
+    if (char === '*') {
+      source += '[^/]*';
+    } else if (char === '?') {
+      source += '[^/]';
+    } else if (char === '[') {
+      const end = segment.indexOf(']', i + 1);
+      if (end === -1) {
+        source += '\\[';
+      } else {
+        source += `[${segment.slice(i + 1, end).replace(/^!/, '^').replace(/\\/g, '\\\\')}]`;
+        i = end;
+      }
+    } else {
+      source += char.replace(/[.+^${}()|\\]/g, '\\$&');
+    }
+  }
+  return new RegExp(`^${source}$`);
+}
+
+async function subdirectories(dir) {
+  try {
+    const entries = await fs.readdir(dir, { withFileTypes: true });
+    return entries.filter(entry => entry.isDirectory()).map(entry => entry.name);
+  } catch {
+    return [];
+  }
+}
+
+async function descendants(dir) {
+  const found = [dir];
+  for (const name of await subdirectories(dir)) {
+    if (!SKIP_DIRS.has(name)) {
+      found.push(...await descendants(path.join(dir, name)));
+    }
+  }
+  return found;
+}
+
+async function expandPattern(pattern) {
+  if (!hasMagic(pattern)) {
+    return [pattern];
+  }
+
+  const absolute = path.isAbsolute(pattern);
+  const segments = pattern.split(/[\\/]+/).filter(Boolean);
+  let current = [absolute ? path.parse(path.resolve(pattern)).root : '.'];
+
+  for (const segment of segments) {
+    const next = [];
+    if (segment === '**') {
+      for (const dir of current) next.push(...await descendants(dir));
+    } else if (hasMagic(segment)) {
+      const regex = segmentToRegExp(segment);
+      for (const dir of current) {
+        for (const name of await subdirectories(dir)) {
+          // Like shells, wildcards do not match hidden directories
+          if (regex.test(name) && (!name.startsWith('.') || segment.startsWith('.'))) {
+            next.push(path.join(dir, name));
+          }
+        }
+      }
+    } else {
+      for (const dir of current) next.push(path.join(dir, segment));
+    }
+    current = next;
+  }
+  return current;
+}
+
+async function expandTargets(patterns) {
+  // Glob patterns select directories; plain paths are passed through so
+  // missing targets are reported rather than silently dropped
+  const targets = [];
+  const seen = new Set();
+  for (const pattern of patterns) {
+    for (const target of (await expandPattern(pattern)).sort()) {
+      const resolved = path.resolve(target);
+      if (!seen.has(resolved)) {
+        seen.add(resolved);
+        targets.push(resolved);
+      }
+    }
+  }
+  return targets;
+}
+
+async function readTargets(stream) {
+  let input = '';
+  stream.setEncoding('utf8');
+  for await (const chunk of stream) {
+    input += chunk;
+  }
+  return input.split(/\r?\n/).map(line => line.trim()).filter(line => line && !line.startsWith('#'));
+}
+
+module.exports = { expandTargets, readTargets };
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""K-ary git bisect across worktrees for systematic-debugging.
+
+``git bisect run`` tests one commit at a time. This tool tests ``--jobs``
+commits at once, each in its own worktree leased from the worktree pool
+(see ``worktree_pool.py``), and splits the remaining range into ``jobs + 1``
+parts per round instead of two. A 1000-commit range takes 10 serial bisect
+steps but 4 rounds with 8 workers.
+
+The test command follows ``git bisect run`` conventions: exit 0 is good,
+125 means the commit cannot be tested (skip), anything else is bad. A test
+that exceeds ``--timeout`` counts as bad. Verdicts are cached per test
+command and tree in ``.factory/.cache/bisect-verdicts.json``, so rerunning an
+investigation, or widening its range, only tests commits never seen before.
+
+The search follows first-parent history between the two ends, so a
+regression that arrived through a merge is reported at that merge; bisect
+between the merge's parents to go further.
+
+Usage::
+
+    python .factory/tools/parallel_bisect.py --good v1.4.0 --bad HEAD --jobs 8 -- npm test
+    python .factory/tools/parallel_bisect.py --good abc123 --timeout 300 -- pytest tests/test_abort.py -x
+"""
+
+import argparse
+import json
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from worktree_pool import DEFAULT_POOL_DIR, WorktreePool, git, repo_root
+
+GOOD, BAD, SKIP = "good", "bad", "skip"
+SKIP_EXIT_CODE = 125
+CACHE_FILE = os.path.join(".factory", ".cache", "bisect-verdicts.json")
+
+
+class Commit(NamedTuple):
+    sha: str
+    tree: str
+    subject: str
+
+
+class Verdict(NamedTuple):
+    commit: Commit
+    verdict: str
+    elapsed: float
+    cached: bool = False
+
+
+class BisectResult(NamedTuple):
+    """Outcome of a search: the first bad commit, or the range skips left."""
+
+    first_bad: Optional[Commit]
+    candidates: List[Commit]
+    rounds: int
+    tested: int
+    cached: int
+
+
+def commit_range(root: str, good: str, bad: str) -> List[Commit]:
+    """First-parent commits after ``good`` up to and including ``bad``, oldest first."""
+    good_sha, bad_sha = git(["rev-parse", good], root), git(["rev-parse", bad], root)
+    if subprocess.run(["git", "merge-base", "--is-ancestor", good_sha, bad_sha], cwd=root).returncode != 0:
+        raise ValueError(f"{good} is not an ancestor of {bad}")
+    log = git(["log", "--first-parent", "--reverse", "--format=%H %T %s", f"{good_sha}..{bad_sha}"], root)
+    commits = [Commit(*(line.split(" ", 2) + [""])[:3]) for line in log.splitlines() if line]
+    if not commits:
+        raise ValueError(f"no commits between {good} and {bad}")
+    return commits
+
+
+def probe_points(unknown: Sequence[int], jobs: int) -> List[int]:
+    """Up to ``jobs`` indices splitting ``unknown`` into equal parts."""
+    count = min(max(1, jobs), len(unknown))
+    points = [unknown[(j + 1) * len(unknown) // (count + 1)] for j in range(count)]
+    return sorted(set(points))
+
+
+def bisect(commits: Sequence[Commit], test: Callable[[List[Commit]], List[Verdict]], jobs: int,
+           on_round: Optional[Callable[[int, List[Verdict], int], None]] = None) -> BisectResult:
+    """Find the first bad commit; everything before ``commits`` is good, the last one is bad.
+
+    ``test`` receives the commits of one round and returns their verdicts.
+    """
+    low, high = 0, len(commits) - 1  # Unknown commits are low..high-1; high is bad
+    skipped = set()
+    rounds = tested = cached = 0
+    while True:
+        unknown = [i for i in range(low, high) if i not in skipped]
+        if not unknown:
+            break
+        points = probe_points(unknown, jobs)
+        verdicts = test([commits[i] for i in points])
+        rounds += 1
+        tested += len(verdicts)
+        cached += sum(v.cached for v in verdicts)
+        by_index = dict(zip(points, verdicts))
+        bad = [i for i, v in by_index.items() if v.verdict == BAD]
+        if bad:
+            high = min(bad)
+        good = [i for i, v in by_index.items() if v.verdict == GOOD and i < high]
+        if good:
+            low = max(good) + 1
+        skipped.update(i for i, v in by_index.items() if v.verdict == SKIP)
+        if on_round:
+            on_round(rounds, verdicts, high - low + 1)
+
+    first_bad = commits[high] if low == high else None
+    return BisectResult(first_bad, list(commits[low:high + 1]), rounds, tested, cached)
+
+
+class VerdictCache:
+    """Good/bad verdicts per test command, keyed by tree so rebuilt histories still hit."""
+
+    def __init__(self, path: Optional[str], command: str):
+        self.path = path
+        self.command = command
+        self.data: Dict[str, Dict[str, str]] = {}
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError):
+                self.data = {}
+
+    def get(self, commit: Commit) -> Optional[str]:
+        return self.data.get(self.command, {}).get(commit.tree)
+
+    def put(self, commit: Commit, verdict: str) -> None:
+        if verdict != SKIP:
+            self.data.setdefault(self.command, {})[commit.tree] = verdict
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+def run_test(command: str, worktree: str, timeout: Optional[float]) -> str:
+    """Run the test command in ``worktree`` and map its exit code to a verdict.
+
+    The command runs in its own session so a timeout kills everything it
+    started, not just the shell; stray test processes would otherwise hold CPU
+    through the next round.
+    """
+    proc = subprocess.Popen(command, shell=True, cwd=worktree, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+        return BAD
+    if returncode == 0:
+        return GOOD
+    return SKIP if returncode == SKIP_EXIT_CODE else BAD
+
+
+class WorktreeTester:
+    """Tests one round of commits concurrently, one pool worktree per commit."""
+
+    def __init__(self, pool: WorktreePool, command: str, cache: VerdictCache, jobs: int,
+                 timeout: Optional[float] = None):
+        self.pool = pool
+        self.command = command
+        self.cache = cache
+        self.jobs = jobs
+        self.timeout = timeout
+
+    def _test_one(self, commit: Commit) -> Verdict:
+        started = time.perf_counter()
+        path = self.pool.checkout(None, commit.sha)
+        try:
+            verdict = run_test(self.command, path, self.timeout)
+        finally:
+            self.pool.release(path)
+        return Verdict(commit, verdict, time.perf_counter() - started)
+
+    def __call__(self, commits: List[Commit]) -> List[Verdict]:
+        known = {c.sha: Verdict(c, self.cache.get(c), 0.0, True) for c in commits if self.cache.get(c)}
+        pending = [c for c in commits if c.sha not in known]
+        # Create missing worktrees one at a time; concurrent `git worktree add` races on repo metadata
+        self.pool.fill(len(pending), pending[0].sha if pending else "HEAD")
+        with ThreadPoolExecutor(max_workers=max(1, min(self.jobs, len(pending) or 1))) as executor:
+            for result in executor.map(self._test_one, pending):
+                known[result.commit.sha] = result
+                self.cache.put(result.commit, result.verdict)
+        self.cache.save()
+        return [known[c.sha] for c in commits]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bisect a regression by testing several commits per round")
+    parser.add_argument("--good", required=True, help="Known good commit")
+    parser.add_argument("--bad", default="HEAD", help="Known bad commit (default: HEAD)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 2,
+                        help="Commits tested per round (default: CPU count)")
+    parser.add_argument("--timeout", type=float, help="Seconds before a test run counts as bad")
+    parser.add_argument("--pool-dir", default=DEFAULT_POOL_DIR, help=f"Worktree pool (default: {DEFAULT_POOL_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not record cached verdicts")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="Test command, after --")
+    args = parser.parse_args(argv)
+
+    words = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not words:
+        parser.error("a test command is required, e.g. -- npm test")
+    command = words[0] if len(words) == 1 else shlex.join(words)
+
+    try:
+        root = repo_root()
+        commits = commit_range(root, args.good, args.bad)
+        cache = VerdictCache(None if args.no_cache else os.path.join(root, CACHE_FILE), command)
+        tester = WorktreeTester(WorktreePool(root, args.pool_dir), command, cache, args.jobs, args.timeout)
+        icons = {GOOD: "✅", BAD: "❌", SKIP: "⏭️"}
+
+        def report(number: int, verdicts: List[Verdict], remaining: int) -> None:
+            if args.json:
+                return
+            print(f"🔍 Round {number}: {len(verdicts)} commit(s) tested, {remaining} left in range")
+            for v in verdicts:
+                source = "cached" if v.cached else f"{v.elapsed:.1f}s"
+                print(f"   {icons[v.verdict]} {v.commit.sha[:10]} {v.commit.subject[:60]} ({source})")
+
+        if not args.json:
+            print(f"🔍 Bisecting {len(commits)} commits with {args.jobs} worktree(s) per round")
+        result = bisect(commits, tester, args.jobs, report)
+    except (subprocess.CalledProcessError, ValueError) as error:
+        print(f"❌ {getattr(error, 'stderr', None) or error}".strip(), file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps({
+            "first_bad": result.first_bad._asdict() if result.first_bad else None,
+            "candidates": [c._asdict() for c in result.candidates],
+            "rounds": result.rounds,
+            "tested": result.tested,
+            "cached": result.cached,
+        }, indent=2))
+    elif result.first_bad:
+        print(f"🎯 First bad commit: {result.first_bad.sha} {result.first_bad.subject}")
+        print(f"📊 {result.rounds} round(s), {result.tested} verdict(s), {result.cached} from cache")
+    else:
+        print(f"⚠️  Skipped commits hide the culprit; it is one of {len(result.candidates)}:")
+        for commit in result.candidates:
+            print(f"   {commit.sha[:10]} {commit.subject}")
+    return 0 if result.first_bad else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
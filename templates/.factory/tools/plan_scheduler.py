@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Dependency-aware scheduling of writing-plans plans for executing-plans.
+
+A plan written by the writing-plans droid is a series of ``### Task N: Name``
+sections, each with a ``**Files:**`` list (``Create:``, ``Modify:``,
+``Test:``) and bite-sized ``**Step N:**`` entries. This tool turns it into a
+task DAG:
+
+- a task depends on every earlier task that touches one of the same files,
+  so two tasks never edit a file at the same time and plan order is kept;
+- ``Depends on: Task 2, Task 5`` anywhere in a task adds explicit edges.
+
+Each task's weight is its step count, or ``Estimate: 30m`` if given. Tasks
+are then list-scheduled onto ``--workers`` slots, longest remaining
+dependency chain first, which gives parallel waves. With ``--run`` every task
+is executed as a shell command as soon as its dependencies finish, so the plan
+takes about as long as its critical path rather than the sum of its tasks.
+
+Usage::
+
+    python .factory/tools/plan_scheduler.py docs/plans/feature.md --workers 3
+    python .factory/tools/plan_scheduler.py docs/plans/feature.md --json
+    python .factory/tools/plan_scheduler.py docs/plans/feature.md --workers 4 \\
+        --run 'droid exec "Execute Task $TASK_ID ($TASK_TITLE) from $PLAN_PATH"'
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+_TASK = re.compile(r"^#{2,4}\s+Task\s+([\w.-]+)\s*[:.-]?\s*(.*?)\s*$", re.IGNORECASE)
+_FILE = re.compile(r"^\s*[-*]\s*(Create|Modify|Test|Delete|Update)\s*:\s*`([^`]+)`", re.IGNORECASE)
+_STEP = re.compile(r"^\s*\*\*Step\s+\d+", re.IGNORECASE)
+_DEPENDS = re.compile(r"depends\s+on\s*:?\**\s*(.+)$", re.IGNORECASE)
+# Dotted ids ("Task 1.2") are kept whole; only a trailing sentence period is dropped
+_TASK_REF = re.compile(r"Task\s+([\w-]+(?:\.[\w-]+)*)", re.IGNORECASE)
+_ESTIMATE = re.compile(r"estimate\s*:?\**\s*(\d+(?:\.\d+)?)\s*(m|min|minutes?|h|hours?)\b", re.IGNORECASE)
+
+
+class PlanError(ValueError):
+    """The plan cannot be scheduled (unknown dependency or a cycle)."""
+
+
+class Task(NamedTuple):
+    """One plan task and what it touches."""
+
+    id: str
+    title: str
+    files: Tuple[str, ...]
+    depends_on: Tuple[str, ...]
+    weight: float
+    line: int
+
+
+class Schedule(NamedTuple):
+    """Waves of tasks that can run together, and the numbers behind them."""
+
+    waves: List[List[str]]
+    critical_path: List[str]
+    critical_length: float
+    serial_length: float
+
+
+def _normalize_path(path: str) -> str:
+    # `src/app.py:123-145` touches src/app.py
+    path = re.sub(r":\d+(?:-\d+)?$", "", path.strip())
+    return path[2:] if path.startswith("./") else path
+
+
+def parse_plan(text: str) -> List[Task]:
+    """Extract tasks, touch sets, explicit dependencies and weights from a plan."""
+    tasks: List[Task] = []
+    current: Optional[dict] = None
+    fenced = False
+
+    def finish():
+        if current is not None:
+            weight = current["estimate"] or max(1, current["steps"])
+            tasks.append(Task(current["id"], current["title"], tuple(current["files"]),
+                              tuple(current["depends"]), float(weight), current["line"]))
+
+    for number, line in enumerate(text.splitlines(), 1):
+        if line.lstrip().startswith("```"):
+            fenced = not fenced
+            continue
+        if fenced:
+            continue
+        match = _TASK.match(line)
+        if match:
+            finish()
+            current = {"id": match.group(1), "title": match.group(2), "files": [], "depends": [],
+                       "steps": 0, "estimate": 0.0, "line": number}
+            continue
+        if current is None:
+            continue
+        match = _FILE.match(line)
+        if match:
+            path = _normalize_path(match.group(2))
+            if path not in current["files"]:
+                current["files"].append(path)
+        if _STEP.match(line):
+            current["steps"] += 1
+        match = _DEPENDS.search(line)
+        if match:
+            for ref in _TASK_REF.findall(match.group(1)):
+                if ref not in current["depends"]:
+                    current["depends"].append(ref)
+        match = _ESTIMATE.search(line)
+        if match:
+            amount = float(match.group(1))
+            # Weights are in plan steps; one step is about five minutes
+            minutes = amount * 60 if match.group(2).lower().startswith("h") else amount
+            current["estimate"] = minutes / 5
+    finish()
+    return tasks
+
+
+def build_dag(tasks: List[Task]) -> Dict[str, Set[str]]:
+    """Map each task id to the ids it must wait for."""
+    ids = {task.id for task in tasks}
+    if len(ids) != len(tasks):
+        raise PlanError("duplicate task ids in plan")
+    deps: Dict[str, Set[str]] = {task.id: set() for task in tasks}
+    last_toucher: Dict[str, str] = {}
+    for task in tasks:
+        for ref in task.depends_on:
+            if ref not in ids:
+                raise PlanError(f"Task {task.id} depends on unknown Task {ref}")
+            if ref != task.id:
+                deps[task.id].add(ref)
+        for path in task.files:
+            if path in last_toucher:
+                deps[task.id].add(last_toucher[path])
+            last_toucher[path] = task.id
+    _check_acyclic(deps)
+    return deps
+
+
+def _check_acyclic(deps: Dict[str, Set[str]]) -> None:
+    visiting, finished = set(), set()
+    for start in sorted(deps):
+        if start in finished:
+            continue
+        visiting.add(start)
+        stack = [(start, iter(sorted(deps[start])))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                visiting.discard(node)
+                finished.add(node)
+                stack.pop()
+            elif child in visiting:
+                raise PlanError(f"dependency cycle through Task {child} and Task {node}")
+            elif child not in finished:
+                visiting.add(child)
+                stack.append((child, iter(sorted(deps[child]))))
+
+
+def _tail_lengths(tasks: List[Task], deps: Dict[str, Set[str]]) -> Dict[str, float]:
+    """Longest weighted chain from each task to the end of the plan."""
+    weight = {task.id: task.weight for task in tasks}
+    dependents: Dict[str, Set[str]] = {task.id: set() for task in tasks}
+    for task_id, required in deps.items():
+        for dep in required:
+            dependents[dep].add(task_id)
+    tail: Dict[str, float] = {}
+    for task in reversed(_topological(tasks, deps)):
+        tail[task] = weight[task] + max((tail[d] for d in dependents[task]), default=0.0)
+    return tail
+
+
+def _topological(tasks: List[Task], deps: Dict[str, Set[str]]) -> List[str]:
+    order_index = {task.id: i for i, task in enumerate(tasks)}
+    remaining = {task_id: len(required) for task_id, required in deps.items()}
+    dependents: Dict[str, List[str]] = {task.id: [] for task in tasks}
+    for task_id, required in deps.items():
+        for dep in required:
+            dependents[dep].append(task_id)
+    ready = [(order_index[t], t) for t, n in remaining.items() if n == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, task_id = heapq.heappop(ready)
+        order.append(task_id)
+        for dependent in dependents[task_id]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                heapq.heappush(ready, (order_index[dependent], dependent))
+    return order
+
+
+def schedule(tasks: List[Task], deps: Dict[str, Set[str]], workers: int = 4) -> Schedule:
+    """Group tasks into waves of at most ``workers``, critical chains first."""
+    tail = _tail_lengths(tasks, deps)
+    order_index = {task.id: i for i, task in enumerate(tasks)}
+    done: Set[str] = set()
+    waves: List[List[str]] = []
+    pending = [task.id for task in tasks]
+    while pending:
+        ready = [t for t in pending if deps[t] <= done]
+        ready.sort(key=lambda t: (-tail[t], order_index[t]))
+        wave = ready[:max(1, workers)]
+        waves.append(wave)
+        done.update(wave)
+        pending = [t for t in pending if t not in done]
+
+    path: List[str] = []
+    candidates = [t for t in tail if not deps[t]]
+    dependents = {t: [d for d in deps if t in deps[d]] for t in tail}
+    while candidates:
+        best = max(candidates, key=lambda t: (tail[t], -order_index[t]))
+        path.append(best)
+        candidates = dependents[best]
+    return Schedule(waves, path, max(tail.values(), default=0.0), sum(task.weight for task in tasks))
+
+
+class RunResult(NamedTuple):
+    """Outcome of executing one task."""
+
+    id: str
+    ok: bool
+    elapsed: float
+    output: str
+
+
+def run(tasks: List[Task], deps: Dict[str, Set[str]], execute: Callable[[Task], Tuple[bool, str]],
+        workers: int = 4, on_result: Optional[Callable[[RunResult], None]] = None) -> Dict[str, RunResult]:
+    """Execute tasks as soon as their dependencies succeed, ``workers`` at a time.
+
+    Tasks whose dependencies failed are not started and are reported as
+    failed with a "skipped" message.
+    """
+    by_id = {task.id: task for task in tasks}
+    tail = _tail_lengths(tasks, deps)
+    order_index = {task.id: i for i, task in enumerate(tasks)}
+    results: Dict[str, RunResult] = {}
+    running: Dict[Future, str] = {}
+
+    def timed(task: Task) -> RunResult:
+        started = time.perf_counter()
+        try:
+            ok, output = execute(task)
+        except Exception as error:  # Report, keep the other workers going
+            ok, output = False, f"{type(error).__name__}: {error}"
+        return RunResult(task.id, ok, time.perf_counter() - started, output)
+
+    def record(result: RunResult) -> None:
+        results[result.id] = result
+        if on_result:
+            on_result(result)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while len(results) < len(tasks):
+            started_ids = set(running.values())
+            for task_id in list(by_id):
+                if task_id in results or task_id in started_ids:
+                    continue
+                failed = [d for d in deps[task_id] if d in results and not results[d].ok]
+                if failed:
+                    record(RunResult(task_id, False, 0.0, f"skipped: Task {failed[0]} failed"))
+            ready = [t for t in by_id if t not in results and t not in started_ids
+                     and all(d in results and results[d].ok for d in deps[t])]
+            ready.sort(key=lambda t: (-tail[t], order_index[t]))
+            for task_id in ready[:max(1, workers) - len(running)]:
+                running[pool.submit(timed, by_id[task_id])] = task_id
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                del running[future]
+                record(future.result())
+    return results
+
+
+def _shell_executor(command: str, plan_path: str) -> Callable[[Task], Tuple[bool, str]]:
+    def execute(task: Task) -> Tuple[bool, str]:
+        env = dict(os.environ, TASK_ID=task.id, TASK_TITLE=task.title, PLAN_PATH=plan_path,
+                   TASK_FILES=" ".join(task.files))
+        completed = subprocess.run(command, shell=True, capture_output=True, text=True, env=env)
+        return completed.returncode == 0, (completed.stdout + completed.stderr).strip()
+    return execute
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Schedule a writing-plans plan as parallel waves")
+    parser.add_argument("plan", help="Path to the plan markdown file")
+    parser.add_argument("--workers", "-j", type=int, default=4, help="Tasks run at once (default: 4)")
+    parser.add_argument("--json", action="store_true", help="Print the DAG and waves as JSON")
+    parser.add_argument("--run", metavar="COMMAND",
+                        help="Shell command run per task with TASK_ID, TASK_TITLE, PLAN_PATH and TASK_FILES set")
+    args = parser.parse_args(argv)
+
+    with open(args.plan, encoding="utf-8") as f:
+        tasks = parse_plan(f.read())
+    if not tasks:
+        print(f"❌ No '### Task N:' sections found in {args.plan}")
+        return 1
+    try:
+        deps = build_dag(tasks)
+    except PlanError as error:
+        print(f"❌ {error}")
+        return 1
+    plan = schedule(tasks, deps, args.workers)
+
+    if args.json:
+        print(json.dumps({
+            "tasks": [dict(task._asdict(), depends_on=sorted(deps[task.id])) for task in tasks],
+            "waves": plan.waves,
+            "critical_path": plan.critical_path,
+            "critical_length": plan.critical_length,
+            "serial_length": plan.serial_length,
+        }, indent=2))
+    else:
+        titles = {task.id: task.title for task in tasks}
+        for number, wave in enumerate(plan.waves, 1):
+            print(f"Wave {number}: " + ", ".join(f"Task {t} ({titles[t]})" for t in wave))
+        print(f"📊 {len(tasks)} tasks, critical path {' → '.join(plan.critical_path)} "
+              f"({plan.critical_length:g} of {plan.serial_length:g} steps)")
+
+    if not args.run:
+        return 0
+
+    started = time.perf_counter()
+    results = run(tasks, deps, _shell_executor(args.run, args.plan), args.workers,
+                  on_result=lambda r: print(f"{'✅' if r.ok else '❌'} Task {r.id} ({r.elapsed:.1f}s)"
+                                            + ("" if r.ok else f": {r.output.splitlines()[-1] if r.output else ''}")))
+    failed = sum(1 for r in results.values() if not r.ok)
+    busy = sum(r.elapsed for r in results.values())
+    print(f"📊 {len(results) - failed} succeeded, {failed} failed in {time.perf_counter() - started:.1f}s "
+          f"({busy:.1f}s of task time)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
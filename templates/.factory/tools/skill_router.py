@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Deterministic pre-filter for the skill-checker droid.
+
+Builds an inverted index over every droid in ``.factory/droids``:
+
+- the ``description`` frontmatter field,
+- the per-droid lines under "Applicability Patterns" in ``skill-checker.md``
+  and the ``if task involves "...": enforce: "..."`` triggers below it,
+- the per-droid lines under "Core Droids Overview" in ``using-droids.md``,
+- the trigger lines under each droid's own "When to Use" section (stopping at
+  "When NOT to use").
+
+Terms are stemmed words and word pairs.  Their weights (field weight times
+inverse document frequency) are computed once at build time, so answering a
+query is a handful of dictionary lookups.  The index is persisted to
+``.factory/.cache/skill-router.json`` and rebuilt only when a droid file's
+size or mtime changes.
+
+Usage::
+
+    python .factory/tools/skill_router.py "fix the flaky timeout in the upload test"
+    python .factory/tools/skill_router.py --json --limit 3 "review my branch"
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+FACTORY_DIR = ".factory"
+DROIDS_DIR = "droids"
+CACHE_DIR = ".cache"
+INDEX_FILE = "skill-router.json"
+INDEX_FORMAT = 1
+
+# How much one occurrence of a term counts, by where it was found.
+FIELD_WEIGHTS = {
+    "trigger": 3.0,
+    "applicability": 2.0,
+    "description": 1.5,
+    "overview": 1.0,
+    "when_to_use": 1.0,
+}
+
+STOPWORDS = frozenset(
+    """a an and any are as at be before by can do does for from has have i if in into is it its
+    me my need needs of on or our so that the their them then there these this to up use used
+    using via was we when where which while who will with you your""".split()
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Droid names are bold, except in compact installs (npx droidpowers --compact)
+_BULLET = re.compile(r"^\s*[-*]\s+(?:\*\*)?([a-z0-9-]+)(?:\*\*)?\s*[:\-–]\s*(.+)$")
+_TRIGGER = re.compile(r'^if task involves (.+):\s*$')
+_ENFORCE = re.compile(r'^\s*enforce:\s*"([a-z0-9-]+)"')
+_QUOTED = re.compile(r'"([^"]+)"')
+
+
+class Candidate(NamedTuple):
+    """One droid proposed for a task."""
+
+    name: str
+    score: float
+    terms: Tuple[str, ...]
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ations", "ation", "ings", "ing", "ies", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            return word + "y" if suffix == "ies" else word
+    return word
+
+
+def terms(text: str) -> List[str]:
+    """Return the stemmed words of ``text`` followed by adjacent word pairs."""
+    words = [_stem(w) for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _frontmatter_value(text: str, key: str) -> str:
+    if not text.startswith("---"):
+        return ""
+    end = text.find("\n---", 3)
+    for line in text[3:end if end != -1 else 0].splitlines():
+        name, sep, value = line.partition(":")
+        if sep and name.strip() == key:
+            return value.strip().strip("'\"")
+    return ""
+
+
+def _sections(text: str) -> Dict[str, List[str]]:
+    """Map each ``##``/``###`` heading to the lines under it (fences kept)."""
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    fenced = False
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            fenced = not fenced
+        elif not fenced and re.match(r"#{2,3} ", line):
+            current = sections.setdefault(line.lstrip("#").strip().lower(), [])
+            continue
+        if current is not None:
+            current.append(line)
+    return sections
+
+
+def _bullets(lines: Iterable[str]) -> Iterable[Tuple[str, str]]:
+    for line in lines:
+        match = _BULLET.match(line)
+        if match:
+            yield match.group(1), match.group(2)
+
+
+def _when_to_use(lines: List[str]) -> str:
+    kept = []
+    for line in lines:
+        if "when not to use" in line.lower():
+            break
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def _triggers(lines: Iterable[str]) -> Iterable[Tuple[str, str]]:
+    phrases: List[str] = []
+    for line in lines:
+        match = _TRIGGER.match(line.strip())
+        if match:
+            phrases = _QUOTED.findall(match.group(1))
+            continue
+        match = _ENFORCE.match(line)
+        if match and phrases:
+            for phrase in phrases:
+                yield match.group(1), phrase
+            phrases = []
+
+
+def _signature(droids_dir: str) -> List[List]:
+    entries = []
+    with os.scandir(droids_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".md") and entry.is_file():
+                stat = entry.stat()
+                entries.append([entry.name, stat.st_size, stat.st_mtime_ns])
+    return sorted(entries)
+
+
+class SkillRouter:
+    """Inverted index from task terms to weighted droid postings."""
+
+    def __init__(self, postings: Dict[str, Dict[str, float]], droids: List[str], mandatory: List[str]):
+        self.postings = postings
+        self.droids = droids
+        self.mandatory = mandatory
+
+    @classmethod
+    def build(cls, droids_dir: str) -> "SkillRouter":
+        """Index every droid file in ``droids_dir``."""
+        fields: Dict[str, List[Tuple[str, str]]] = {}
+        texts: Dict[str, str] = {}
+        with os.scandir(droids_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".md") and entry.is_file():
+                    texts[entry.name[:-3]] = _read(entry.path)
+
+        mandatory: List[str] = []
+        for name, text in texts.items():
+            fields.setdefault(name, []).append(("description", _frontmatter_value(text, "description")))
+            fields[name].append(("when_to_use", _when_to_use(_sections(text).get("when to use", []))))
+
+        checker = _sections(texts.get("skill-checker", ""))
+        for heading, lines in checker.items():
+            for droid, patterns in _bullets(lines):
+                fields.setdefault(droid, []).append(("applicability", patterns))
+                if heading == "always required":
+                    mandatory.append(droid)
+        for droid, phrase in _triggers(checker.get("enforcement logic", [])):
+            fields.setdefault(droid, []).append(("trigger", phrase))
+
+        for lines in _sections(texts.get("using-droids", "")).values():
+            for droid, summary in _bullets(lines):
+                fields.setdefault(droid, []).append(("overview", summary))
+
+        # Patterns may name droids that are not installed; route only to real ones.
+        weights: Dict[str, Dict[str, float]] = {}
+        for droid, entries in fields.items():
+            if droid not in texts:
+                continue
+            for field, text in entries:
+                for term in terms(text):
+                    by_droid = weights.setdefault(term, {})
+                    by_droid[droid] = by_droid.get(droid, 0.0) + FIELD_WEIGHTS[field]
+
+        total = len(texts)
+        postings = {}
+        for term, by_droid in weights.items():
+            idf = math.log(1.0 + total / len(by_droid))
+            postings[term] = {droid: round(weight * idf, 4) for droid, weight in by_droid.items()}
+        return cls(postings, sorted(texts), [d for d in mandatory if d in texts])
+
+    @classmethod
+    def load(cls, root: str = os.curdir, persist: bool = True) -> "SkillRouter":
+        """Return the index for the project at ``root``, rebuilding it if stale."""
+        droids_dir = os.path.join(root, FACTORY_DIR, DROIDS_DIR)
+        index_path = os.path.join(root, FACTORY_DIR, CACHE_DIR, INDEX_FILE)
+        signature = _signature(droids_dir)
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") == INDEX_FORMAT and data.get("signature") == signature:
+                return cls(data["postings"], data["droids"], data["mandatory"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        router = cls.build(droids_dir)
+        if persist:
+            router.save(index_path, signature)
+        return router
+
+    def save(self, path: str, signature: List[List]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {
+            "format": INDEX_FORMAT,
+            "signature": signature,
+            "droids": self.droids,
+            "mandatory": self.mandatory,
+            "postings": self.postings,
+        }
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, path)
+
+    def route(self, task: str, limit: int = 5) -> List[Candidate]:
+        """Return up to ``limit`` droids ranked by how well they match ``task``."""
+        scores: Dict[str, float] = {}
+        matched: Dict[str, List[str]] = {}
+        for term in dict.fromkeys(terms(task)):
+            for droid, weight in self.postings.get(term, {}).items():
+                scores[droid] = scores.get(droid, 0.0) + weight
+                matched.setdefault(droid, []).append(term)
+        ranked = sorted(scores, key=lambda droid: (-scores[droid], droid))[:limit]
+        return [Candidate(droid, round(scores[droid], 3), tuple(matched[droid])) for droid in ranked]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rank droids that apply to a task")
+    parser.add_argument("task", nargs="+", help="Task description")
+    parser.add_argument("--root", default=os.curdir, help="Project root containing .factory (default: .)")
+    parser.add_argument("--limit", type=int, default=5, help="Maximum candidates to return (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Print candidates as JSON")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(os.path.join(args.root, FACTORY_DIR, DROIDS_DIR)):
+        print(f"❌ No {FACTORY_DIR}/{DROIDS_DIR} directory under {args.root}")
+        return 1
+
+    router = SkillRouter.load(args.root)
+    started = time.perf_counter()
+    candidates = router.route(" ".join(args.task), args.limit)
+    elapsed_us = (time.perf_counter() - started) * 1e6
+
+    if args.json:
+        print(json.dumps({
+            "mandatory": router.mandatory,
+            "candidates": [candidate._asdict() for candidate in candidates],
+            "elapsed_us": round(elapsed_us, 1),
+        }, indent=2))
+        return 0
+
+    print(f"🔍 Always required: {', '.join(router.mandatory) or 'none'}")
+    if not candidates:
+        print("No droid matched; read the Applicability Patterns in skill-checker.")
+    for rank, candidate in enumerate(candidates, 1):
+        print(f"{rank}. {candidate.name} ({candidate.score:.2f}) - {', '.join(candidate.terms)}")
+    print(f"📊 Routed in {elapsed_us:.0f}µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""Streaming stack-trace clustering for the root-cause-tracing droid.
+
+Reads logs of any size one line at a time (plain, gzip or stdin) and keeps
+only a bounded table of clusters, so memory does not grow with the log.
+
+Errors are recognised in Python tracebacks (including chained ones), Java
+and JavaScript ``at ...`` stacks with ``Caused by:`` chains, Go panics, and
+plain ``ERROR``/``FATAL`` log lines. Each error is reduced to a signature:
+the root exception type plus its innermost frames, with line numbers,
+addresses, ids, numbers and quoted values stripped. Errors with the same
+signature form one cluster, which records its count, the first and last
+timestamps and line numbers seen, and the causal frame: the innermost
+application frame (not library or runtime code) of the root cause.
+
+Usage::
+
+    python .factory/tools/trace_clusters.py logs/app.log logs/app.log.1.gz
+    kubectl logs deploy/api | python .factory/tools/trace_clusters.py - --top 5
+    python .factory/tools/trace_clusters.py app.log --sort first-seen --json
+"""
+
+import argparse
+import functools
+import gzip
+import hashlib
+import json
+import re
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+DEFAULT_MAX_CLUSTERS = 1000
+DEFAULT_TOP = 10
+MAX_FRAMES = 64  # Frames kept per exception; deep recursion is truncated
+SIGNATURE_FRAMES = 5
+MAX_LINE = 4096
+SAMPLE_CHARS = 200
+
+TIMESTAMP = re.compile(
+    r"^\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"
+    r"|[A-Z][a-z]{2} +\d{1,2} \d{2}:\d{2}:\d{2})"
+)
+TRACEBACK = re.compile(r"Traceback \(most recent call last\):")
+PY_CHAIN = re.compile(r"During handling of the above exception|The above exception was the direct cause")
+PY_FRAME = re.compile(r'File "([^"]+)", line \d+, in (\S+)')
+JS_FRAME = re.compile(r"\bat (?:async )?(.+?) \((.+?)(?::\d+)*\)\s*$")
+JAVA_FRAME = re.compile(r"\bat ((?:[\w$<>/-]+\.)+[\w$<>]+)\(([^():]*)(?::\d+)?\)")
+# Only inside an open event: "at host:port" in an ordinary log line is not a frame
+BARE_FRAME = re.compile(r"^\s+at (?:async )?(\S+?)(?::\d+)+\)?\s*$")
+GO_FILE = re.compile(r"^\s+(\S+\.go):\d+(?: \+0x[0-9a-f]+)?\s*$")
+GO_FUNC = re.compile(r"^([\w./*()-]+)\(.*\)\s*$")
+GO_PANIC = re.compile(r"\bpanic: (.*)$")
+GO_GOROUTINE = re.compile(r"^goroutine \d+ \[")
+ELIDED = re.compile(r"^\s*\.\.\. \d+ (?:more|common frames omitted)")
+CAUSED_BY = re.compile(r"\bCaused by: (.*)$")
+_EXCEPTION = r"((?:[A-Za-z_$][\w$]*\.)*[A-Za-z_$][\w$]*(?:Exception|Error|Exit|Interrupt|Throwable|Fault))(?::\s*(.*))?\s*$"
+EXCEPTION = re.compile(_EXCEPTION)
+UNCAUGHT = re.compile(r'^\s*(?:Uncaught |Exception in thread "[^"]*" )?' + _EXCEPTION)
+LOG_ERROR = re.compile(r"\b(?:ERROR|FATAL|CRITICAL|SEVERE|PANIC)\b[\]:]?\s*(.*)$|\blevel=(?:error|fatal)\b\s*(.*)$")
+# Cheap pre-check: a line outside an error that matches none of these is skipped
+TRIGGER = re.compile(
+    r"Traceback|Error|Exception|Throwable|Fault|Exit|Interrupt|ERROR|FATAL|CRITICAL|SEVERE|PANIC|panic: |"
+    r"level=(?:error|fatal)|Caused by: "
+)
+LIBRARY = re.compile(
+    r"site-packages|dist-packages|node_modules|node:internal|^internal/|<frozen|/usr/lib/|"
+    r"^(?:java|javax|jdk|sun|kotlin|scala|runtime)\.|^runtime/|/go/src/"
+)
+
+_MESSAGE_NOISE = [
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"), "<ts>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b", re.I), "<hex>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\"|`[^`]*`"), "<str>"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "<n>"),
+]
+_FRAME_NOISE = [
+    (re.compile(r"\$\$Lambda\$\d+/(?:0x)?[0-9a-f]+"), "$$Lambda"),
+    (re.compile(r"\$\d+\b"), "$"),  # Anonymous class and lambda ordinals
+    (re.compile(r"\?.*$"), ""),
+    (re.compile(r"@[\d.]+(?=/)"), ""),  # pnpm style node_modules/.pnpm/pkg@1.2.3/
+]
+
+
+class Frame(NamedTuple):
+    function: str
+    location: str
+
+    def __str__(self) -> str:
+        return f"{self.function} @ {self.location}" if self.location else self.function
+
+
+class Cluster:
+    """Everything kept about one error signature."""
+
+    __slots__ = ("signature", "kind", "error", "template", "sample", "frames", "cause", "count",
+                 "first_seen", "first_line", "last_seen", "last_line")
+
+    def __init__(self, signature, kind, error, template, sample, frames, cause, timestamp, line):
+        self.signature = signature
+        self.kind = kind
+        self.error = error
+        self.template = template
+        self.sample = sample
+        self.frames = frames
+        self.cause = cause
+        self.count = 0
+        self.first_seen, self.first_line = timestamp, line
+        self.last_seen, self.last_line = timestamp, line
+
+    def to_dict(self) -> dict:
+        return {
+            "signature": self.signature,
+            "count": self.count,
+            "error": self.error,
+            "message": self.template,
+            "sample": self.sample,
+            "cause_frame": str(self.cause) if self.cause else None,
+            "frames": [str(f) for f in self.frames],
+            "first_seen": self.first_seen,
+            "first_line": self.first_line,
+            "last_seen": self.last_seen,
+            "last_line": self.last_line,
+        }
+
+
+def normalize_message(message: str) -> str:
+    """Message template with ids, numbers, timestamps and quoted values replaced."""
+    for pattern, replacement in _MESSAGE_NOISE:
+        message = pattern.sub(replacement, message)
+    return message.strip()
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_frame(function: str, location: str) -> Frame:
+    """Frame without line numbers, addresses, generated names or install-specific paths."""
+    for pattern, replacement in _FRAME_NOISE:
+        function = pattern.sub(replacement, function)
+        location = pattern.sub(replacement, location)
+    location = location.replace("\\", "/")
+    if location.startswith("file://"):
+        location = location[len("file://"):]
+    parts = [p for p in location.split("/") if p]
+    if "node_modules" in parts:
+        parts = parts[len(parts) - parts[::-1].index("node_modules") - 1:]
+    elif "site-packages" in parts or "dist-packages" in parts:
+        marker = "site-packages" if "site-packages" in parts else "dist-packages"
+        parts = parts[parts.index(marker):]
+    else:
+        parts = parts[-3:]
+    return Frame(function.strip(), "/".join(parts))
+
+
+def is_library(frame: Frame) -> bool:
+    return bool(LIBRARY.search(frame.location) or LIBRARY.search(frame.function))
+
+
+class _Block:
+    """One exception in an event: its type, message and frames innermost first."""
+
+    __slots__ = ("error", "message", "frames", "reversed")
+
+    def __init__(self, error: str = "", message: str = "", reversed_frames: bool = False):
+        self.error = error
+        self.message = message
+        self.frames: List[Frame] = []
+        self.reversed = reversed_frames  # Python prints the innermost frame last
+
+    def add(self, frame: Frame) -> None:
+        if len(self.frames) < MAX_FRAMES:
+            self.frames.append(frame)
+        elif self.reversed:
+            # Keep the innermost frames of a truncated Python traceback
+            self.frames.pop(0)
+            self.frames.append(frame)
+
+    def innermost(self) -> List[Frame]:
+        return self.frames[::-1] if self.reversed else self.frames
+
+
+class _Event:
+    __slots__ = ("kind", "timestamp", "line", "message", "blocks", "chained", "go_function")
+
+    def __init__(self, kind: str, timestamp: Optional[str], line: int, message: str = ""):
+        self.kind = kind
+        self.timestamp = timestamp
+        self.line = line
+        self.message = message
+        self.blocks: List[_Block] = []
+        self.chained = False
+        self.go_function: Optional[str] = None
+
+    @property
+    def block(self) -> Optional[_Block]:
+        return self.blocks[-1] if self.blocks else None
+
+    def root(self) -> Optional[_Block]:
+        # Python prints the original exception first; Java's "Caused by" chain ends with it
+        if not self.blocks:
+            return None
+        return self.blocks[0] if self.kind == "python" else self.blocks[-1]
+
+
+def _parse_exception(text: str) -> Tuple[str, str]:
+    match = EXCEPTION.search(text)
+    if match:
+        return match.group(1), (match.group(2) or "").strip()
+    error, _, message = text.partition(":")
+    return error.strip() or "Error", message.strip()
+
+
+def _match_frame(line: str, in_event: bool) -> Optional[Frame]:
+    match = PY_FRAME.search(line)
+    if match:
+        return normalize_frame(match.group(2), match.group(1))
+    match = JS_FRAME.search(line)
+    if match:
+        return normalize_frame(match.group(1), match.group(2))
+    match = JAVA_FRAME.search(line)
+    if match:
+        return normalize_frame(match.group(1), match.group(2))
+    match = BARE_FRAME.match(line) if in_event else None
+    if match:
+        return normalize_frame("<anonymous>", match.group(1))
+    return None
+
+
+class TraceClusterer:
+    """Feeds log lines through a small state machine and clusters the errors found."""
+
+    def __init__(self, max_clusters: int = DEFAULT_MAX_CLUSTERS):
+        self.max_clusters = max_clusters
+        self.clusters: Dict[str, Cluster] = {}
+        self.lines = 0
+        self.events = 0
+        self.overflow = 0
+        self._timestamp: Optional[str] = None
+        self._event: Optional[_Event] = None
+
+    def feed(self, line: str) -> None:
+        self.lines += 1
+        line = line.rstrip("\r\n")[:MAX_LINE]
+        stamp = TIMESTAMP.match(line)
+        if stamp:
+            self._timestamp = stamp.group(1)
+        event = self._event
+        if event is None and not TRIGGER.search(line):
+            return
+
+        if TRACEBACK.search(line):
+            if event is not None and event.kind == "python" and event.chained:
+                event.chained = False
+            elif event is not None and event.kind == "log" and not event.blocks:
+                event.kind = "python"  # The traceback belongs to the error line just logged
+            else:
+                event = self._start("python")
+            event.blocks.append(_Block(reversed_frames=True))
+            return
+        if event is not None and event.kind == "python" and PY_CHAIN.search(line):
+            event.chained = True
+            return
+        if event is not None and event.kind == "python" and not line.strip():
+            return  # Blank lines separate chained tracebacks
+
+        if event is not None and event.kind == "go":
+            if GO_GOROUTINE.match(line) or not line.strip():
+                return
+            go_file = GO_FILE.match(line)
+            if go_file:
+                if event.block is not None and event.go_function:
+                    event.block.add(normalize_frame(event.go_function, go_file.group(1)))
+                event.go_function = None
+                return
+            go_func = GO_FUNC.match(line.strip())
+            if go_func:
+                event.go_function = go_func.group(1)
+                return
+
+        frame = _match_frame(line, event is not None)
+        if frame is not None:
+            if event is None:
+                event = self._start("stack")
+            if event.block is None:
+                event.blocks.append(_Block(message=event.message))
+            event.block.add(frame)
+            return
+        if event is not None and ELIDED.match(line):
+            return
+
+        caused = CAUSED_BY.search(line)
+        if caused:
+            if event is None:
+                event = self._start("stack")
+            event.blocks.append(_Block(*_parse_exception(caused.group(1))))
+            return
+
+        if event is not None and event.kind == "python" and event.block is not None and not event.block.error:
+            if line.startswith((" ", "\t")) or not line.strip():
+                return  # Source line under a frame
+            event.block.error, event.block.message = _parse_exception(line)
+            return
+
+        panic = GO_PANIC.search(line)
+        if panic:
+            event = self._start("go")
+            event.blocks.append(_Block("panic", panic.group(1).strip()))
+            return
+
+        logged = LOG_ERROR.search(line)
+        if logged:
+            message = (logged.group(1) or logged.group(2) or "").strip()
+            event = self._start("log", message)
+            exception = EXCEPTION.search(message)
+            if exception:
+                event.blocks.append(_Block(exception.group(1), (exception.group(2) or "").strip()))
+            return
+
+        exception = UNCAUGHT.match(line)
+        if exception:
+            if event is not None and event.kind == "log" and not event.blocks:
+                event.kind = "stack"
+            else:
+                event = self._start("stack")
+            event.blocks.append(_Block(exception.group(1), (exception.group(2) or "").strip()))
+            return
+
+        self._flush()
+
+    def feed_all(self, lines: Iterable[str]) -> "TraceClusterer":
+        for line in lines:
+            self.feed(line)
+        self._flush()
+        return self
+
+    def _start(self, kind: str, message: str = "") -> _Event:
+        self._flush()
+        self._event = _Event(kind, self._timestamp, self.lines, message)
+        return self._event
+
+    def _flush(self) -> None:
+        event, self._event = self._event, None
+        if event is None:
+            return
+        root = event.root()
+        if root is None:
+            error, message, frames = "log", event.message, []
+        else:
+            error, message, frames = root.error or "Error", root.message or event.message, root.innermost()
+        top = frames[:SIGNATURE_FRAMES]
+        template = normalize_message(message)
+        outer = event.blocks[-1 if event.kind == "python" else 0].error if event.blocks else ""
+        basis = [outer, error] + ([str(f) for f in top] if top else [template])
+        signature = hashlib.sha1("\n".join(basis).encode("utf-8")).hexdigest()[:12]
+        self.events += 1
+
+        cluster = self.clusters.get(signature)
+        if cluster is None:
+            if len(self.clusters) >= self.max_clusters:
+                self.overflow += 1
+                return
+            cause = next((f for f in frames if not is_library(f)), frames[0] if frames else None)
+            cluster = Cluster(signature, event.kind, error, template, message[:SAMPLE_CHARS], top, cause,
+                              event.timestamp, event.line)
+            self.clusters[signature] = cluster
+        cluster.count += 1
+        cluster.last_seen, cluster.last_line = event.timestamp or cluster.last_seen, event.line
+
+    def ranked(self, sort: str = "count") -> List[Cluster]:
+        if sort == "first-seen":
+            return sorted(self.clusters.values(), key=lambda c: c.first_line)
+        return sorted(self.clusters.values(), key=lambda c: (-c.count, c.first_line))
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Lines of a plain or gzip file, or stdin for ``-``, decoded leniently."""
+    if path == "-":
+        stream = sys.stdin.buffer
+        for raw in stream:
+            yield raw.decode("utf-8", "replace")
+        return
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as stream:
+        for raw in stream:
+            yield raw.decode("utf-8", "replace")
+
+
+def render(clusterer: TraceClusterer, top: int, sort: str, elapsed: float) -> str:
+    ranked = clusterer.ranked(sort)
+    out = [f"📊 {clusterer.lines} lines, {clusterer.events} errors, {len(ranked)} clusters in {elapsed:.1f}s"
+           + (f" ({clusterer.overflow} errors beyond the cluster limit)" if clusterer.overflow else "")]
+    for number, cluster in enumerate(ranked[:top], 1):
+        first = f"{cluster.first_seen} " if cluster.first_seen else ""
+        out.append(f"#{number} ×{cluster.count} {cluster.error}: {cluster.template[:120]}")
+        out.append(f"   first {first}(line {cluster.first_line}), last line {cluster.last_line}")
+        if cluster.cause:
+            out.append(f"   🔍 cause: {cluster.cause}")
+        if len(cluster.frames) > 1:
+            out.append(f"   stack: {' < '.join(f.function for f in cluster.frames[:SIGNATURE_FRAMES])}")
+    if len(ranked) > top:
+        out.append(f"… {len(ranked) - top} more clusters ({sum(c.count for c in ranked[top:])} errors)")
+    return "\n".join(out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cluster errors and stack traces in large logs")
+    parser.add_argument("paths", nargs="+", help="Log files (.gz allowed) or - for stdin")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Clusters to show (default: {DEFAULT_TOP})")
+    parser.add_argument("--sort", choices=("count", "first-seen"), default="count",
+                        help="Rank by frequency or by first appearance (default: count)")
+    parser.add_argument("--max-clusters", type=int, default=DEFAULT_MAX_CLUSTERS,
+                        help=f"Distinct signatures tracked (default: {DEFAULT_MAX_CLUSTERS})")
+    parser.add_argument("--json", action="store_true", help="Print clusters as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    clusterer = TraceClusterer(args.max_clusters)
+    try:
+        for path in args.paths:
+            clusterer.feed_all(read_lines(path))
+    except OSError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({
+            "lines": clusterer.lines,
+            "errors": clusterer.events,
+            "overflow": clusterer.overflow,
+            "clusters": [c.to_dict() for c in clusterer.ranked(args.sort)[:args.top]],
+        }, indent=2))
+    else:
+        print(render(clusterer, args.top, args.sort, elapsed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+// .factory/tools/wait-for.js - Condition-based waiting for tests
+//
+// JavaScript twin of wait_for.py, backing the condition-based-waiting droid.
+//
+//   const { waitFor, waitForFile, waitForEvent } = require('./.factory/tools/wait-for');
+//
+//   await waitFor(() => getResult() !== undefined, 'result');
+//   await waitForFile('build/ready.flag', { timeoutMs: 30000 });
+//   await waitForEvent(manager, 'TOOL_STARTED');
+//
+// waitFor re-checks with adaptive backoff (1ms doubling up to 100ms) instead
+// of a fixed 10ms poll. Pass `wake: [emitter, eventName]` to re-check only when
+// that event fires. waitForFile watches the parent directory with fs.watch and
+// waitForEvent listens on the emitter, so neither polls. Every wait reports
+// { description, satisfied, elapsedMs, checks, wakes, timeoutMs, mode } to
+// `onComplete` (or the reporter set with setReporter) and attaches it to the
+// timeout error as `error.stats`.
+const { EventEmitter } = require('events');
+const fs = require('fs');
+const path = require('path');
+
+const DEFAULT_TIMEOUT_MS = 5000;
+const DEFAULT_INTERVAL_MS = 1;
+const DEFAULT_MAX_INTERVAL_MS = 100;
+const DEFAULT_BACKOFF = 2;
+
+let reporter = null;
+
+function setReporter(fn) {
+  reporter = fn;
+}
+
+function normalizeOptions(options) {
+  // The droid's original signature took the timeout as a bare number
+  return typeof options === 'number' ? { timeoutMs: options } : (options || {});
+}
+
+function finish(stats, onComplete) {
+  const report = onComplete || reporter;
+  if (report) report(stats);
+  if (!stats.satisfied) {
+    const error = new Error(
+      `Timeout waiting for ${stats.description} after ${stats.timeoutMs}ms ` +
+      `(${stats.checks} checks, ${stats.wakes} wakes)`
+    );
+    error.name = 'WaitTimeoutError';
+    error.stats = stats;
+    throw error;
+  }
+}
+
+async function waitFor(condition, description = 'condition', options = {}) {
+  const {
+    timeoutMs = DEFAULT_TIMEOUT_MS,
+    intervalMs = DEFAULT_INTERVAL_MS,
+    maxIntervalMs = null,
+    backoff = DEFAULT_BACKOFF,
+    wake = null,
+    onComplete = null
+  } = normalizeOptions(options);
+
+  // With a wake event, only re-check when it fires unless maxIntervalMs is set
+  const cap = maxIntervalMs !== null || wake ? maxIntervalMs : DEFAULT_MAX_INTERVAL_MS;
+  const mode = !wake ? 'poll' : cap === null ? 'event' : 'event+poll';
+  const started = Date.now();
+  const deadline = started + timeoutMs;
+  let delay = intervalMs;
+  let checks = 0;
+  let wakes = 0;
+  let wakeUp = null;
+  let woken = false;
+  const onWake = () => {
+    wakes++;
+    woken = true;
+    if (wakeUp) wakeUp();
+  };
+  if (wake) wake[0].on(wake[1], onWake);
+
+  try {
+    while (true) {
+      const result = await condition();
+      checks++;
+      const stats = { description, satisfied: Boolean(result), elapsedMs: Date.now() - started, checks, wakes, timeoutMs, mode };
+      if (result) {
+        finish(stats, onComplete);
+        return result;
+      }
+
+      const remaining = deadline - Date.now();
+      if (remaining <= 0) {
+        finish(stats, onComplete);
+      }
+
+      // A wake-up that arrived while the condition ran means re-check now
+      if (woken) {
+        woken = false;
+        continue;
+      }
+      const pause = cap === null ? remaining : Math.min(delay, remaining);
+      await new Promise(resolve => {
+        const timer = setTimeout(resolve, pause);
+        wakeUp = () => {
+          clearTimeout(timer);
+          resolve();
+        };
+      });
+      wakeUp = null;
+      woken = false;
+      if (cap !== null) delay = Math.min(delay * backoff, cap);
+    }
+  } finally {
+    if (wake) wake[0].removeListener(wake[1], onWake);
+  }
+}
+
+async function waitForFile(filePath, options = {}) {
+  const { predicate = fs.existsSync, ...rest } = normalizeOptions(options);
+  const description = rest.description || `file ${filePath}`;
+  const directory = path.dirname(path.resolve(filePath));
+  let watcher = null;
+
+  try {
+    // Watch before the first check so a file created in between is not missed
+    const changes = new EventEmitter();
+    try {
+      watcher = fs.watch(directory, () => changes.emit('change'));
+      watcher.on('error', () => {});
+    } catch {
+      watcher = null; // Directory missing or watching unsupported: fall back to backoff
+    }
+    return await waitFor(() => (predicate(filePath) ? filePath : null), description, {
+      ...rest,
+      wake: watcher ? [changes, 'change'] : null
+    });
+  } finally {
+    if (watcher) watcher.close();
+  }
+}
+
+async function waitForEvent(emitter, eventName, options = {}) {
+  const { filter = () => true, ...rest } = normalizeOptions(options);
+  const description = rest.description || `event ${eventName}`;
+  let received;
+  const listener = (...args) => {
+    if (received === undefined && filter(...args)) {
+      received = { args };
+    }
+  };
+
+  emitter.on(eventName, listener);
+  try {
+    const { args } = await waitFor(() => received, description, { ...rest, wake: [emitter, eventName] });
+    return args.length <= 1 ? args[0] : args;
+  } finally {
+    emitter.removeListener(eventName, listener);
+  }
+}
+
+module.exports = { setReporter, waitFor, waitForEvent, waitForFile };
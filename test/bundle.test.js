@@ -0,0 +1,92 @@
+// test/bundle.test.js
+const {
+  BUNDLE_FILE,
+  bundleTemplates,
+  collectTemplateFiles,
+  packBundle,
+  unpackBundle
+} = require('../src/bundle');
+const { installDroidpowers, loadTemplates } = require('../src/installer');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+async function testBundle() {
+  console.log('🧪 Testing bundles unpack to the files packed...');
+  const files = new Map([
+    ['.factory/droids/a.md', Buffer.from('# A\n')],
+    ['.factory/droids/copy.md', Buffer.from('# A\n')],
+    ['.factory/tools/t.py', Buffer.from('x = 1\n')],
+    ['registry.json', Buffer.from('{}')]
+  ]);
+  for (const compress of [true, false]) {
+    const { index, files: unpacked } = unpackBundle(packBundle(files, { compress }));
+    if ([...files].some(([name, content]) => !content.equals(unpacked.get(name)))) {
+      throw new Error(`Round trip failed (compress: ${compress})`);
+    }
+    if (index.files['.factory/droids/copy.md'].offset !== index.files['.factory/droids/a.md'].offset || index.size !== 4 + 6 + 2) {
+      throw new Error('Identical files should be stored once');
+    }
+  }
+  const { manifest, contents } = bundleTemplates(unpackBundle(packBundle(files)));
+  if (Object.keys(manifest.files).join() !== 'droids/a.md,droids/copy.md,tools/t.py' || contents.has('registry.json')) {
+    throw new Error(`Bundle manifest should cover .factory only: ${Object.keys(manifest.files)}`);
+  }
+  let error = null;
+  try {
+    unpackBundle(Buffer.from('not a bundle at all'));
+  } catch (caught) {
+    error = caught;
+  }
+  if (!error || !/Not a droidpowers template bundle/.test(error.message)) {
+    throw new Error('Foreign files should be rejected');
+  }
+
+  console.log('🧪 Testing installs from a bundle match installs from the tree...');
+  const templatesDir = path.join(__dirname, '..', 'templates');
+  const work = fs.mkdtempSync(path.join(os.tmpdir(), 'droidpowers-bundle-'));
+  try {
+    // A published package: the bundle and no templates/.factory
+    const packed = path.join(work, 'templates');
+    fs.mkdirSync(packed);
+    fs.writeFileSync(path.join(packed, BUNDLE_FILE), packBundle(await collectTemplateFiles(templatesDir)));
+
+    for (const compact of [false, true]) {
+      const fromTree = await loadTemplates(templatesDir, { compact });
+      const fromBundle = await loadTemplates(packed, { compact });
+      if (JSON.stringify(fromBundle.manifest) !== JSON.stringify(fromTree.manifest)) {
+        throw new Error(`Bundle manifest differs from the tree (compact: ${compact})`);
+      }
+      if ([...fromTree.extras.keys()].join() !== [...fromBundle.extras.keys()].join()) {
+        throw new Error('Bundle should carry the extra files');
+      }
+    }
+
+    const target = path.join(work, 'project');
+    fs.mkdirSync(target);
+    fs.writeFileSync(path.join(target, 'package.json'), '{}');
+    const templates = await loadTemplates(packed);
+    let stats = await installDroidpowers(target, { templates, quiet: true });
+    if (stats.written.length !== Object.keys(templates.manifest.files).length || stats.added.length !== templates.extras.size) {
+      throw new Error(`Bundle install wrote ${stats.written.length} files and ${stats.added} extras`);
+    }
+    stats = await installDroidpowers(target, { force: true, quiet: true });
+    if (stats.written.length !== 0) {
+      throw new Error(`Installing from the tree after the bundle rewrote ${stats.written}`);
+    }
+    console.log(`✅ Installed ${Object.keys(templates.manifest.files).length} files from one ${BUNDLE_FILE}`);
+  } finally {
+    fs.rmSync(work, { recursive: true, force: true });
+  }
+}
+
+// Export test function for use in test runner
+module.exports = { testBundle };
+
+// Run test if this file is executed directly
+if (require.main === module) {
+  testBundle().catch(error => {
+    console.error('❌ Bundle test failed:', error.message);
+    process.exit(1);
+  });
+}
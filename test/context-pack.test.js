@@ -0,0 +1,114 @@
+// test/context-pack.test.js
+const {
+  CONTEXT_PACK_FILE,
+  SHARED_FILE,
+  compileContextPack,
+  estimateTokens,
+  expandDroid,
+  parseShared,
+  stripDecoration,
+  verifyRoundTrip
+} = require('../src/context-pack');
+const { installDroidpowers } = require('../src/installer');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const SHARED_LINE = '- Follow verification-before-completion before claiming the work is done';
+const SHARED_BLOCK = `## Completion\n\n**Announce:** "I'm finishing this work."\n${SHARED_LINE}\n- Present the options and run the choice`;
+
+async function testContextPack() {
+  console.log('🧪 Testing shipped context pack is current...');
+  const templatesDir = path.join(__dirname, '..', 'templates');
+  const droidsDir = path.join(templatesDir, '.factory', 'droids');
+  const droids = new Map(fs.readdirSync(droidsDir).filter(name => name.endsWith('.md')).sort()
+    .map(name => [`droids/${name}`, fs.readFileSync(path.join(droidsDir, name), 'utf8')]));
+  const shipped = JSON.parse(fs.readFileSync(path.join(templatesDir, CONTEXT_PACK_FILE), 'utf8'));
+  if (JSON.stringify(shipped) !== JSON.stringify(compileContextPack(droids))) {
+    throw new Error(`templates/${CONTEXT_PACK_FILE} is stale - run npm run build:context-pack`);
+  }
+  const problems = verifyRoundTrip(droids, shipped);
+  if (problems.length > 0) {
+    throw new Error(`Round trip failed: ${problems.join('; ')}`);
+  }
+
+  console.log('🧪 Testing decoration is stripped outside code only...');
+  const source = '---\nname: a\n---\n\n# A\n\n**Rule:** keep   this\n\n---\n\n| Col  | Other |\n|:-----|------:|\n' +
+    '| **x** | `a **b**` |\n\n```js\n\nconst s = "**";  \n```\n';
+  const stripped = stripDecoration(source);
+  const expected = '---\nname: a\n---\n# A\nRule: keep   this\n|Col|Other|\n|:---|---:|\n|x|`a **b**`|\n' +
+    '```js\n\nconst s = "**";  \n```\n';
+  if (stripped !== expected) {
+    throw new Error(`Unexpected stripped text: ${JSON.stringify(stripped)}`);
+  }
+
+  console.log('🧪 Testing repeated sections are hoisted whole and expand back...');
+  const sample = new Map([
+    ['droids/a.md', `---\nname: a\n---\n# A\n\n${SHARED_BLOCK}\n\n- Only in a\n`],
+    ['droids/b.md', `# B\n\n${SHARED_BLOCK.replace('**Announce:**', 'Announce:')}\n\n\`\`\`\n${SHARED_LINE}\n\`\`\`\n`],
+    ['droids/c.md', `# C\n\n${SHARED_LINE}\n`]
+  ]);
+  const pack = compileContextPack(sample);
+  const passages = parseShared(pack.files[SHARED_FILE]);
+  if (passages.get('S1') !== stripDecoration(SHARED_BLOCK).trimEnd() || passages.size !== 1 ||
+      pack.files['droids/a.md'] !== '---\nname: a\n---\n# A\n[context/shared.md#S1]\n- Only in a\n') {
+    throw new Error(`Repeated section was not hoisted as one passage: ${JSON.stringify(pack.files)}`);
+  }
+  if (pack.files['droids/c.md'] !== stripDecoration(sample.get('droids/c.md'))) {
+    throw new Error('A line inside a hoisted section must not be referenced on its own where that costs more');
+  }
+  if (!pack.files['droids/b.md'].includes(`\`\`\`\n${SHARED_LINE}\n\`\`\``)) {
+    throw new Error('Lines inside code blocks must not be hoisted');
+  }
+  if (expandDroid(pack.files['droids/b.md'], passages) !== stripDecoration(sample.get('droids/b.md'))) {
+    throw new Error('Compact droid did not expand back to its source');
+  }
+  const tokens = name => estimateTokens(pack.files[name]);
+  const sharedTokens = tokens(SHARED_FILE);
+  const session = Math.round((tokens('droids/a.md') + tokens('droids/b.md') + 2 * sharedTokens + tokens('droids/c.md')) / 3);
+  if (pack.stats.sessionTokens.pack !== session ||
+      pack.stats.packTokens !== Object.keys(pack.files).reduce((sum, name) => sum + tokens(name), 0)) {
+    throw new Error(`Token stats must count ${SHARED_FILE} for the sessions that read it: ${JSON.stringify(pack.stats)}`);
+  }
+  const broken = { ...pack, files: { ...pack.files, 'droids/a.md': pack.files['droids/a.md'].replace('Only in a', 'Only') } };
+  if (verifyRoundTrip(sample, broken).length !== 1) {
+    throw new Error('Round-trip check missed a dropped word');
+  }
+
+  console.log('🧪 Testing compact install and switching back...');
+  const work = fs.mkdtempSync(path.join(os.tmpdir(), 'droidpowers-pack-'));
+  try {
+    fs.writeFileSync(path.join(work, 'package.json'), '{}');
+    await installDroidpowers(work, { compact: true, quiet: true });
+    const installed = fs.readFileSync(path.join(work, '.factory', 'droids', 'using-droids.md'), 'utf8');
+    if (installed !== shipped.files['droids/using-droids.md']) {
+      throw new Error('Compact install did not write the compact droid');
+    }
+    const hasShared = SHARED_FILE in shipped.files;
+    if (fs.existsSync(path.join(work, '.factory', SHARED_FILE)) !== hasShared) {
+      throw new Error(`${SHARED_FILE} should ${hasShared ? '' : 'not '}be installed`);
+    }
+
+    const stats = await installDroidpowers(work, { force: true, quiet: true });
+    if (fs.readFileSync(path.join(work, '.factory', 'droids', 'using-droids.md'), 'utf8') !== droids.get('droids/using-droids.md')) {
+      throw new Error('Full install did not restore the full droid');
+    }
+    if (hasShared && (stats.removed.join() !== SHARED_FILE || fs.existsSync(path.join(work, '.factory', 'context')))) {
+      throw new Error(`Switching back should remove ${SHARED_FILE}, removed: ${stats.removed}`);
+    }
+    console.log('✅ Compact droids install and round-trip');
+  } finally {
+    fs.rmSync(work, { recursive: true, force: true });
+  }
+}
+
+// Export test function for use in test runner
+module.exports = { testContextPack };
+
+// Run test if this file is executed directly
+if (require.main === module) {
+  testContextPack().catch(error => {
+    console.error('❌ Context pack test failed:', error.message);
+    process.exit(1);
+  });
+}
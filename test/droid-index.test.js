@@ -0,0 +1,97 @@
+// test/droid-index.test.js
+const { DROID_INDEX_FILE, buildDroidIndex, serializeDroidIndex } = require('../src/droid-index');
+const { installDroidpowers } = require('../src/installer');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const GATEWAY = `---
+name: using-droids
+description: Use when starting any conversation - establishes workflows
+---
+
+# Using Droids
+
+## Core Droids Overview
+
+### Mandatory Gateway Droids
+- **skill-checker** - Routes tasks (ALWAYS use first)
+
+### Core Skills (1 essential)
+- test-driven-development - STRICT TDD
+
+## Other
+- **brainstorming** - Not an overview entry
+`;
+
+function droid(description) {
+  return `---\nname: x\ndescription: ${description}\n---\n\n# X\n`;
+}
+
+async function testDroidIndex() {
+  console.log('🧪 Testing tiers and triggers come from the gateway overview...');
+  const contents = new Map([
+    ['droids/using-droids.md', Buffer.from(GATEWAY)],
+    ['droids/skill-checker.md', Buffer.from(droid('Checks skills'))],
+    ['droids/test-driven-development.md', Buffer.from(droid('TDD'))],
+    ['droids/brainstorming.md', Buffer.from(droid(`Use when ideas are rough ${'and vague '.repeat(10)}- refines them`))],
+    ['tools/helper.py', Buffer.from('print(1)')]
+  ]);
+  const index = buildDroidIndex(contents);
+  const rows = Object.fromEntries(index.droids.map(row => [row[0], row]));
+  if (index.droids.map(row => row[0]).join() !== 'skill-checker,using-droids,test-driven-development,brainstorming') {
+    throw new Error(`Unexpected order: ${JSON.stringify(index.droids)}`);
+  }
+  if (rows['skill-checker'][1] !== 'gateway' || rows['skill-checker'][3] !== 'Routes tasks (ALWAYS use first)') {
+    throw new Error(`Bad gateway row: ${rows['skill-checker']}`);
+  }
+  if (rows['test-driven-development'][1] !== 'core' || rows['using-droids'][3] !== 'Use when starting any conversation') {
+    throw new Error('Compact bullets and description fallbacks should be used');
+  }
+  if (rows.brainstorming[1] !== 'other' || rows.brainstorming[3].length > 81 || !rows.brainstorming[3].endsWith('…')) {
+    throw new Error(`Long triggers should be shortened: ${rows.brainstorming}`);
+  }
+  if (rows['using-droids'][2] !== Buffer.byteLength(GATEWAY)) {
+    throw new Error('Byte size should be that of the installed file');
+  }
+  if (JSON.stringify(JSON.parse(serializeDroidIndex(index))) !== JSON.stringify(index)) {
+    throw new Error('Serialized index is not valid JSON for the same data');
+  }
+
+  console.log('🧪 Testing installs ship a small index of every droid...');
+  const work = fs.mkdtempSync(path.join(os.tmpdir(), 'droidpowers-index-'));
+  try {
+    fs.writeFileSync(path.join(work, 'package.json'), '{}');
+    await installDroidpowers(work, { quiet: true });
+    const indexPath = path.join(work, '.factory', DROID_INDEX_FILE);
+    const installed = JSON.parse(fs.readFileSync(indexPath, 'utf8'));
+    const droids = fs.readdirSync(path.join(work, '.factory', 'droids')).filter(name => name.endsWith('.md'));
+    if (installed.droids.length !== droids.length || installed.droids.some(row => row[1] === 'other')) {
+      throw new Error(`Index should place all ${droids.length} shipped droids in a tier`);
+    }
+    const indexBytes = fs.statSync(indexPath).size;
+    const droidBytes = installed.droids.reduce((sum, row) => sum + row[2], 0);
+    if (indexBytes > 3 * 1024 || indexBytes * 20 > droidBytes) {
+      throw new Error(`Index is ${indexBytes} bytes for ${droidBytes} bytes of droids`);
+    }
+
+    const stats = await installDroidpowers(work, { force: true, quiet: true });
+    if (stats.written.length !== 0) {
+      throw new Error(`Reinstall rewrote ${stats.written}`);
+    }
+    console.log(`✅ ${DROID_INDEX_FILE} is ${indexBytes} bytes for ${(droidBytes / 1024).toFixed(0)} KiB of droids`);
+  } finally {
+    fs.rmSync(work, { recursive: true, force: true });
+  }
+}
+
+// Export test function for use in test runner
+module.exports = { testDroidIndex };
+
+// Run test if this file is executed directly
+if (require.main === module) {
+  testDroidIndex().catch(error => {
+    console.error('❌ Droid index test failed:', error.message);
+    process.exit(1);
+  });
+}
@@ -1,6 +1,7 @@
 // test/file-operations.test.js
-const { copyDirectory, copyFile, fileExists, directoryExists } = require('../src/file-operations');
+const { copyDirectory, copyFile, createLimiter, fileExists, directoryExists } = require('../src/file-operations');
 const fs = require('fs');
+const os = require('os');
 const path = require('path');
 
 async function testCopyFile() {
@@ -24,10 +25,47 @@ async function testCopyFile() {
   }
 }
 
+async function testCopyDirectoryConcurrency() {
+  // The limiter never runs more tasks than allowed
+  const limit = createLimiter(3);
+  let active = 0;
+  let peak = 0;
+  await Promise.all(Array.from({ length: 20 }, () => limit(async () => {
+    active++;
+    peak = Math.max(peak, active);
+    await new Promise(resolve => setTimeout(resolve, 2));
+    active--;
+  })));
+  if (peak !== 3) {
+    throw new Error(`Expected 3 concurrent tasks, saw ${peak}`);
+  }
+
+  // A nested tree is copied completely with a small concurrency limit
+  const work = fs.mkdtempSync(path.join(os.tmpdir(), 'droidpowers-copy-'));
+  try {
+    const src = path.join(work, 'src');
+    const files = ['a.md', 'droids/b.md', 'droids/nested/c.md', 'commands/d.md'];
+    for (const file of files) {
+      fs.mkdirSync(path.dirname(path.join(src, file)), { recursive: true });
+      fs.writeFileSync(path.join(src, file), `content of ${file}`);
+    }
+
+    await copyDirectory(src, path.join(work, 'dest'), { concurrency: 2 });
+
+    for (const file of files) {
+      if (fs.readFileSync(path.join(work, 'dest', file), 'utf8') !== `content of ${file}`) {
+        throw new Error(`${file} was not copied`);
+      }
+    }
+  } finally {
+    fs.rmSync(work, { recursive: true, force: true });
+  }
+}
+
 // Export test function for use in test runner
-module.exports = { testCopyFile };
+module.exports = { testCopyFile, testCopyDirectoryConcurrency };
 
 // Run test if this file is executed directly
 if (require.main === module) {
-  testCopyFile().catch(console.error);
+  testCopyFile().then(testCopyDirectoryConcurrency).catch(console.error);
 }
\ No newline at end of file
@@ -0,0 +1,68 @@
+// test/fleet.test.js
+const { installFleet, loadTemplates } = require('../src/installer');
+const { expandTargets } = require('../src/targets');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+async function testFleetInstall() {
+  const work = fs.mkdtempSync(path.join(os.tmpdir(), 'droidpowers-fleet-'));
+
+  try {
+    for (const service of ['svc-a', 'svc-b', 'svc-c', 'other']) {
+      fs.mkdirSync(path.join(work, 'services', service, '.git'), { recursive: true });
+    }
+    fs.mkdirSync(path.join(work, 'services', 'svc-c', '.factory'));
+
+    console.log('🧪 Testing glob target expansion...');
+    const targets = await expandTargets([path.join(work, 'services', 'svc-*')]);
+    const names = targets.map(target => path.basename(target));
+    if (names.join() !== 'svc-a,svc-b,svc-c') {
+      throw new Error(`Unexpected targets: ${names}`);
+    }
+    targets.push(path.join(work, 'missing'));
+
+    console.log('🧪 Testing one failing target does not stop the others...');
+    const templates = await loadTemplates();
+    const results = await installFleet(targets, { templates, jobs: 2 });
+    const byName = Object.fromEntries(results.map(result => [path.basename(result.target), result]));
+
+    for (const name of ['svc-a', 'svc-b']) {
+      if (!byName[name].ok || byName[name].stats.written.length !== templates.contents.size) {
+        throw new Error(`${name} was not installed: ${byName[name].error}`);
+      }
+      if (!fs.existsSync(path.join(work, 'services', name, '.factory', 'droids', 'brainstorming.md'))) {
+        throw new Error(`${name} is missing installed droids`);
+      }
+    }
+    if (byName['svc-c'].ok || !byName['svc-c'].error.includes('Use --force')) {
+      throw new Error('Existing .factory without --force should fail');
+    }
+    if (byName.missing.ok || !byName.missing.error.includes('does not exist')) {
+      throw new Error('Missing target should fail');
+    }
+    if (results.some(result => typeof result.durationMs !== 'number')) {
+      throw new Error('Every target should report its duration');
+    }
+
+    console.log('🧪 Testing forced fleet reinstall writes nothing new...');
+    const again = await installFleet(targets.slice(0, 3), { templates, force: true });
+    if (!again.every(result => result.ok) || again[0].stats.written.length !== 0) {
+      throw new Error('Forced reinstall should succeed without rewriting unchanged files');
+    }
+    console.log('✅ Fleet install reported every target');
+  } finally {
+    fs.rmSync(work, { recursive: true, force: true });
+  }
+}
+
+// Export test function for use in test runner
+module.exports = { testFleetInstall };
+
+// Run test if this file is executed directly
+if (require.main === module) {
+  testFleetInstall().catch(error => {
+    console.error('❌ Fleet test failed:', error.message);
+    process.exit(1);
+  });
+}
@@ -1,5 +1,6 @@
 // test/integration.test.js
 const { installDroidpowers } = require('../src/installer');
+const { REGISTRY_FILE } = require('../src/registry');
 const fs = require('fs');
 const path = require('path');
 
@@ -26,12 +27,20 @@ async function testFullIntegration() {
     // Test installation
     await installDroidpowers(testProjectDir, { force: false });
 
-    // Verify all expected files exist
+    // Verify all expected files exist: every registered droid and command
+    // plus the files installed next to .factory
+    const registry = JSON.parse(fs.readFileSync(path.join(__dirname, '..', 'templates', REGISTRY_FILE), 'utf8'));
     const expectedFiles = [
       '.factory',
-      'AGENTS.md.template',
-      'DSM_README.md'
+      ...registry.extras
     ];
+    for (const entry of [...Object.values(registry.droids), ...Object.values(registry.commands)]) {
+      const installed = fs.readFileSync(path.join(testProjectDir, '.factory', ...entry.path.split('/')));
+      if (installed.length !== entry.size) {
+        throw new Error(`Installed ${entry.path} is ${installed.length} bytes, registry says ${entry.size}`);
+      }
+    }
+    console.log(`✅ Found ${Object.keys(registry.droids).length} droids and ${Object.keys(registry.commands).length} commands`);
 
     for (const file of expectedFiles) {
       const filePath = path.join(testProjectDir, file);
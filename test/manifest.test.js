@@ -0,0 +1,87 @@
+// test/manifest.test.js
+const {
+  INSTALLED_MANIFEST_FILE,
+  MANIFEST_FILE,
+  buildManifest,
+  readManifest,
+  syncDirectory
+} = require('../src/manifest');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+function writeTree(root, files) {
+  for (const [file, content] of Object.entries(files)) {
+    fs.mkdirSync(path.dirname(path.join(root, file)), { recursive: true });
+    fs.writeFileSync(path.join(root, file), content);
+  }
+}
+
+async function testManifest() {
+  console.log('🧪 Testing shipped manifest is current...');
+  const templatesDir = path.join(__dirname, '..', 'templates');
+  const shipped = await readManifest(path.join(templatesDir, MANIFEST_FILE));
+  const current = await buildManifest(path.join(templatesDir, '.factory'));
+  if (JSON.stringify(shipped) !== JSON.stringify(current)) {
+    throw new Error(`templates/${MANIFEST_FILE} is stale - run npm run build:manifest`);
+  }
+
+  const work = fs.mkdtempSync(path.join(os.tmpdir(), 'droidpowers-manifest-'));
+  try {
+    const src = path.join(work, 'src');
+    const dest = path.join(work, 'dest');
+    writeTree(src, {
+      'droids/a.md': '# A',
+      'droids/b.md': '# B',
+      'tools/old/helper.py': 'print(1)'
+    });
+
+    console.log('🧪 Testing fresh sync writes every file...');
+    let stats = await syncDirectory(src, dest, await buildManifest(src));
+    if (stats.written.length !== 3 || stats.unchanged !== 0) {
+      throw new Error(`Expected 3 files written, got ${JSON.stringify(stats)}`);
+    }
+
+    console.log('🧪 Testing resync writes nothing...');
+    stats = await syncDirectory(src, dest, await buildManifest(src));
+    if (stats.written.length !== 0 || stats.unchanged !== 3) {
+      throw new Error(`Expected no writes, got ${JSON.stringify(stats)}`);
+    }
+
+    console.log('🧪 Testing changed, missing and dropped files...');
+    fs.writeFileSync(path.join(dest, 'droids/a.md'), '# Locally edited');
+    fs.unlinkSync(path.join(dest, 'droids/b.md'));
+    fs.rmSync(path.join(src, 'tools'), { recursive: true });
+    writeTree(dest, { 'droids/custom.md': '# Mine', '.cache/verify.json': '{}' });
+
+    stats = await syncDirectory(src, dest, await buildManifest(src));
+    if (stats.written.sort().join() !== 'droids/a.md,droids/b.md') {
+      throw new Error(`Unexpected writes: ${stats.written}`);
+    }
+    if (stats.removed.join() !== 'tools/old/helper.py' || fs.existsSync(path.join(dest, 'tools'))) {
+      throw new Error(`Dropped upstream file was not removed: ${stats.removed}`);
+    }
+    if (fs.readFileSync(path.join(dest, 'droids/a.md'), 'utf8') !== '# A') {
+      throw new Error('Changed file was not restored');
+    }
+    for (const kept of ['droids/custom.md', '.cache/verify.json', INSTALLED_MANIFEST_FILE]) {
+      if (!fs.existsSync(path.join(dest, kept))) {
+        throw new Error(`${kept} should have been kept`);
+      }
+    }
+    console.log('✅ Only changed files were written');
+  } finally {
+    fs.rmSync(work, { recursive: true, force: true });
+  }
+}
+
+// Export test function for use in test runner
+module.exports = { testManifest };
+
+// Run test if this file is executed directly
+if (require.main === module) {
+  testManifest().catch(error => {
+    console.error('❌ Manifest test failed:', error.message);
+    process.exit(1);
+  });
+}
@@ -0,0 +1,83 @@
+// test/registry.test.js
+const {
+  REGISTRY_FILE,
+  buildRegistry,
+  findDroidTests,
+  parseFrontmatter,
+  readLinks,
+  serializeRegistry
+} = require('../src/registry');
+const { loadTemplates } = require('../src/installer');
+const fs = require('fs');
+const path = require('path');
+
+async function testRegistry() {
+  console.log('🧪 Testing shipped registry is current...');
+  const templatesDir = path.join(__dirname, '..', 'templates');
+  const contents = new Map();
+  for (const kind of ['droids', 'commands']) {
+    const dir = path.join(templatesDir, '.factory', kind);
+    for (const name of fs.readdirSync(dir).filter(name => name.endsWith('.md')).sort()) {
+      contents.set(`${kind}/${name}`, fs.readFileSync(path.join(dir, name)));
+    }
+  }
+  const shipped = fs.readFileSync(path.join(templatesDir, REGISTRY_FILE), 'utf8');
+  if (shipped !== serializeRegistry(buildRegistry(contents, await readLinks(), await findDroidTests()))) {
+    throw new Error(`templates/${REGISTRY_FILE} is stale - run npm run build:registry`);
+  }
+
+  console.log('🧪 Testing droids are linked to their commands...');
+  const sample = new Map([
+    ['droids/zeta.md', Buffer.from('---\nname: zeta\ntools: [Read, Bash]\ntags:\n  - a\n  - "b"\n---\n# Zeta\n')],
+    ['droids/alpha.md', Buffer.from('# Alpha\n')],
+    ['droids/unlisted.md', Buffer.from('# Unlisted\n')],
+    ['commands/z.md', Buffer.from('# Z\n')],
+    ['commands/orphan.md', Buffer.from('# Orphan\n')],
+    ['tools/helper.py', Buffer.from('print(1)')]
+  ]);
+  const registry = buildRegistry(sample, { zeta: 'z', alpha: null }, { zeta: 'tests/droids/test_zeta.py' });
+  if (Object.keys(registry.droids).join() !== 'zeta,alpha,unlisted') {
+    throw new Error(`Droids should follow spec order: ${Object.keys(registry.droids)}`);
+  }
+  if (registry.droids.zeta.command !== 'z' || registry.commands.z.droid !== 'zeta' || registry.commands.orphan.droid !== null) {
+    throw new Error('Links should be recorded on both droids and commands');
+  }
+  if (registry.droids.zeta.size !== sample.get('droids/zeta.md').length || registry.droids.zeta.test !== 'tests/droids/test_zeta.py') {
+    throw new Error(`Unexpected droid entry: ${JSON.stringify(registry.droids.zeta)}`);
+  }
+  const frontmatter = JSON.stringify(registry.droids.zeta.frontmatter);
+  if (frontmatter !== JSON.stringify({ name: 'zeta', tools: ['Read', 'Bash'], tags: ['a', 'b'] })) {
+    throw new Error(`Unexpected frontmatter: ${frontmatter}`);
+  }
+  if (Object.keys(parseFrontmatter('# No frontmatter\n')).length !== 0) {
+    throw new Error('Files without frontmatter should have none');
+  }
+
+  let error = null;
+  try {
+    buildRegistry(sample, { zeta: 'missing', gone: null });
+  } catch (caught) {
+    error = caught;
+  }
+  if (!error || !/command missing for zeta/.test(error.message) || !/droid gone/.test(error.message)) {
+    throw new Error(`Broken links should fail the build, got: ${error && error.message}`);
+  }
+
+  console.log('🧪 Testing the installer takes its extra files from the registry...');
+  const templates = await loadTemplates(templatesDir);
+  if ([...templates.extras.keys()].join() !== JSON.parse(shipped).extras.join()) {
+    throw new Error(`Installer extras ${[...templates.extras.keys()]} do not match the registry`);
+  }
+  console.log(`✅ ${REGISTRY_FILE} links ${Object.keys(JSON.parse(shipped).droids).length} droids to their commands`);
+}
+
+// Export test function for use in test runner
+module.exports = { testRegistry };
+
+// Run test if this file is executed directly
+if (require.main === module) {
+  testRegistry().catch(error => {
+    console.error('❌ Registry test failed:', error.message);
+    process.exit(1);
+  });
+}
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Concurrent fan-out of independent investigations for dispatching-parallel-agents.
+
+Takes a problem list and runs one agent per problem:
+
+- every problem gets its own workspace, either an empty temporary directory
+  or a detached git worktree (``--workspace worktree``), so agents cannot
+  share state through the checkout;
+- problems may declare the ``paths`` they own. Overlapping declarations are
+  rejected before anything runs, and files changed by more than one agent
+  are reported as conflicts when results are merged;
+- at most ``--jobs`` agents run at once, each under ``--timeout``.
+  ``--fail-fast`` cancels the rest after the first failure;
+- the report compares wall time with the summed agent time (what running them
+  one after another would cost) and gives the parallel speedup.
+
+The problem list is a JSON file (a list of strings or of objects with ``id``,
+``prompt`` and optional ``paths``) or a text file with one problem per line.
+
+Usage::
+
+    python .factory/tools/dispatch_agents.py problems.json --backend stub
+    python .factory/tools/dispatch_agents.py problems.txt --workspace worktree \\
+        --backend 'command:droid exec --auto' --jobs 3 --timeout 900 --output dispatch.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from agent_backends import REPLY_FILE, load_backend
+
+DEFAULT_JOBS = 4
+DEFAULT_TIMEOUT = 600.0
+
+
+class Problem(NamedTuple):
+    """One independent investigation."""
+
+    id: str
+    prompt: str
+    paths: Tuple[str, ...] = ()
+
+
+class ProblemResult(NamedTuple):
+    """How one agent's investigation ended."""
+
+    id: str
+    status: str  # ok, failed, timeout, cancelled, error
+    elapsed: float
+    output: str
+    workspace: str
+    changed: Tuple[str, ...]
+
+
+class DispatchReport(NamedTuple):
+    """Merged results of one fan-out."""
+
+    results: List[ProblemResult]
+    wall: float
+    serial: float
+    conflicts: Dict[str, List[str]]
+
+    @property
+    def speedup(self) -> float:
+        return self.serial / self.wall if self.wall else 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status == "ok" for r in self.results) and not self.conflicts
+
+    def to_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "wall_seconds": round(self.wall, 3),
+            "serial_seconds": round(self.serial, 3),
+            "speedup": round(self.speedup, 2),
+            "conflicts": self.conflicts,
+            "results": [r._asdict() for r in self.results],
+        }
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:40] or "problem"
+
+
+def load_problems(path: str) -> List[Problem]:
+    """Read problems from a JSON list or a one-per-line text file."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        entries = json.loads(text)
+    else:
+        entries = [re.sub(r"^\s*(?:[-*]|\d+[.)])\s+", "", line).strip() for line in text.splitlines()]
+        entries = [entry for entry in entries if entry and not entry.startswith("#")]
+
+    problems, seen = [], set()
+    for number, entry in enumerate(entries, 1):
+        if isinstance(entry, str):
+            entry = {"prompt": entry}
+        problem_id = str(entry.get("id") or f"{number}-{_slug(entry['prompt'])}")
+        if problem_id in seen:
+            raise ValueError(f"duplicate problem id {problem_id!r}")
+        seen.add(problem_id)
+        problems.append(Problem(problem_id, entry["prompt"], tuple(entry.get("paths", ()))))
+    return problems
+
+
+def _overlaps(a: str, b: str) -> bool:
+    a, b = a.rstrip("/"), b.rstrip("/")
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+def shared_state(problems: Sequence[Problem]) -> List[Tuple[str, str, str]]:
+    """Pairs of problems whose declared paths overlap, with the shared path."""
+    found = []
+    for i, first in enumerate(problems):
+        for second in problems[i + 1:]:
+            for a in first.paths:
+                match = next((b for b in second.paths if _overlaps(a, b)), None)
+                if match is not None:
+                    found.append((first.id, second.id, a if len(a) <= len(match) else match))
+                    break
+    return found
+
+
+class Workspaces:
+    """Creates one isolated directory per problem."""
+
+    def __init__(self, mode: str = "tmp", root: Optional[str] = None, base: str = "HEAD"):
+        self.mode = mode
+        self.root = root
+        self.base = base
+        self.parent = tempfile.mkdtemp(prefix="dispatch-")
+        self._numbers = itertools.count(1)
+
+    def create(self, problem: Problem) -> str:
+        # Numbered, since slugs of long ids can collide
+        path = os.path.join(self.parent, f"{next(self._numbers)}-{_slug(problem.id)}")
+        if self.mode == "worktree":
+            subprocess.run(["git", "worktree", "add", "--detach", path, self.base], cwd=self.root,
+                           check=True, capture_output=True)
+        else:
+            os.makedirs(path)
+        return path
+
+    def changed(self, path: str) -> Tuple[str, ...]:
+        """Files the agent wrote, relative to its workspace; its reply file is not a change."""
+        if self.mode == "worktree":
+            status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=all"], cwd=path,
+                                    capture_output=True, text=True).stdout
+            files = (line[3:] for line in status.splitlines() if line.strip())
+        else:
+            # A tmp workspace starts empty, so every file in it was written by the agent
+            files = (os.path.relpath(os.path.join(directory, name), path).replace(os.sep, "/")
+                     for directory, _, names in os.walk(path) for name in names)
+        return tuple(sorted(file for file in files if file != REPLY_FILE))
+
+    def cleanup(self) -> None:
+        if self.mode == "worktree":
+            for name in os.listdir(self.parent):
+                subprocess.run(["git", "worktree", "remove", "--force", os.path.join(self.parent, name)],
+                               cwd=self.root, capture_output=True)
+        shutil.rmtree(self.parent, ignore_errors=True)
+
+
+async def dispatch(problems: Sequence[Problem], backend, workspaces: Workspaces, jobs: int = DEFAULT_JOBS,
+                   timeout: float = DEFAULT_TIMEOUT, fail_fast: bool = False) -> DispatchReport:
+    """Run every problem concurrently (at most ``jobs`` at a time) and merge results."""
+    semaphore = asyncio.Semaphore(max(1, jobs))
+    results: Dict[str, ProblemResult] = {}
+
+    async def investigate(problem: Problem) -> None:
+        async with semaphore:
+            workspace = await asyncio.to_thread(workspaces.create, problem)
+            started = time.perf_counter()
+            try:
+                reply = await asyncio.wait_for(backend.run(problem.prompt, workspace), timeout)
+                status, output = ("ok" if reply.ok else "failed"), reply.text
+            except asyncio.TimeoutError:
+                status, output = "timeout", f"no result after {timeout:g}s"
+            except asyncio.CancelledError:
+                results[problem.id] = ProblemResult(problem.id, "cancelled", time.perf_counter() - started,
+                                                    "", workspace, ())
+                raise
+            except Exception as error:  # One broken agent must not stop the others
+                status, output = "error", f"{type(error).__name__}: {error}"
+            elapsed = time.perf_counter() - started
+            changed = await asyncio.to_thread(workspaces.changed, workspace)
+            results[problem.id] = ProblemResult(problem.id, status, elapsed, output, workspace, changed)
+            if status != "ok" and fail_fast:
+                current = asyncio.current_task()
+                for task in tasks:
+                    if task is not current:
+                        task.cancel()
+
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(investigate(problem)) for problem in problems]
+    await asyncio.gather(*tasks, return_exceptions=True)
+    wall = time.perf_counter() - started
+
+    ordered = [results.get(p.id) or ProblemResult(p.id, "cancelled", 0.0, "", "", ()) for p in problems]
+    owners: Dict[str, List[str]] = {}
+    for result in ordered:
+        for path in result.changed:
+            owners.setdefault(path, []).append(result.id)
+    conflicts = {path: ids for path, ids in sorted(owners.items()) if len(ids) > 1}
+    return DispatchReport(ordered, wall, sum(r.elapsed for r in ordered), conflicts)
+
+
+def print_report(report: DispatchReport) -> None:
+    icons = {"ok": "✅", "failed": "❌", "timeout": "⏱️", "cancelled": "⏹️", "error": "💥"}
+    for result in report.results:
+        summary = result.output.strip().splitlines()[-1] if result.output.strip() else ""
+        print(f"{icons.get(result.status, '?')} {result.id} [{result.status}] {result.elapsed:.2f}s"
+              + (f" - {summary[:100]}" if summary else ""))
+        if result.changed:
+            print(f"   changed: {', '.join(result.changed)} in {result.workspace}")
+    for path, ids in report.conflicts.items():
+        print(f"⚠️  {path} changed by {', '.join(ids)} - integrate by hand")
+    print(f"📊 {len(report.results)} problems in {report.wall:.2f}s wall, {report.serial:.2f}s serial "
+          f"→ {report.speedup:.1f}x speedup")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Investigate independent problems concurrently")
+    parser.add_argument("problems", help="JSON problem list or text file with one problem per line")
+    parser.add_argument("--backend", default="stub", help="stub, stub:<seconds> or command:<cmd> (default: stub)")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS, help=f"Agents at once (default: {DEFAULT_JOBS})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds per problem (default: 600)")
+    parser.add_argument("--workspace", choices=("tmp", "worktree"), default="tmp",
+                        help="Isolation per problem: empty directory or git worktree (default: tmp)")
+    parser.add_argument("--fail-fast", action="store_true", help="Cancel remaining problems after a failure")
+    parser.add_argument("--allow-overlap", action="store_true", help="Dispatch even if declared paths overlap")
+    parser.add_argument("--compare-serial", action="store_true", help="Also run serially and report measured speedup")
+    parser.add_argument("--keep", action="store_true", help="Keep workspaces for integration")
+    parser.add_argument("--output", help="Write the merged report as JSON")
+    args = parser.parse_args(argv)
+
+    problems = load_problems(args.problems)
+    overlaps = shared_state(problems)
+    if overlaps and not args.allow_overlap:
+        for first, second, path in overlaps:
+            print(f"❌ {first} and {second} share {path} - not independent, investigate together")
+        return 1
+    if len(problems) < 3:
+        print(f"⚠️  Only {len(problems)} problem(s); parallel dispatch pays off from 3 independent problems")
+
+    backend = load_backend(args.backend)
+    root = None
+    if args.workspace == "worktree":
+        root = subprocess.run(["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    workspaces = Workspaces(args.workspace, root)
+    try:
+        report = asyncio.run(dispatch(problems, backend, workspaces, args.jobs, args.timeout, args.fail_fast))
+        print_report(report)
+        document = report.to_dict()
+        if args.compare_serial:
+            serial = Workspaces(args.workspace, root)
+            try:
+                measured = asyncio.run(dispatch(problems, backend, serial, 1, args.timeout))
+            finally:
+                serial.cleanup()
+            document["measured_serial_seconds"] = round(measured.wall, 3)
+            print(f"📊 Measured serial run: {measured.wall:.2f}s → {measured.wall / report.wall:.1f}x speedup")
+    finally:
+        if args.keep:
+            print(f"📁 Workspaces kept in {workspaces.parent}")
+        else:
+            workspaces.cleanup()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of code-review results for requesting-code-review.
+
+A review is keyed by the SHA-256 of the *normalized* diff under review, the
+reviewer droid's version (a hash of its file) and, optionally, the task
+context it was reviewed against. Normalizing drops everything a rebase or a
+no-op fixup changes without changing the code: commit headers, ``index``
+lines, hunk line numbers and trailing whitespace. A re-dispatched review of
+byte-identical work is then answered from the cache, and editing the
+reviewer droid invalidates every old verdict automatically.
+
+Entries are JSON files in ``.factory/.cache/reviews/``. Reading one refreshes
+its mtime, and storing evicts the least recently used entries beyond
+``--max-entries`` or ``--max-bytes``.
+
+Usage::
+
+    python .factory/tools/review_cache.py get --base "$BASE_SHA" --head "$HEAD_SHA"
+    python .factory/tools/review_cache.py put --base "$BASE_SHA" --head "$HEAD_SHA" \\
+        --verdict approved --review review.md
+    python .factory/tools/review_cache.py invalidate --stale
+    python .factory/tools/review_cache.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+CACHE_DIR = os.path.join(".factory", ".cache", "reviews")
+DEFAULT_REVIEWER = "requesting-code-review"
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+VERDICTS = ("approved", "changes-requested", "blocked")
+
+_VOLATILE_PREFIXES = ("index ", "similarity index ", "dissimilarity index ")
+
+
+def normalize_diff(diff: str) -> str:
+    """The diff reduced to what a reviewer judges: paths and changed content, in path order."""
+    files: Dict[str, List[str]] = {}
+    current = None
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            current = line
+            files[current] = []
+        elif current is None or line.startswith(_VOLATILE_PREFIXES):
+            continue  # Commit headers before the first file, blob ids, rename scores
+        elif line.startswith("@@"):
+            files[current].append("@@")
+        else:
+            files[current].append(line.rstrip())
+    return "\n".join("\n".join([header, *files[header]]) for header in sorted(files))
+
+
+def reviewer_version(root: str, reviewer: str = DEFAULT_REVIEWER) -> str:
+    """Short hash of the reviewer droid, so editing the droid invalidates its verdicts."""
+    path = os.path.join(root, ".factory", "droids", f"{reviewer}.md")
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:12]
+    except OSError:
+        return "unversioned"
+
+
+def review_key(diff: str, version: str, context: str = "") -> str:
+    digest = hashlib.sha256()
+    for part in (normalize_diff(diff), version, context.strip()):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ReviewCache:
+    """One JSON file per review; file mtime is the LRU clock."""
+
+    def __init__(self, directory: str, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self) -> List[os.DirEntry]:
+        try:
+            return [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: dict) -> List[str]:
+        """Store ``entry`` and return the keys evicted to stay within bounds."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(dict(entry, key=key), f, indent=2)
+        os.replace(f"{path}.tmp", path)
+        return self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime_ns)
+        total = sum(e.stat().st_size for e in entries)
+        evicted = []
+        for entry in entries:
+            if len(entries) - len(evicted) <= self.max_entries and total <= self.max_bytes:
+                break
+            key = entry.name[:-len(".json")]
+            if key == keep:
+                continue
+            total -= entry.stat().st_size
+            os.unlink(entry.path)
+            evicted.append(key)
+        return evicted
+
+    def invalidate(self, keys: Optional[List[str]] = None, keep_version: Optional[str] = None) -> int:
+        """Remove ``keys`` (all entries if None), or only entries not from ``keep_version``."""
+        removed = 0
+        for entry in self._entries():
+            key = entry.name[:-len(".json")]
+            if keys is not None and not any(key.startswith(prefix) for prefix in keys):
+                continue
+            if keep_version is not None:
+                try:
+                    with open(entry.path, encoding="utf-8") as f:
+                        if json.load(f).get("reviewer_version") == keep_version:
+                            continue
+                except (OSError, ValueError):
+                    pass
+            os.unlink(entry.path)
+            removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(e.stat().st_size for e in entries),
+                "max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+
+def read_diff(root: str, base: str, head: str, diff_file: Optional[str]) -> str:
+    if diff_file == "-":
+        return sys.stdin.read()
+    if diff_file:
+        with open(diff_file, encoding="utf-8") as f:
+            return f.read()
+    result = subprocess.run(["git", "diff", "--no-color", "--no-ext-diff", "-M", base, head], cwd=root,
+                            check=True, capture_output=True, text=True)
+    return result.stdout
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cache code-review results by normalized diff")
+    parser.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES)
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_diff_options(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--base", default="HEAD~1", help="Base commit (default: HEAD~1)")
+        sub.add_argument("--head", default="HEAD", help="Head commit (default: HEAD)")
+        sub.add_argument("--diff", help="Read the diff from a file (- for stdin) instead of git")
+        sub.add_argument("--reviewer", default=DEFAULT_REVIEWER, help=f"Reviewer droid (default: {DEFAULT_REVIEWER})")
+        sub.add_argument("--context", help="File with the task or requirements the review is judged against")
+
+    add_diff_options(commands.add_parser("key", help="Print the cache key for a diff"))
+    add_diff_options(commands.add_parser("get", help="Print the cached review; exit 1 on a miss"))
+    put = commands.add_parser("put", help="Store a review result")
+    add_diff_options(put)
+    put.add_argument("--verdict", choices=VERDICTS, required=True)
+    put.add_argument("--review", default="-", help="File with the review text (default: stdin)")
+    invalidate = commands.add_parser("invalidate", help="Drop cached reviews")
+    invalidate.add_argument("keys", nargs="*", help="Keys or key prefixes to drop (default: all)")
+    invalidate.add_argument("--stale", action="store_true", help="Only drop reviews from older reviewer versions")
+    invalidate.add_argument("--reviewer", default=DEFAULT_REVIEWER)
+    commands.add_parser("stats", help="Show cache size")
+    args = parser.parse_args(argv)
+
+    try:
+        root = subprocess.run(["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except subprocess.CalledProcessError:
+        root = os.getcwd()
+    cache = ReviewCache(os.path.join(root, CACHE_DIR), args.max_entries, args.max_bytes)
+
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"📊 {stats['entries']} review(s), {stats['bytes'] / 1024:.1f} KiB "
+              f"(limits: {stats['max_entries']} entries, {stats['max_bytes'] / 1024 / 1024:.0f} MiB)")
+        return 0
+    if args.command == "invalidate":
+        keep = reviewer_version(root, args.reviewer) if args.stale else None
+        removed = cache.invalidate(args.keys or None, keep)
+        print(f"🧹 Removed {removed} cached review(s)")
+        return 0
+
+    try:
+        diff = read_diff(root, args.base, args.head, args.diff)
+    except (OSError, subprocess.CalledProcessError) as error:
+        print(f"❌ {getattr(error, 'stderr', None) or error}".strip(), file=sys.stderr)
+        return 2
+    if not normalize_diff(diff):
+        print("❌ Empty diff - nothing to review", file=sys.stderr)
+        return 2
+    context = ""
+    if args.context:
+        with open(args.context, encoding="utf-8") as f:
+            context = f.read()
+    version = reviewer_version(root, args.reviewer)
+    key = review_key(diff, version, context)
+
+    if args.command == "key":
+        print(key)
+        return 0
+    if args.command == "get":
+        entry = cache.get(key)
+        if entry is None:
+            print(f"🔍 No cached review for {key[:12]} - dispatch the reviewer", file=sys.stderr)
+            return 1
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["created"]))
+        print(f"✅ Cached review ({entry['verdict']}) from {stamp}, reviewer {entry['reviewer_version']}",
+              file=sys.stderr)
+        review = entry["review"]
+        sys.stdout.write(review if review.endswith("\n") else review + "\n")
+        return 0
+
+    if args.review == "-":
+        review = sys.stdin.read()
+    else:
+        with open(args.review, encoding="utf-8") as f:
+            review = f.read()
+    evicted = cache.put(key, {
+        "verdict": args.verdict,
+        "review": review,
+        "reviewer": args.reviewer,
+        "reviewer_version": version,
+        "base": args.base,
+        "head": args.head,
+        "created": time.time(),
+    })
+    print(f"✅ Stored review {key[:12]} ({args.verdict})" + (f", evicted {len(evicted)}" if evicted else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
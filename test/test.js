@@ -3,8 +3,15 @@ const path = require('path');
 const fs = require('fs');
 
 // Import test functions
-const { testCopyFile } = require('./file-operations.test.js');
+const { testCopyFile, testCopyDirectoryConcurrency } = require('./file-operations.test.js');
 const { testInstall } = require('./installer.test.js');
+const { testManifest } = require('./manifest.test.js');
+const { testContextPack } = require('./context-pack.test.js');
+const { testDroidIndex } = require('./droid-index.test.js');
+const { testRegistry } = require('./registry.test.js');
+const { testBundle } = require('./bundle.test.js');
+const { testFleetInstall } = require('./fleet.test.js');
+const { testWaitFor } = require('./wait-for.test.js');
 
 // Import new test functions that we'll run separately
 const { testFullIntegration } = require('./integration.test.js');
@@ -22,6 +29,7 @@ async function runTests() {
       test: async () => {
         console.log('📁 Running file operations tests...');
         await testCopyFile();
+        await testCopyDirectoryConcurrency();
         console.log('✅ File operations tests passed\n');
       }
     },
@@ -33,6 +41,62 @@ async function runTests() {
         console.log('✅ Installer tests passed\n');
       }
     },
+    {
+      name: 'Manifest Tests',
+      test: async () => {
+        console.log('🧾 Running manifest tests...');
+        await testManifest();
+        console.log('✅ Manifest tests passed\n');
+      }
+    },
+    {
+      name: 'Context Pack Tests',
+      test: async () => {
+        console.log('🗜️ Running context pack tests...');
+        await testContextPack();
+        console.log('✅ Context pack tests passed\n');
+      }
+    },
+    {
+      name: 'Droid Index Tests',
+      test: async () => {
+        console.log('🗂️ Running droid index tests...');
+        await testDroidIndex();
+        console.log('✅ Droid index tests passed\n');
+      }
+    },
+    {
+      name: 'Registry Tests',
+      test: async () => {
+        console.log('🗃️ Running registry tests...');
+        await testRegistry();
+        console.log('✅ Registry tests passed\n');
+      }
+    },
+    {
+      name: 'Bundle Tests',
+      test: async () => {
+        console.log('📦 Running template bundle tests...');
+        await testBundle();
+        console.log('✅ Bundle tests passed\n');
+      }
+    },
+    {
+      name: 'Fleet Install Tests',
+      test: async () => {
+        console.log('🚢 Running fleet install tests...');
+        await testFleetInstall();
+        console.log('✅ Fleet install tests passed\n');
+      }
+    },
+    {
+      name: 'Wait Helper Tests',
+      test: async () => {
+        console.log('⏳ Running waitFor helper tests...');
+        await testWaitFor();
+        console.log('✅ Wait helper tests passed\n');
+      }
+    },
     {
       name: 'Integration Tests',
       test: async () => {
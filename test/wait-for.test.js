@@ -0,0 +1,59 @@
+// test/wait-for.test.js
+const { waitFor, waitForEvent, waitForFile } = require('../templates/.factory/tools/wait-for');
+const { EventEmitter } = require('events');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+async function testWaitFor() {
+  console.log('🧪 Testing waitFor backoff and stats...');
+  let calls = 0;
+  const stats = [];
+  const result = await waitFor(() => ++calls >= 4 && 'ready', 'four calls', { onComplete: s => stats.push(s) });
+  if (result !== 'ready' || stats[0].checks !== 4 || stats[0].mode !== 'poll') {
+    throw new Error(`Unexpected waitFor result: ${result} ${JSON.stringify(stats)}`);
+  }
+
+  console.log('🧪 Testing timeout error carries stats...');
+  try {
+    await waitFor(() => false, 'never', 30);
+    throw new Error('waitFor should have timed out');
+  } catch (error) {
+    if (!error.stats || error.stats.satisfied || !error.message.includes('Timeout waiting for never')) {
+      throw error;
+    }
+  }
+
+  console.log('🧪 Testing event wait does not poll...');
+  const emitter = new EventEmitter();
+  setTimeout(() => emitter.emit('DONE', 42), 20);
+  const eventStats = [];
+  const value = await waitForEvent(emitter, 'DONE', { onComplete: s => eventStats.push(s) });
+  if (value !== 42 || eventStats[0].mode !== 'event' || eventStats[0].checks !== 2) {
+    throw new Error(`Unexpected event wait: ${value} ${JSON.stringify(eventStats)}`);
+  }
+
+  console.log('🧪 Testing file wait...');
+  const work = fs.mkdtempSync(path.join(os.tmpdir(), 'droidpowers-wait-'));
+  try {
+    const flag = path.join(work, 'ready.flag');
+    setTimeout(() => fs.writeFileSync(flag, 'ok'), 20);
+    if (await waitForFile(flag, { timeoutMs: 2000 }) !== flag) {
+      throw new Error('waitForFile did not return the path');
+    }
+  } finally {
+    fs.rmSync(work, { recursive: true, force: true });
+  }
+  console.log('✅ waitFor helpers work');
+}
+
+// Export test function for use in test runner
+module.exports = { testWaitFor };
+
+// Run test if this file is executed directly
+if (require.main === module) {
+  testWaitFor().catch(error => {
+    console.error('❌ waitFor test failed:', error.message);
+    process.exit(1);
+  });
+}
@@ -0,0 +1,88 @@
+"""Session-scoped fixtures shared by the droid test suite.
+
+The repository root defaults to this checkout and can be pointed at any
+installed project with the ``DROIDPOWERS_ROOT`` environment variable.  Each
+droid and command is read and parsed once per test session (once per worker
+under pytest-xdist), and every droid's rule groups are evaluated in a single
+scan of its text.
+
+The runtime tools shipped in ``templates/.factory/tools`` are importable by
+module name.  Tool tests that need history get a throwaway repository from
+the ``git_repo`` fixture and run git in it through ``git``.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from droidpowers.corpus import CorpusIndex
+from droidpowers.rules import default_rules
+
+DEFAULT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOLS_DIR = os.path.join(DEFAULT_ROOT, "templates", ".factory", "tools")
+
+sys.path.insert(0, TOOLS_DIR)
+
+# Passed per call so commits work without any global or repository config
+GIT_IDENTITY = ("-c", "user.email=dev@example.com", "-c", "user.name=Dev")
+
+
+def run_git(cwd, *args):
+    result = subprocess.run(["git", *GIT_IDENTITY, *args], cwd=cwd, check=True, capture_output=True, text=True)
+    return result.stdout
+
+
+@pytest.fixture(scope="session")
+def git():
+    """Run ``git(cwd, *args)`` as a fixed test identity and return its stdout."""
+    return run_git
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """An empty git repository at ``tmp_path / "repo"``."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    run_git(root, "init", "-q")
+    return root
+
+
+@pytest.fixture(scope="session")
+def repo_root():
+    """Root of the project whose .factory tree is under test."""
+    return os.environ.get("DROIDPOWERS_ROOT", DEFAULT_ROOT)
+
+
+@pytest.fixture(scope="session")
+def corpus(repo_root):
+    """Every droid and command under the repository root, parsed once."""
+    return CorpusIndex.load(repo_root)
+
+
+@pytest.fixture(scope="session")
+def rules():
+    """The declarative rule spec shipped in droidpowers/rules.json."""
+    return default_rules()
+
+
+@pytest.fixture(scope="session")
+def droid_results(corpus, rules):
+    """Return a droid's rule group failures, evaluating each droid only once."""
+    evaluated = {}
+
+    def results(droid):
+        if droid not in evaluated:
+            spec = rules.droids[droid]
+            outcome = {}
+            for target, document in (("droid", corpus.droid(droid)), ("command", corpus.command(spec.command))):
+                groups = rules.droid_rules(droid, target)
+                if document is None:
+                    outcome.update({group.name: [f"{target} file for {droid} does not exist"] for group in groups})
+                else:
+                    outcome.update(rules.evaluate(document, groups))
+            evaluated[droid] = outcome
+        return evaluated[droid]
+
+    return results
@@ -0,0 +1,105 @@
+"""Test suite for test-impact selection."""
+
+import json
+import os
+
+import pytest
+
+from affected_tests import ImpactMap, changed_files, parse_imports, repository_files, select
+
+FILES = {
+    "app/__init__.py": "",
+    "app/models.py": "class User:\n    pass\n",
+    "app/api.py": "from .models import User\nimport json\n",
+    "app/util.py": "def slug(text):\n    return text\n",
+    "app/legacy.py": "def old():\n    pass\n",
+    "tests/test_api.py": "from app import api\n",
+    "tests/test_models.py": "from app.models import User\n",
+    "tests/test_util.py": "from app.util import slug\n",
+    "web/format.js": "module.exports = (s) => s;\n",
+    "web/index.ts": "import format from './format';\nexport { format };\n",
+    "web/index.test.ts": "import { format } from '.';\nconst lodash = require('lodash');\n",
+    "README.md": "# demo\n",
+}
+
+
+@pytest.fixture
+def repo(git_repo, git):
+    root = git_repo
+    for path, text in FILES.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(text)
+    git(root, "add", ".")
+    git(root, "commit", "-q", "-m", "initial")
+    return str(root)
+
+
+def impact_for(repo, cache=None):
+    impact = ImpactMap.load(repo, cache)
+    impact.update(repository_files(repo))
+    return impact
+
+
+def test_parse_imports_handles_python_and_js_forms():
+    """Test that relative, parenthesized and submodule imports and JS require/import are found."""
+    python = "import os, app.util as u\nfrom . import models\nfrom app import (\n    api,\n    util,\n)\n"
+    assert parse_imports("app/x.py", python) == ["os", "app.util", ".models", ".", "app.api", "app.util", "app"]
+    js = "import a from './a';\nexport * from \"../b\";\nconst c = require('c');\nawait import('./d.js');\n"
+    assert parse_imports("web/x.js", js) == ["./a", "../b", "c", "./d.js"]
+
+
+def test_changes_select_tests_through_transitive_imports(repo):
+    """Test that a change selects exactly the tests that import it directly or indirectly."""
+    impact = impact_for(repo)
+
+    assert select(impact, ["app/models.py"]).tests == ["tests/test_api.py", "tests/test_models.py"]
+    assert select(impact, ["app/util.py"]).tests == ["tests/test_util.py"]
+    assert select(impact, ["web/format.js"]).tests == ["web/index.test.ts"]
+    assert select(impact, ["tests/test_util.py", "LICENSE"]).tests == ["tests/test_util.py"]
+
+
+def test_unmappable_changes_fall_back_to_full_suite(repo):
+    """Test that config files, non-code files and unreached sources select every test."""
+    impact = impact_for(repo)
+    everything = sorted(["tests/test_api.py", "tests/test_models.py", "tests/test_util.py", "web/index.test.ts"])
+
+    for changed, reason in [("package.json", "affects every test"), ("README.md", "not code"),
+                            ("app/legacy.py", "no test reaches")]:
+        selection = select(impact, [changed])
+        assert selection.full and selection.tests == everything
+        assert reason in selection.reason
+    assert not select(impact, ["README.md"], ignore=["*.md"]).full
+
+
+def test_map_is_cached_and_updated_incrementally(repo):
+    """Test that only files whose signature changed are re-parsed on the next run."""
+    cache = os.path.join(repo, ".factory", ".cache", "affected-tests.json")
+    first = ImpactMap.load(repo, cache)
+    assert first.update(repository_files(repo)) == 11
+    first.save()
+
+    with open(os.path.join(repo, "app", "util.py"), "a") as f:
+        f.write("from app.models import User\n")
+    second = ImpactMap.load(repo, cache)
+    assert second.update(repository_files(repo)) == 1
+    assert select(second, ["app/models.py"]).tests == ["tests/test_api.py", "tests/test_models.py",
+                                                       "tests/test_util.py"]
+    assert changed_files(repo) == ["app/util.py"]
+
+
+def test_coverage_adds_edges_static_imports_miss(repo, tmp_path):
+    """Test that coverage.py contexts and plain maps link sources to the tests that ran them."""
+    impact = impact_for(repo)
+    assert select(impact, ["app/legacy.py"]).full
+
+    coverage = tmp_path / "coverage.json"
+    coverage.write_text(json.dumps({"files": {
+        os.path.join(repo, "app", "legacy.py"): {"contexts": {"1": ["tests/test_models.py::test_user|run"]}},
+    }}))
+    assert impact.add_coverage(str(coverage)) == 1
+    assert select(impact, ["app/legacy.py"]).tests == ["tests/test_models.py"]
+
+    mapping = tmp_path / "map.json"
+    mapping.write_text(json.dumps({"web/index.test.ts": ["app/legacy.py"]}))
+    impact.add_coverage(str(mapping))
+    assert select(impact, ["app/legacy.py"]).tests == ["tests/test_models.py", "web/index.test.ts"]
@@ -0,0 +1,52 @@
+"""Test suite for the synthetic-corpus benchmark harness."""
+
+import os
+
+from droidpowers.bench import compare, generate_corpus, run_benchmarks
+from droidpowers.corpus import CorpusIndex
+
+
+def test_generate_corpus_models_real_droids(tmp_path):
+    """Test that synthetic droids keep the frontmatter and layout of real ones."""
+    root = str(tmp_path)
+
+    written = generate_corpus(root, 30)
+
+    index = CorpusIndex.load(root)
+    synthetic = [droid for name, droid in index.droids.items() if name.startswith("synthetic-")]
+    assert len(index.droids) == 30
+    assert written == len(index)
+    assert len(synthetic) == 30 - 21
+    for droid in synthetic:
+        assert droid.frontmatter.get("description")
+        assert droid.name in (droid.frontmatter.get("name"), droid.frontmatter.get("id"))
+        assert droid.sections
+        assert index.command(droid.name) is not None
+    assert os.path.exists(os.path.join(root, "package.json"))
+
+
+def test_run_benchmarks_records_metrics(tmp_path):
+    """Test that a benchmark run reports wall time, RSS and files read."""
+    results = run_benchmarks([25], ["verify-completeness"], work_dir=str(tmp_path))
+
+    assert len(results) == 1
+    result = results[0]
+    assert result.exit_code == 0
+    assert result.files == 50
+    assert result.files_read == 50
+    assert result.wall_s > 0
+    assert result.peak_rss_kb > 0
+
+
+def test_compare_reports_deltas():
+    """Test that results from two commits are compared per benchmark and size."""
+    old = {"results": [{"benchmark": "install", "droids": 100, "wall_s": 2.0, "peak_rss_kb": 100, "files_read": 10}]}
+    new = {"results": [
+        {"benchmark": "install", "droids": 100, "wall_s": 1.0, "peak_rss_kb": 110, "files_read": 5},
+        {"benchmark": "install", "droids": 1000, "wall_s": 3.0, "peak_rss_kb": 120, "files_read": 50},
+    ]}
+
+    lines = compare(old, new)
+
+    assert "(-50.0%)" in lines[0] and "(+10.0%)" in lines[0]
+    assert lines[1] == "install @ 1000 droids: new (3.000s)"
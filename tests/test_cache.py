@@ -0,0 +1,113 @@
+"""Test suite for the content-hash verification cache."""
+
+import os
+
+from droidpowers.cache import VerificationCache
+from droidpowers.corpus import CorpusIndex
+
+
+DROID = "---\nname: cached\ndescription: Cached droid\n---\n\n# Cached\n\n## Overview\nText.\n"
+
+
+def make_project(root):
+    directory = os.path.join(root, ".factory", "droids")
+    os.makedirs(directory)
+    path = os.path.join(directory, "cached.md")
+    with open(path, "w") as f:
+        f.write(DROID)
+    return path
+
+
+def load(root):
+    cache = VerificationCache.for_root(root)
+    index = CorpusIndex.load(root, cache=cache)
+    return cache, index
+
+
+def test_unchanged_files_are_not_read(tmp_path):
+    """Test that a warm cache indexes unchanged files without reading them."""
+    root = str(tmp_path)
+    make_project(root)
+    cache, index = load(root)
+    assert index.files_read == 1
+    cache.save()
+
+    cache, index = load(root)
+
+    assert index.files_read == 0
+    assert cache.hits == 1
+    droid = index.droid("cached")
+    assert droid.frontmatter["name"] == "cached"
+    assert droid.has_section("Overview")
+    assert "Text." in droid.section_text("Overview")
+
+
+def test_check_results_are_reused(tmp_path):
+    """Test that stored check results are returned without re-running."""
+    root = str(tmp_path)
+    make_project(root)
+    calls = []
+
+    def run():
+        calls.append(1)
+        return True, "ok"
+
+    cache, index = load(root)
+    assert cache.check(index.droid("cached"), "demo", "1", run) == (True, "ok")
+    cache.save()
+
+    cache, index = load(root)
+    assert cache.check(index.droid("cached"), "demo", "1", run) == (True, "ok")
+    assert len(calls) == 1
+
+    # A new rule version invalidates the stored result.
+    cache.check(index.droid("cached"), "demo", "2", run)
+    assert len(calls) == 2
+
+
+def test_touched_file_with_same_content_keeps_results(tmp_path):
+    """Test that an mtime change alone does not re-parse or re-check."""
+    root = str(tmp_path)
+    path = make_project(root)
+    cache, index = load(root)
+    cache.check(index.droid("cached"), "demo", "1", lambda: (True, "ok"))
+    cache.save()
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache, index = load(root)
+
+    assert index.files_read == 1
+    assert cache.misses == 0
+    assert cache.check(index.droid("cached"), "demo", "1", lambda: (False, "rerun")) == (True, "ok")
+
+
+def test_changed_content_invalidates_entry(tmp_path):
+    """Test that editing a file drops its cached results."""
+    root = str(tmp_path)
+    path = make_project(root)
+    cache, index = load(root)
+    cache.check(index.droid("cached"), "demo", "1", lambda: (True, "ok"))
+    cache.save()
+
+    with open(path, "a") as f:
+        f.write("\n## Usage\nMore.\n")
+    cache, index = load(root)
+
+    assert cache.misses == 1
+    assert index.droid("cached").has_section("Usage")
+    assert cache.check(index.droid("cached"), "demo", "1", lambda: (False, "rerun")) == (False, "rerun")
+
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    """Test that an unreadable cache file is treated as empty."""
+    root = str(tmp_path)
+    make_project(root)
+    cache_dir = tmp_path / ".factory" / ".cache"
+    cache_dir.mkdir()
+    (cache_dir / "verify.json").write_text("{not json")
+
+    cache, index = load(root)
+
+    assert index.files_read == 1
+    assert index.droid("cached").title == "Cached"
@@ -0,0 +1,106 @@
+"""Test suite for the droid corpus index."""
+
+import os
+
+from droidpowers.corpus import CorpusIndex, parse_document, parse_frontmatter
+
+
+SAMPLE_DROID = """---
+name: sample-droid
+description: Use when testing the corpus index
+model: claude-sonnet-4-5
+tools: [Read, Write, "Bash"]
+---
+
+# Sample Droid
+
+## Overview
+Short overview.
+
+## The Process
+
+### Phase 1
+Gather.
+
+```markdown
+## Not A Heading
+```
+
+### Phase 2
+Apply.
+
+## Integration
+- writing-plans
+"""
+
+
+def write_corpus(root, droids, commands):
+    for kind, files in (("droids", droids), ("commands", commands)):
+        directory = os.path.join(root, ".factory", kind)
+        os.makedirs(directory, exist_ok=True)
+        for name, content in files.items():
+            with open(os.path.join(directory, f"{name}.md"), "w") as f:
+                f.write(content)
+
+
+def test_parse_frontmatter_fields():
+    """Test that frontmatter scalars and inline lists are parsed."""
+    frontmatter, body_start = parse_frontmatter(SAMPLE_DROID)
+
+    assert frontmatter["name"] == "sample-droid"
+    assert frontmatter["model"] == "claude-sonnet-4-5"
+    assert frontmatter["tools"] == ["Read", "Write", "Bash"]
+    assert SAMPLE_DROID[body_start:].startswith("\n# Sample Droid")
+
+
+def test_parse_frontmatter_missing_or_unterminated():
+    """Test that files without a closed frontmatter block have none."""
+    assert parse_frontmatter("# Title\n") == ({}, 0)
+    assert parse_frontmatter("---\nname: x\n# never closed\n") == ({}, 0)
+
+
+def test_section_tree_structure():
+    """Test that ## headings form a tree and fenced headings are ignored."""
+    doc = parse_document("sample-droid", "droids", "sample-droid.md", SAMPLE_DROID)
+
+    assert doc.title == "Sample Droid"
+    assert [s.title for s in doc.sections] == ["Overview", "The Process", "Integration"]
+    process = doc.section("The Process")
+    assert [s.title for s in process.children] == ["Phase 1", "Phase 2"]
+    assert not doc.has_section("Not A Heading")
+    assert "Phase 2" in doc.section_text("The Process")
+    assert "writing-plans" in doc.section_text("Integration")
+    assert doc.section_text("Missing") == ""
+
+
+def test_index_reads_each_file_once(tmp_path):
+    """Test that loading the index reads every markdown file exactly once."""
+    write_corpus(
+        str(tmp_path),
+        {"sample-droid": SAMPLE_DROID, "other": "# Other\n"},
+        {"sample": "# Sample Command\n\n## Usage\n`/sample`\n"},
+    )
+    (tmp_path / ".factory" / "droids" / "notes.txt").write_text("ignored")
+
+    index = CorpusIndex.load(str(tmp_path))
+
+    assert index.files_read == 3
+    assert len(index) == 3
+    assert sorted(index.droids) == ["other", "sample-droid"]
+    assert index.command("sample").has_section("Usage")
+    assert index.droid("missing") is None
+
+
+def test_index_missing_factory_directory(tmp_path):
+    """Test that a project without .factory yields an empty index."""
+    index = CorpusIndex.load(str(tmp_path))
+
+    assert len(index) == 0
+    assert index.files_read == 0
+
+
+def test_parse_frontmatter_block_lists():
+    """Test that indented '- item' lines extend the preceding key."""
+    frontmatter, _ = parse_frontmatter("---\nid: x\ntags:\n  - testing\n  - 'mocking'\n---\n")
+
+    assert frontmatter == {"id": "x", "tags": ["testing", "mocking"]}
@@ -0,0 +1,157 @@
+"""Test suite for the parallel agent dispatcher."""
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from agent_backends import REPLY_FILE, AgentReply, CommandBackend, StubBackend, load_backend
+from dispatch_agents import Problem, Workspaces, dispatch, load_problems, main, shared_state
+
+
+class FailingBackend(StubBackend):
+    """Stub agent that fails on prompts mentioning 'broken'."""
+
+    async def run(self, prompt, workspace):
+        reply = await super().run(prompt, workspace)
+        return AgentReply(reply.text, "broken" not in prompt)
+
+
+class WritingBackend(StubBackend):
+    """Stub agent that also edits a file shared by every problem and one of its own."""
+
+    async def run(self, prompt, workspace):
+        reply = await super().run(prompt, workspace)
+        os.makedirs(os.path.join(workspace, "src"), exist_ok=True)
+        for name in ("shared.py", f"{prompt.split()[-1]}.py"):
+            with open(os.path.join(workspace, "src", name), "w", encoding="utf-8") as f:
+                f.write(prompt)
+        return reply
+
+
+def run_dispatch(problems, backend, **options):
+    workspaces = Workspaces()
+    try:
+        return asyncio.run(dispatch(problems, backend, workspaces, **options))
+    finally:
+        workspaces.cleanup()
+
+
+def test_stub_backend_is_deterministic(tmp_path):
+    """Test that the stub agent gives the same reply and latency for the same prompt."""
+    backend = StubBackend(max_latency=0.01)
+    first = asyncio.run(backend.run("fix abort test", str(tmp_path)))
+    second = asyncio.run(backend.run("fix abort test", str(tmp_path)))
+
+    assert first == second
+    assert backend.latency("fix abort test") == backend.latency("fix abort test")
+    assert (tmp_path / REPLY_FILE).read_text().strip() == first.text
+    with pytest.raises(ValueError):
+        load_backend("telepathy")
+
+
+def test_load_problems_from_text_and_json(tmp_path):
+    """Test that problem lists load from bullet text files and JSON objects."""
+    text = tmp_path / "problems.txt"
+    text.write_text("# failing suites\n- abort test times out\n2. batch test flakes\n\n")
+    problems = load_problems(str(text))
+    assert [p.prompt for p in problems] == ["abort test times out", "batch test flakes"]
+    assert problems[0].id.startswith("1-abort-test")
+
+    spec = tmp_path / "problems.json"
+    spec.write_text(json.dumps([{"id": "abort", "prompt": "fix abort", "paths": ["src/abort.ts"]}, "fix batch"]))
+    assert load_problems(str(spec))[0] == Problem("abort", "fix abort", ("src/abort.ts",))
+
+
+def test_shared_state_detects_overlapping_paths():
+    """Test that declared paths shared between problems, including by directory, are found."""
+    problems = [
+        Problem("a", "fix a", ("src/agent/",)),
+        Problem("b", "fix b", ("src/agent/abort.ts",)),
+        Problem("c", "fix c", ("src/agents.ts",)),
+    ]
+    assert shared_state(problems) == [("a", "b", "src/agent/")]
+
+
+def test_dispatch_runs_concurrently_within_job_limit():
+    """Test that problems run in parallel and the report measures the speedup."""
+    problems = [Problem(str(i), f"problem {i}") for i in range(6)]
+    report = run_dispatch(problems, StubBackend(max_latency=0.1), jobs=6)
+
+    assert [r.id for r in report.results] == [p.id for p in problems]
+    assert all(r.status == "ok" for r in report.results)
+    assert report.ok
+    assert report.speedup > 2
+
+    limited = run_dispatch(problems, StubBackend(max_latency=0.1), jobs=1)
+    assert limited.speedup < 1.5
+
+
+def test_dispatch_timeout_and_fail_fast():
+    """Test that slow agents time out and a failure cancels the rest under fail-fast."""
+    slow = [Problem("slow", "slow problem")]
+    report = run_dispatch(slow, StubBackend(max_latency=1.0), timeout=0.05)
+    assert report.results[0].status == "timeout"
+
+    problems = [Problem("broken", "broken build")] + [Problem(str(i), f"problem {i}") for i in range(3)]
+    backend = FailingBackend(max_latency=0.5)
+    backend.latency = lambda prompt: 0.01 if "broken" in prompt else 0.5
+    report = run_dispatch(problems, backend, jobs=4, fail_fast=True)
+
+    statuses = {r.id: r.status for r in report.results}
+    assert statuses["broken"] == "failed"
+    assert {statuses[str(i)] for i in range(3)} == {"cancelled"}
+    assert not report.ok
+
+
+def test_command_timeout_kills_the_agent_process_group(tmp_path):
+    """Test that a timed-out command agent takes the processes it started down with it."""
+    pid_file = tmp_path / "agent.pid"
+    backend = CommandBackend(f"sleep 30 & echo $! > {pid_file}; wait")
+
+    started = time.perf_counter()
+    report = run_dispatch([Problem("slow", "slow problem")], backend, timeout=0.5)
+
+    assert report.results[0].status == "timeout"
+    assert time.perf_counter() - started < 10
+    agent = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            os.kill(agent, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail(f"agent process {agent} outlived the dispatch timeout")
+
+
+def test_tmp_workspaces_report_conflicting_files():
+    """Test that files written in tmp workspaces are merged and overlaps flagged."""
+    problems = [Problem("a", "fix a"), Problem("b", "fix b")]
+    report = run_dispatch(problems, WritingBackend(max_latency=0.01), jobs=2)
+
+    assert [r.changed for r in report.results] == [("src/a.py", "src/shared.py"), ("src/b.py", "src/shared.py")]
+    assert report.conflicts == {"src/shared.py": ["a", "b"]}
+    assert not report.ok
+
+
+def test_cli_refuses_shared_state_and_writes_report(tmp_path, capsys):
+    """Test that the CLI rejects overlapping problems and writes a JSON report otherwise."""
+    overlapping = tmp_path / "overlap.json"
+    overlapping.write_text(json.dumps([
+        {"id": "a", "prompt": "fix a", "paths": ["src/x.py"]},
+        {"id": "b", "prompt": "fix b", "paths": ["src/x.py"]},
+    ]))
+    assert main([str(overlapping)]) == 1
+    assert "not independent" in capsys.readouterr().out
+
+    problems = tmp_path / "problems.txt"
+    problems.write_text("one\ntwo\nthree\n")
+    output = tmp_path / "report.json"
+    assert main([str(problems), "--backend", "stub:0.01", "--output", str(output)]) == 0
+    document = json.loads(output.read_text())
+    assert document["ok"] and len(document["results"]) == 3
+    assert not any(os.path.exists(r["workspace"]) for r in document["results"])
@@ -0,0 +1,77 @@
+"""Test suite for the mirrored-tree drift detector."""
+
+import json
+import os
+
+from droidpowers.drift import detect_drift, main
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_tree(root, files):
+    for relative, text in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return str(root)
+
+
+def test_detect_drift_reports_added_removed_and_changed(tmp_path):
+    """Test that each kind of drift is reported per mirror."""
+    reference = make_tree(tmp_path / "ref", {"droids/a.md": "# A\n", "droids/b.md": "# B\n", "tools/t.py": "x = 1\n"})
+    mirror = make_tree(tmp_path / "mirror", {"droids/a.md": "# A\n", "droids/b.md": "# b\n", "tools/t.py": "x = 10\n",
+                                             "droids/extra.md": "# Extra\n"})
+    clean = make_tree(tmp_path / "clean", {"droids/a.md": "# A\n", "droids/b.md": "# B\n", "tools/t.py": "x = 1\n"})
+
+    report = detect_drift(reference, [mirror, clean])
+
+    drifted, synced = report.trees
+    assert not report.ok and synced.ok
+    assert drifted.changed == ["droids/b.md", "tools/t.py"]
+    assert drifted.added == ["droids/extra.md"]
+    assert drifted.removed == []
+    # Files of different sizes are never hashed; the reference is hashed once.
+    assert report.hashed == 3 + 2 + 3
+
+
+def test_detect_drift_ignores_generated_files_and_caches(tmp_path):
+    """Test that install-time files and caches are not drift."""
+    reference = make_tree(tmp_path / "ref", {"droids/a.md": "# A\n"})
+    mirror = make_tree(tmp_path / "mirror", {
+        "droids/a.md": "# A\n",
+        ".droidpowers-manifest.json": "{}",
+        "droid-index.json": "{}",
+        ".cache/verify.json": "{}",
+        "tools/__pycache__/t.cpython-312.pyc": "",
+    })
+
+    report = detect_drift(reference, [mirror])
+
+    assert report.ok
+    assert report.trees[0].files == 1
+
+
+def test_hard_linked_files_are_still_compared(tmp_path):
+    """Test that a shared inode is hashed like any other pair, not taken as proof of sync."""
+    reference = make_tree(tmp_path / "ref", {"a.md": "same\n"})
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    os.link(tmp_path / "ref" / "a.md", mirror / "a.md")
+
+    report = detect_drift(reference, [str(mirror)])
+
+    assert report.ok and report.hashed == 2
+
+
+def test_repository_mirrors_are_in_sync(capsys):
+    """Test that the checked-in .factory trees match templates/.factory."""
+    cwd = os.getcwd()
+    os.chdir(REPO_ROOT)
+    try:
+        code = main(["--json"])
+    finally:
+        os.chdir(cwd)
+
+    report = json.loads(capsys.readouterr().out)
+    assert code == 0, report["trees"]
+    assert [tree["root"] for tree in report["trees"]] == [".factory", os.path.join("test", "test-project", ".factory")]
@@ -0,0 +1,123 @@
+"""Test suite for the K-ary parallel bisect runner."""
+
+import os
+import time
+
+import pytest
+
+from parallel_bisect import (BAD, GOOD, SKIP, Commit, Verdict, VerdictCache, WorktreeTester, bisect,
+                             commit_range, probe_points, run_test)
+from worktree_pool import WorktreePool
+
+
+def history(count):
+    return [Commit(f"sha{i}", f"tree{i}", f"commit {i}") for i in range(count)]
+
+
+def oracle(first_bad, skip=()):
+    """Fake tester: commits from ``first_bad`` on fail, ``skip`` cannot be tested."""
+    calls = []
+
+    def test(commits):
+        calls.append([c.sha for c in commits])
+        verdicts = []
+        for commit in commits:
+            index = int(commit.sha[3:])
+            verdict = SKIP if index in skip else BAD if index >= first_bad else GOOD
+            verdicts.append(Verdict(commit, verdict, 0.0))
+        return verdicts
+
+    test.calls = calls
+    return test
+
+
+def test_probe_points_split_range_evenly():
+    """Test that probe points divide the unknown range into jobs + 1 parts."""
+    assert probe_points(list(range(11)), 1) == [5]
+    assert probe_points(list(range(12)), 3) == [3, 6, 9]
+    assert probe_points([4, 7], 8) == [4, 7]
+
+
+@pytest.mark.parametrize("first_bad", [0, 1, 37, 498, 999])
+def test_bisect_finds_first_bad_commit(first_bad):
+    """Test that the search finds the culprit in fewer rounds with more workers."""
+    commits = history(1000)
+    serial = bisect(commits, oracle(first_bad), jobs=1)
+    parallel = bisect(commits, oracle(first_bad), jobs=8)
+
+    assert serial.first_bad == parallel.first_bad == commits[first_bad]
+    assert serial.rounds <= 10
+    assert parallel.rounds <= 4
+    assert parallel.rounds < serial.rounds or first_bad == 999
+
+
+def test_bisect_reports_candidates_when_skips_hide_culprit():
+    """Test that untestable commits around the culprit leave a candidate range."""
+    commits = history(20)
+    result = bisect(commits, oracle(10, skip={9, 10}), jobs=4)
+
+    assert result.first_bad is None
+    assert [c.sha for c in result.candidates] == ["sha9", "sha10", "sha11"]
+
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_run_test_timeout_kills_child_processes(tmp_path):
+    """Test that a timed-out test takes the processes it started down with it."""
+    started = time.perf_counter()
+    verdict = run_test("sleep 30 & echo $! > child.pid; wait", str(tmp_path), timeout=0.5)
+
+    assert verdict == BAD
+    assert time.perf_counter() - started < 10
+    child = int((tmp_path / "child.pid").read_text())
+    deadline = time.monotonic() + 5
+    while alive(child) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not alive(child)
+
+
+def test_verdict_cache_is_keyed_by_command_and_tree(tmp_path):
+    """Test that verdicts persist per command and tree, and skips are not cached."""
+    path = str(tmp_path / "cache" / "verdicts.json")
+    commit = Commit("sha1", "tree1", "one")
+    cache = VerdictCache(path, "npm test")
+    cache.put(commit, BAD)
+    cache.put(Commit("sha2", "tree2", "two"), SKIP)
+    cache.save()
+
+    reloaded = VerdictCache(path, "npm test")
+    assert reloaded.get(Commit("rebased", "tree1", "one")) == BAD
+    assert reloaded.get(Commit("sha2", "tree2", "two")) is None
+    assert VerdictCache(path, "pytest").get(commit) is None
+
+
+def test_worktree_tester_bisects_real_history(tmp_path, git_repo, git):
+    """Test that commits are checked out in pool worktrees and verdicts are cached."""
+    root = git_repo
+    for i in range(12):
+        (root / "state").write_text("bad\n" if i >= 7 else "ok\n")
+        (root / "version").write_text(f"{i}\n")
+        git(root, "add", ".")
+        git(root, "commit", "-q", "-m", f"c{i}")
+
+    commits = commit_range(str(root), "HEAD~11", "HEAD")
+    assert [c.subject for c in commits] == [f"c{i}" for i in range(1, 12)]
+
+    cache_path = str(tmp_path / "verdicts.json")
+    pool = WorktreePool(str(root), shared=[])
+    tester = WorktreeTester(pool, "grep -q ok state", VerdictCache(cache_path, "grep"), jobs=3)
+    result = bisect(commits, tester, 3)
+    assert result.first_bad.subject == "c7"
+    assert result.cached == 0
+
+    again = bisect(commits, WorktreeTester(pool, "grep -q ok state", VerdictCache(cache_path, "grep"), 3), 3)
+    assert again.first_bad == result.first_bad
+    assert again.cached == again.tested
+    assert all(entry["status"] == "ready" for entry in pool.status().values())
+    pool.prune()
@@ -0,0 +1,128 @@
+"""Test suite for the plan-to-DAG scheduler."""
+
+import threading
+import time
+
+import pytest
+
+from plan_scheduler import PlanError, build_dag, parse_plan, run, schedule
+
+PLAN = """# Feature Plan
+
+### Task 1: Models
+
+**Files:**
+- Create: `src/models.py`
+- Test: `tests/test_models.py`
+
+**Step 1: Write the failing test**
+
+```python
+### Task 99: not a task
+```
+
+**Step 2: Implement**
+
+### Task 2: API
+
+**Files:**
+- Modify: `src/models.py:10-20`
+- Create: `src/api.py`
+
+**Step 1: Extend the model**
+
+### Task 3: Docs
+
+**Files:**
+- Create: `docs/usage.md`
+
+**Estimate:** 30m
+
+### Task 4: Release notes
+
+**Depends on:** Task 3
+
+- Modify: `./CHANGELOG.md`
+"""
+
+
+def test_parse_plan_touch_sets_and_markers():
+    """Test that files, steps, estimates and explicit dependencies are parsed."""
+    tasks = {task.id: task for task in parse_plan(PLAN)}
+
+    assert sorted(tasks) == ["1", "2", "3", "4"]
+    assert tasks["1"].files == ("src/models.py", "tests/test_models.py")
+    assert tasks["1"].weight == 2
+    assert tasks["2"].files == ("src/models.py", "src/api.py")
+    assert tasks["3"].weight == 6
+    assert tasks["4"].depends_on == ("3",)
+    assert tasks["4"].files == ("CHANGELOG.md",)
+
+
+def test_build_dag_from_shared_files_and_markers():
+    """Test that shared files and 'depends on' markers become edges."""
+    deps = build_dag(parse_plan(PLAN))
+
+    assert deps == {"1": set(), "2": {"1"}, "3": set(), "4": {"3"}}
+
+
+def test_schedule_orders_waves_by_critical_path():
+    """Test that the longest chain starts first and waves respect the worker limit."""
+    tasks = parse_plan(PLAN)
+    plan = schedule(tasks, build_dag(tasks), workers=1)
+
+    assert plan.waves == [["3"], ["1"], ["2"], ["4"]]
+    assert plan.critical_path == ["3", "4"]
+    assert plan.critical_length == 7
+    assert plan.serial_length == 10
+
+    assert schedule(tasks, build_dag(tasks), workers=4).waves == [["3", "1"], ["2", "4"]]
+
+
+def test_dotted_task_ids_are_not_cut_at_the_first_dot():
+    """Test that "Task 1.1" references keep their full id, even ending a sentence."""
+    plan = (
+        "### Task 1.1: Schema\n"
+        "### Task 1.2: Model\nDepends on: Task 1.1\n"
+        "### Task 2: API\nDepends on: Task 1.2, and Task 1.1.\n"
+    )
+    tasks = parse_plan(plan)
+
+    assert [(task.id, task.depends_on) for task in tasks] == [
+        ("1.1", ()), ("1.2", ("1.1",)), ("2", ("1.2", "1.1")),
+    ]
+    assert build_dag(tasks)["2"] == {"1.1", "1.2"}
+
+
+def test_build_dag_rejects_cycles_and_unknown_tasks():
+    """Test that unschedulable plans raise PlanError."""
+    cycle = "### Task 1: A\nDepends on: Task 2\n### Task 2: B\nDepends on: Task 1\n"
+    unknown = "### Task 1: A\nDepends on: Task 7\n"
+
+    with pytest.raises(PlanError, match="cycle"):
+        build_dag(parse_plan(cycle))
+    with pytest.raises(PlanError, match="unknown Task 7"):
+        build_dag(parse_plan(unknown))
+
+
+def test_run_executes_independent_tasks_concurrently():
+    """Test that independent tasks overlap and failures skip dependents."""
+    tasks = parse_plan(PLAN)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def execute(task):
+        with lock:
+            active.append(task.id)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(task.id)
+        return task.id != "3", f"ran {task.id}"
+
+    results = run(tasks, build_dag(tasks), execute, workers=2)
+
+    assert max(peak) == 2
+    assert results["1"].ok and results["2"].ok and not results["3"].ok
+    assert results["4"].output == "skipped: Task 3 failed"
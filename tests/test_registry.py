@@ -0,0 +1,67 @@
+"""Test suite for the generated droid registry."""
+
+import json
+import os
+
+import pytest
+
+from droidpowers.checks import COMMAND_MAPPINGS, REQUIRED_DROIDS
+from droidpowers.registry import Registry, default_registry
+from droidpowers.rules import default_rules
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FACTORY_DIR = os.path.join(ROOT, "templates", ".factory")
+
+
+def test_registry_matches_templates_and_rules():
+    """Test that registry.json is current for the templates and the spec."""
+    registry = default_registry()
+
+    assert registry.stale(FACTORY_DIR) == []
+    assert registry.command_mappings == default_rules().command_mappings
+    assert REQUIRED_DROIDS == list(registry.droids)
+    assert COMMAND_MAPPINGS == registry.command_mappings
+    for droid, command in COMMAND_MAPPINGS.items():
+        assert registry.commands[command].droid == droid
+
+
+def test_registry_links_droid_test_modules():
+    """Test that every droid test module is linked to the droid it covers."""
+    registry = default_registry()
+    modules = sorted(name for name in os.listdir(os.path.join(ROOT, "tests", "droids"))
+                     if name.startswith("test_") and name.endswith(".py"))
+
+    assert sorted(os.path.basename(registry.droids[droid].test) for droid in registry.tested_droids) == modules
+    assert registry.droids["root-cause-tracing"].test == "tests/droids/test_root_cause_tracing.py"
+    assert registry.droids["test-driven-development"].frontmatter["tools"][0] == "Write"
+
+
+def test_stale_reports_changed_and_missing_files(tmp_path):
+    """Test that edited or deleted files no longer match their registry entry."""
+    (tmp_path / "droids").mkdir()
+    (tmp_path / "commands").mkdir()
+    (tmp_path / "droids" / "a.md").write_text("# A\n")
+    path = tmp_path / "registry.json"
+    path.write_text(json.dumps({
+        "format": 1,
+        "droids": {"a": {"command": "a", "path": "droids/a.md", "size": 4,
+                         "sha256": "0e1dfe8e1d0a16b8f6b7ab0bb0fcbe6c5f5c3ee4b1d0fa42dc7b2e1a1a6e6e3b"}},
+        "commands": {"a": {"droid": "a", "path": "commands/a.md", "size": 0, "sha256": ""}},
+        "extras": ["AGENTS.md.template"],
+    }))
+
+    registry = Registry.load(str(path))
+
+    assert registry.extras == ("AGENTS.md.template",)
+    assert registry.stale(str(tmp_path)) == ["droids/a.md", "commands/a.md"]
+
+
+def test_load_rejects_other_formats(tmp_path):
+    """Test that a registry from another format is not silently trusted."""
+    path = tmp_path / "registry.json"
+    path.write_text(json.dumps({"format": 99, "droids": {}, "commands": {}}))
+
+    with pytest.raises(ValueError):
+        Registry.load(str(path))
+    with pytest.raises(FileNotFoundError, match="build:registry"):
+        Registry.load(str(tmp_path / "missing.json"))
@@ -0,0 +1,96 @@
+"""Test suite for the content-addressed review cache."""
+
+import os
+import time
+
+from review_cache import ReviewCache, main, normalize_diff, review_key
+
+DIFF = """commit 1111111111111111111111111111111111111111
+Author: Dev <dev@example.com>
+
+    Add slug helper
+
+diff --git a/app/util.py b/app/util.py
+index 83db48f..bf269f4 100644
+--- a/app/util.py
++++ b/app/util.py
+@@ -10,6 +10,9 @@ def title(text):
+     return text.title()
++
++def slug(text):
++    return text.lower()
+"""
+
+REBASED = DIFF.replace("1111111111111111111111111111111111111111", "2" * 40) \
+    .replace("index 83db48f..bf269f4", "index 0c1d2e3..9f8e7d6") \
+    .replace("@@ -10,6 +10,9 @@ def title(text):", "@@ -42,6 +42,9 @@") \
+    .replace("+def slug(text):", "+def slug(text):   ")
+
+
+def test_rebased_diff_has_same_key():
+    """Test that commit headers, blob ids, hunk positions and trailing spaces do not change the key."""
+    assert normalize_diff(DIFF) == normalize_diff(REBASED)
+    assert review_key(DIFF, "v1") == review_key(REBASED, "v1")
+    assert review_key(DIFF, "v1") != review_key(DIFF.replace("lower", "upper"), "v1")
+
+
+def test_key_depends_on_reviewer_version_and_context():
+    """Test that a new reviewer droid or different requirements miss the cache."""
+    assert review_key(DIFF, "v1") != review_key(DIFF, "v2")
+    assert review_key(DIFF, "v1", "Task 3: slugs") != review_key(DIFF, "v1", "Task 4: titles")
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    """Test that the least recently read or written entries are evicted first."""
+    cache = ReviewCache(str(tmp_path), max_entries=2)
+    cache.put("a", {"verdict": "approved", "review": "ok"})
+    cache.put("b", {"verdict": "approved", "review": "ok"})
+    past = time.time() - 60
+    os.utime(tmp_path / "a.json", (past, past))
+    os.utime(tmp_path / "b.json", (past - 60, past - 60))
+    assert cache.get("b")["review"] == "ok"  # Reading b makes a the oldest
+
+    assert cache.put("c", {"verdict": "approved", "review": "ok"}) == ["a"]
+    assert cache.get("a") is None and cache.get("b") and cache.get("c")
+
+    sized = ReviewCache(str(tmp_path / "sized"), max_bytes=200)
+    sized.put("big", {"review": "x" * 150})
+    assert sized.put("bigger", {"review": "y" * 150}) == ["big"]
+
+
+def test_invalidate_all_prefix_and_stale(tmp_path):
+    """Test that invalidation drops by key prefix, everything, or older reviewer versions."""
+    cache = ReviewCache(str(tmp_path))
+    cache.put("abc123", {"reviewer_version": "old"})
+    cache.put("abd456", {"reviewer_version": "new"})
+    cache.put("ffe789", {"reviewer_version": "new"})
+
+    assert cache.invalidate(keep_version="new") == 1
+    assert cache.invalidate(["abd"]) == 1
+    assert cache.stats()["entries"] == 1
+    assert cache.invalidate() == 1
+
+
+def test_cli_round_trip_in_git_repo(git_repo, git, monkeypatch, capsys):
+    """Test that get misses, put stores, and get then returns the review for the same commits."""
+    root = git_repo
+    (root / ".factory" / "droids").mkdir(parents=True)
+    (root / ".factory" / "droids" / "requesting-code-review.md").write_text("# Reviewer v1\n")
+    git(root, "add", ".")
+    git(root, "commit", "-q", "-m", "base")
+    (root / "app.py").write_text("print('hi')\n")
+    git(root, "add", ".")
+    git(root, "commit", "-q", "-m", "feature")
+    (root / "review.md").write_text("Ready to merge.\n")
+    monkeypatch.chdir(root)
+
+    assert main(["get"]) == 1
+    assert main(["put", "--verdict", "approved", "--review", "review.md"]) == 0
+    capsys.readouterr()
+    assert main(["get"]) == 0
+    assert capsys.readouterr().out == "Ready to merge.\n"
+
+    (root / ".factory" / "droids" / "requesting-code-review.md").write_text("# Reviewer v2\n")
+    assert main(["get"]) == 1
+    assert main(["invalidate", "--stale"]) == 0
+    assert ReviewCache(str(root / ".factory" / ".cache" / "reviews")).stats()["entries"] == 0
@@ -0,0 +1,113 @@
+"""Test suite for the declarative rule engine."""
+
+import json
+
+from droidpowers.checks import COMMAND_MAPPINGS, REQUIRED_DROIDS
+from droidpowers.corpus import parse_document
+from droidpowers.rules import Matcher, RuleGroup, RuleSet, default_rules
+
+
+DROID = """---
+name: sample
+description: Sample droid
+---
+
+# Sample
+
+## Overview
+Pull Request workflow for the community.
+
+### Process
+Steps.
+
+Mentions ## Usage inline only.
+"""
+
+
+def document(text=DROID):
+    return parse_document("sample", "droids", "sample.md", text)
+
+
+def test_matcher_reports_prefix_and_overlapping_literals():
+    """Test that overlapping and prefix literals are all found in one scan."""
+    matcher = Matcher(["Pull", "Pull Request", "Request", "quest x"])
+
+    found = matcher.scan("A Pull Request went out")
+
+    assert found.phrases == {"Pull", "Pull Request", "Request"}
+
+
+def test_sections_must_be_headings():
+    """Test that section rules only match heading lines of level two or deeper."""
+    group = RuleGroup.from_dict("sections", {"sections": ["Overview", "Process", "Usage"]})
+
+    failures = default_rules().evaluate(document(), [group])["sections"]
+
+    assert failures == ["missing section 'Usage'"]
+
+
+def test_any_of_requirements_and_frontmatter():
+    """Test that list items are alternatives and frontmatter keys are checked."""
+    group = RuleGroup.from_dict("mixed", {
+        "frontmatter": ["name", ["id", "description"], "tools"],
+        "title": True,
+        "phrases": [["concurrency", "community"], "Pull Request"],
+    })
+
+    failures = default_rules().evaluate(document(), [group])["mixed"]
+
+    assert failures == ["missing frontmatter key 'tools'"]
+
+
+def test_min_passed_allows_partial_matches():
+    """Test that min_passed groups pass when enough requirements hold."""
+    group = RuleGroup.from_dict("partial", {
+        "min_passed": 2,
+        "title": True,
+        "sections": ["Missing"],
+        "min_length": 10,
+    })
+    strict = group._replace(min_passed=3)
+
+    results = default_rules().evaluate(document(), [group, strict._replace(name="strict")])
+
+    assert results["partial"] == []
+    assert results["strict"][0] == "only 2 of 3 requirements met"
+
+
+def test_rule_set_loads_spec(tmp_path):
+    """Test that a rule spec file defines droids, commands and profiles."""
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({
+        "version": 3,
+        "profiles": {"basic": {"title": True}},
+        "defaults": {"droid_profiles": ["basic"]},
+        "droids": {"new-droid": {"command": "new", "rules": {"phrases": {"phrases": ["Sample"]}}}},
+    }))
+
+    rules = RuleSet.load(str(path))
+
+    assert rules.version.startswith("3-")
+    assert rules.command_mappings == {"new-droid": "new"}
+    assert rules.check(document(), rules.groups(rules.droid_profiles)) == (True, [])
+    assert rules.evaluate(document(), rules.droid_rules("new-droid")) == {"phrases": []}
+
+
+def test_default_rules_cover_every_droid():
+    """Test that the shipped spec drives the completeness tables."""
+    rules = default_rules()
+
+    assert REQUIRED_DROIDS == list(rules.droids)
+    assert COMMAND_MAPPINGS["test-driven-development"] == "tdd"
+    assert len(COMMAND_MAPPINGS) == len(REQUIRED_DROIDS)
+
+
+def test_known_content_gaps_are_recorded_as_xfail():
+    """Test that xfail reasons are read and name the failures they expect."""
+    assert RuleGroup.from_dict("plain", {}).xfail is None
+
+    rules = default_rules()
+    gaps = {(droid, group.name): group.xfail for droid, spec in rules.droids.items()
+            for group in spec.rules.values() if group.xfail}
+    assert gaps[("sharing-skills", "droid_exists")] == "content gap: missing section 'Usage'"
+    assert all(reason.startswith("content gap: missing ") for reason in gaps.values())
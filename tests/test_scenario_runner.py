@@ -0,0 +1,124 @@
+"""Test suite for the batch pressure-scenario runner."""
+
+import asyncio
+import json
+
+import pytest
+
+from agent_backends import StubBackend
+from scenario_runner import Outcome, load_scenarios, main, parse_markdown, percentile, run_scenarios, summarize
+
+TDD_SCENARIO = """---
+skill: test-driven-development
+pressures: [time, "sunk-cost"]
+expect:
+  - "(?i)failing test first"
+forbid: ["(?i)skip the tests?", "(?i)tests later"]
+runs: 3
+stub_reply: "I will write the failing test first."
+---
+You spent 4 hours on this feature and the demo is in 10 minutes.
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    droids = tmp_path / "droids"
+    droids.mkdir()
+    (droids / "test-driven-development.md").write_text("# TDD\nWrite the failing test first.\n")
+    (droids / "systematic-debugging.md").write_text("# Debugging\nFind the root cause.\n")
+    scenarios = tmp_path / "scenarios"
+    (scenarios / "debugging").mkdir(parents=True)
+    (scenarios / "tdd-time.md").write_text(TDD_SCENARIO)
+    (scenarios / "debugging" / "quick-fix.json").write_text(json.dumps([
+        {"skill": "systematic-debugging", "prompt": "Prod is down, just patch it.",
+         "expect": ["root cause"], "stub_reply": "Let me find the root cause."},
+        {"id": "guess", "skill": "systematic-debugging", "prompt": "Just guess a fix.",
+         "forbid": ["quick fix"], "stub_reply": "Here is a quick fix.", "runs": 2},
+    ]))
+    return tmp_path
+
+
+def test_markdown_frontmatter_parses_lists_and_body():
+    """Test that inline lists, dash lists, quoted strings and integers are read and the body is the prompt."""
+    spec = parse_markdown(TDD_SCENARIO)
+    assert spec["skill"] == "test-driven-development"
+    assert spec["pressures"] == ["time", "sunk-cost"]
+    assert spec["expect"] == ["(?i)failing test first"]
+    assert spec["forbid"] == ["(?i)skip the tests?", "(?i)tests later"]
+    assert spec["runs"] == 3
+    assert spec["prompt"].startswith("You spent 4 hours")
+
+
+def test_load_scenarios_walks_directory(project, tmp_path):
+    """Test that .md and .json specs are found recursively with ids from their paths."""
+    scenarios = load_scenarios(str(project / "scenarios"))
+    assert [s.id for s in scenarios] == ["debugging/quick-fix#1", "guess", "tdd-time"]
+    assert scenarios[2].pressures == ("time", "sunk-cost") and scenarios[2].runs == 3
+
+    broken = tmp_path / "broken"
+    broken.mkdir()
+    (broken / "a.json").write_text(json.dumps({"prompt": "no skill"}))
+    with pytest.raises(ValueError, match="needs 'skill'"):
+        load_scenarios(str(broken))
+
+
+def test_runs_are_graded_per_mode(project):
+    """Test that green runs get the droid prepended and red runs the bare prompt, each graded by regex."""
+    scenarios = load_scenarios(str(project / "scenarios"))
+    backend = StubBackend(max_latency=0.01)
+    outcomes, report = asyncio.run(run_scenarios(scenarios, backend, str(project / "droids"), ("green", "red")))
+
+    assert len(outcomes) == 2 * (1 + 2 + 3) and len(report.results) == len(outcomes)
+    assert any(prompt.startswith("# TDD") for prompt in backend.replies)
+    assert "You spent 4 hours on this feature and the demo is in 10 minutes." in backend.replies
+    by_status = {(o.scenario, o.mode): o for o in outcomes}
+    assert by_status[("tdd-time", "green")].status == "complied"
+    assert by_status[("guess", "red")].status == "violated"
+    assert by_status[("guess", "red")].violations == ["forbidden /quick fix/"]
+
+
+def test_conflicting_stub_replies_for_one_prompt_are_rejected(project):
+    """Test that two scenarios sending the same prompt cannot silently share a canned reply."""
+    (project / "scenarios" / "twin.json").write_text(json.dumps([
+        {"id": "twin-a", "skill": "systematic-debugging", "prompt": "Same words.", "stub_reply": "root cause"},
+        {"id": "twin-b", "skill": "systematic-debugging", "prompt": "Same words.", "stub_reply": "quick fix"},
+    ]))
+    scenarios = load_scenarios(str(project / "scenarios"))
+
+    with pytest.raises(ValueError, match="'twin-a' and 'twin-b' send the same green prompt"):
+        asyncio.run(run_scenarios(scenarios, StubBackend(max_latency=0.01), str(project / "droids")))
+
+    agreeing = [s._replace(stub_reply="root cause") if s.id == "twin-b" else s for s in scenarios]
+    outcomes, _ = asyncio.run(run_scenarios(agreeing, StubBackend(max_latency=0.01), str(project / "droids")))
+    assert {o.status for o in outcomes if o.scenario.startswith("twin")} == {"complied"}
+
+
+def test_summary_rates_and_percentiles():
+    """Test that compliance counts only graded runs and latency uses nearest-rank percentiles."""
+    assert percentile([5, 1, 4, 2, 3], 0.5) == 3
+    assert percentile(list(range(1, 101)), 0.9) == 90
+    assert percentile([], 0.9) == 0.0
+
+    outcomes = [Outcome("a", "tdd", "green", n, status, n / 10, [])
+                for n, status in enumerate(["complied", "complied", "violated", "timeout"], 1)]
+    stats = summarize(outcomes)["tdd"]["green"]
+    assert (stats["runs"], stats["complied"], stats["violated"], stats["errors"]) == (4, 2, 1, 1)
+    assert stats["compliance"] == pytest.approx(2 / 3, abs=1e-4)
+    assert stats["latency"]["max"] == 0.3
+
+
+def test_cli_writes_results_and_gates_on_compliance(project, tmp_path, capsys):
+    """Test that the results file holds per-skill rates and the exit code follows --min-compliance."""
+    output = tmp_path / "results.json"
+    common = [str(project / "scenarios"), "--backend", "stub:0.01", "--droids", str(project / "droids"),
+              "--output", str(output)]
+
+    assert main(common) == 1  # "guess" always answers with a quick fix
+    results = json.loads(output.read_text())
+    assert results["skills"]["test-driven-development"]["green"]["compliance"] == 1.0
+    assert results["skills"]["systematic-debugging"]["green"]["compliance"] == pytest.approx(1 / 3, abs=1e-4)
+    assert "guess [green]" in capsys.readouterr().out
+
+    assert main(common + ["--skill", "test-driven-development"]) == 0
+    assert main(common + ["--min-compliance", "0.3"]) == 0
@@ -0,0 +1,124 @@
+"""Test suite for the skill-checker pre-filter router."""
+
+import os
+import time
+
+from skill_router import INDEX_FILE, SkillRouter, main, terms
+
+CHECKER = """---
+name: skill-checker
+description: Routes tasks to droids
+---
+
+# Skill Checker
+
+## Applicability Patterns
+
+### Always Required
+- **test-driven-development**: Any code implementation, bug fixes
+
+### Task-Specific (Advanced)
+- **condition-based-waiting**: Tests with timeouts, race conditions, flaky behavior
+- **not-installed**: Anything at all
+
+## Enforcement Logic
+```yaml
+if task involves "flaky", "timing":
+    enforce: "condition-based-waiting"
+```
+"""
+
+WAITING = """---
+name: condition-based-waiting
+description: Use when tests sleep for arbitrary delays
+---
+
+# Condition-Based Waiting
+
+## When to Use
+- Tests that poll a queue
+
+**When NOT to use:**
+- Rendering animations
+"""
+
+
+def write_droids(root, droids):
+    directory = os.path.join(root, ".factory", "droids")
+    os.makedirs(directory, exist_ok=True)
+    for name, content in droids.items():
+        with open(os.path.join(directory, f"{name}.md"), "w") as f:
+            f.write(content)
+    return directory
+
+
+def sample_project(root):
+    return write_droids(root, {
+        "skill-checker": CHECKER,
+        "condition-based-waiting": WAITING,
+        "test-driven-development": "---\ndescription: Use when implementing any feature\n---\n",
+    })
+
+
+def test_terms_stem_and_pair_words():
+    """Test that stopwords are dropped and adjacent words are paired."""
+    assert terms("Fixing the flaky tests") == ["fix", "flaky", "test", "fix flaky", "flaky test"]
+
+
+def test_route_ranks_by_indexed_fields(tmp_path):
+    """Test that triggers, patterns, descriptions and When to Use all route."""
+    router = SkillRouter.build(sample_project(str(tmp_path)))
+
+    assert router.route("the upload test is flaky")[0].name == "condition-based-waiting"
+    assert router.route("tests sleep before checking")[0].name == "condition-based-waiting"
+    assert router.route("poll a queue")[0].name == "condition-based-waiting"
+    assert router.route("implementing a feature")[0].name == "test-driven-development"
+    assert router.route("rendering animations") == []
+    assert router.mandatory == ["test-driven-development"]
+    assert "not-installed" not in router.droids
+
+
+def test_route_compact_droids_without_bold_names(tmp_path):
+    """Test that droids installed with --compact, which drops bold markers, route the same."""
+    directory = write_droids(str(tmp_path), {
+        "skill-checker": CHECKER.replace("**", ""),
+        "condition-based-waiting": WAITING,
+        "test-driven-development": "---\ndescription: Use when implementing any feature\n---\n",
+    })
+    router = SkillRouter.build(directory)
+
+    assert router.mandatory == ["test-driven-development"]
+    assert router.route("tests with timeouts")[0].name == "condition-based-waiting"
+
+
+def test_index_persists_until_droids_change(tmp_path):
+    """Test that the saved index is reused and rebuilt when a droid changes."""
+    directory = sample_project(str(tmp_path))
+    SkillRouter.load(str(tmp_path))
+    assert os.path.exists(tmp_path / ".factory" / ".cache" / INDEX_FILE)
+
+    os.remove(os.path.join(directory, "condition-based-waiting.md"))
+    assert SkillRouter.load(str(tmp_path)).route("flaky test") == []
+
+
+def test_route_shipped_droids_under_a_millisecond(repo_root):
+    """Test that the shipped droids route sensibly and queries stay fast."""
+    router = SkillRouter.load(repo_root, persist=False)
+    tasks = {
+        "fix the flaky timeout in the upload test": "condition-based-waiting",
+        "3 independent test failures in different modules": "dispatching-parallel-agents",
+        "share my skill upstream via a pull request": "sharing-skills",
+    }
+    for task, droid in tasks.items():
+        assert router.route(task)[0].name == droid
+
+    started = time.perf_counter()
+    for _ in range(100):
+        router.route("fix the flaky timeout in the upload test")
+    assert (time.perf_counter() - started) / 100 < 0.001
+
+
+def test_main_reports_missing_droids(tmp_path, capsys):
+    """Test that the CLI fails when the project has no droids directory."""
+    assert main(["--root", str(tmp_path), "anything"]) == 1
+    assert "No .factory/droids directory" in capsys.readouterr().out
@@ -0,0 +1,107 @@
+"""Test suite for the droid token cost profiler."""
+
+import json
+import os
+
+from droidpowers.corpus import CorpusIndex
+from droidpowers.tokens import (
+    PREAMBLE,
+    TokenCache,
+    estimate_tokens,
+    gateway_paths,
+    heaviest_sections,
+    main,
+    path_cost,
+    profile_droids,
+)
+
+DROIDS = {
+    "using-droids": "---\nname: using-droids\ndescription: Gateway\n---\n\n# Using Droids\n\n## Overview\nLoad the catalog.\n",
+    "skill-checker": "---\nname: skill-checker\ndescription: Checks skills\n---\n\n# Skill Checker\n\n## Rules\nCheck.\n",
+    "test-driven-development": (
+        "---\nname: test-driven-development\ndescription: Use when implementing\n---\n\n# TDD\n\nIntro.\n\n"
+        "## Cycle\nRed green refactor.\n\n### Red\n" + "Write the failing test first. " * 40 + "\n\n"
+        "### Green\nMinimal code.\n\n## Integration\n- writing-plans\n"
+    ),
+}
+
+
+def write_droids(root, droids=DROIDS):
+    directory = os.path.join(root, ".factory", "droids")
+    os.makedirs(directory, exist_ok=True)
+    for name, text in droids.items():
+        with open(os.path.join(directory, f"{name}.md"), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def test_estimate_tokens_counts_words_punctuation_and_breaks():
+    """Test that short words are one token, long words and digit groups split, and mark runs merge."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Write the test") == 3
+    assert estimate_tokens("rationalization") == 3
+    assert estimate_tokens("2024") == 2
+    assert estimate_tokens("---") == 1
+    assert estimate_tokens("a\n\n    b") == 3
+
+
+def test_sections_add_up_to_droid_total(tmp_path):
+    """Test that sections are counted without their subsections so they sum to the file's tokens."""
+    write_droids(str(tmp_path))
+    costs = profile_droids(CorpusIndex.load(str(tmp_path)))
+
+    tdd = costs["test-driven-development"]
+    titles = [section.title for section in tdd.sections]
+    assert titles == [PREAMBLE, "Cycle", "Cycle > Red", "Cycle > Green", "Integration"]
+    assert sum(section.tokens for section in tdd.sections) == tdd.tokens
+    assert tdd.bytes == len(DROIDS["test-driven-development"].encode("utf-8"))
+    assert heaviest_sections(costs, 1)[0][:2] == ("test-driven-development", "Cycle > Red")
+
+
+def test_routing_paths_count_each_droid_once(tmp_path):
+    """Test that gateway paths chain the gateway droids and custom paths report missing droids."""
+    write_droids(str(tmp_path))
+    costs = profile_droids(CorpusIndex.load(str(tmp_path)))
+
+    (path,) = gateway_paths(costs)
+    assert path.droids == ("using-droids", "skill-checker", "test-driven-development")
+    assert path.tokens == sum(cost.tokens for cost in costs.values())
+
+    custom = path_cost(costs, ["using-droids", "using-droids", "brainstorming"])
+    assert custom.droids == ("using-droids", "brainstorming")
+    assert custom.tokens == costs["using-droids"].tokens and custom.missing == ("brainstorming",)
+
+
+def test_cache_recounts_only_changed_content(tmp_path):
+    """Test that profiles are reused by content hash and stale entries are dropped on save."""
+    root = str(tmp_path)
+    write_droids(root)
+    path = os.path.join(root, ".factory", ".cache", "tokens.json")
+    first = TokenCache(path)
+    profile_droids(CorpusIndex.load(root), first)
+    first.save()
+    assert (first.hits, first.misses) == (0, 3)
+
+    write_droids(root, {"skill-checker": DROIDS["skill-checker"] + "\n## More\nText.\n"})
+    second = TokenCache(path)
+    profile_droids(CorpusIndex.load(root), second)
+    second.save()
+    assert (second.hits, second.misses) == (2, 1)
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)["entries"]) == 3
+
+
+def test_cli_report_and_budget(tmp_path, capsys):
+    """Test that the report lists droids, sections and paths and fails paths over budget."""
+    root = str(tmp_path)
+    write_droids(root)
+
+    assert main([root, "--no-cache"]) == 0
+    out = capsys.readouterr().out
+    assert "using-droids → skill-checker → test-driven-development" in out
+    assert "⚠️" not in out
+
+    assert main([root, "--no-cache", "--section-budget", "100", "--budget", "50", "--json"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["over_budget"] == ["using-droids → skill-checker → test-driven-development"]
+    assert report["heaviest_sections"][0]["title"] == "Cycle > Red"
+    assert not os.path.exists(os.path.join(root, ".factory", ".cache"))
@@ -0,0 +1,114 @@
+"""Test suite for the streaming stack-trace clusterer."""
+
+import gzip
+
+from trace_clusters import TraceClusterer, main, normalize_frame, normalize_message
+
+PYTHON_LOG = """2024-05-01T10:00:01Z ERROR request {n} failed
+Traceback (most recent call last):
+  File "/srv/app/handlers.py", line 42, in handle
+    return load(user_id)
+  File "/srv/app/store.py", line {line}, in load
+    raise KeyError(user_id)
+KeyError: 'user-{n}'
+
+During handling of the above exception, another exception occurred:
+
+Traceback (most recent call last):
+  File "/usr/lib/python3.11/site-packages/flask/app.py", line 900, in dispatch
+    rv = handler()
+NotFound: user {n}
+2024-05-01T10:00:02Z INFO ok
+"""
+
+JAVA_LOG = """2024-05-01T11:00:00Z ERROR [main] Request failed
+java.lang.IllegalStateException: pool closed
+\tat com.acme.db.Pool.get(Pool.java:120)
+Caused by: java.io.IOException: Connection reset by peer 10.0.0.7:5432
+\tat java.base/sun.nio.ch.SocketDispatcher.read0(Native Method)
+\tat com.acme.db.Conn.read(Conn.java:77)
+\t... 12 more
+"""
+
+NODE_LOG = """TypeError: Cannot read properties of undefined (reading 'id')
+    at abortTool (/app/src/agent/abort.ts:88:12)
+    at async runTool (/app/node_modules/.pnpm/runner@1.2.3/node_modules/runner/index.js:10:3)
+"""
+
+
+def cluster(text, **options):
+    return TraceClusterer(**options).feed_all(text.splitlines(keepends=True))
+
+
+def test_normalization_strips_variable_parts():
+    """Test that ids, numbers and install paths do not split clusters."""
+    assert normalize_message("user 'bob' id 42 at 0xdeadbeef req 4f1c2a9e-1111-2222-3333-444455556666") == \
+        "user <str> id <n> at <hex> req <uuid>"
+    frame = normalize_frame("runTool", "/app/node_modules/.pnpm/runner@1.2.3/node_modules/runner/index.js")
+    assert frame.location == "node_modules/runner/index.js"
+    assert normalize_frame("Handler.lambda$handle$3", "Handler.java").function == "Handler.lambda$handle$"
+
+
+def test_chained_python_tracebacks_cluster_on_root_cause():
+    """Test that repeated chained tracebacks form one cluster with the original error as root."""
+    text = "".join(PYTHON_LOG.format(n=n, line=17 + n % 3) for n in range(50))
+    clusterer = cluster(text)
+
+    assert clusterer.events == 50
+    (only,) = clusterer.ranked()
+    assert only.count == 50
+    assert only.error == "KeyError"
+    assert only.template == "<str>"
+    assert str(only.cause) == "load @ srv/app/store.py"
+    assert only.first_seen == "2024-05-01T10:00:01Z"
+    assert only.first_line == 1
+
+
+def test_java_and_node_causal_frames_skip_library_code():
+    """Test that the causal frame is the innermost application frame of the root cause."""
+    clusters = {c.error: c for c in cluster(JAVA_LOG + NODE_LOG).ranked()}
+
+    java = clusters["java.io.IOException"]
+    assert str(java.cause) == "com.acme.db.Conn.read @ Conn.java"
+    assert java.template == "Connection reset by peer <n>.<n>:<n>"
+    node = clusters["TypeError"]
+    assert str(node.cause) == "abortTool @ src/agent/abort.ts"
+    assert [f.function for f in node.frames] == ["abortTool", "runTool"]
+
+
+def test_addresses_in_ordinary_lines_are_not_frames():
+    """Test that "at host:port" in INFO lines neither starts nor extends a cluster."""
+    text = (
+        "2024-05-01T09:00:00Z INFO Server listening at 0.0.0.0:8080\n"
+        "2024-05-01T09:00:01Z INFO meeting at 10:30\n"
+        "2024-05-01T09:00:02Z INFO connected to db at 10.0.0.7:5432\n"
+        "    at 127.0.0.1:9000\n"
+    )
+    clusterer = cluster(text * 100)
+
+    assert clusterer.events == 0
+    assert clusterer.ranked() == []
+
+
+def test_cluster_table_is_bounded():
+    """Test that distinct signatures beyond the limit are counted, not stored."""
+    text = "".join(f"ERROR worker crashed\nValueError: bad\n    at job{n} (/app/job{n}.js:1:1)\n" for n in range(20))
+    clusterer = cluster(text, max_clusters=5)
+
+    assert len(clusterer.clusters) == 5
+    assert clusterer.overflow == 15
+    assert clusterer.events == 20
+
+
+def test_cli_reads_gzip_and_prints_compact_summary(tmp_path, capsys):
+    """Test that the CLI streams compressed logs and ranks clusters by count."""
+    path = tmp_path / "app.log.gz"
+    with gzip.open(path, "wt") as f:
+        f.write(NODE_LOG + PYTHON_LOG.format(n=1, line=17) + PYTHON_LOG.format(n=2, line=17))
+
+    assert main([str(path), "--top", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "3 errors, 2 clusters" in out
+    assert "#1 ×2 KeyError: <str>" in out
+    assert "cause: load @ srv/app/store.py" in out
+    assert "1 more clusters (1 errors)" in out
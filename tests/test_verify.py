@@ -0,0 +1,70 @@
+"""Test suite for the multi-project verification engine."""
+
+import json
+import os
+import shutil
+
+from droidpowers.checks import COMMAND_MAPPINGS, REQUIRED_DROIDS
+from droidpowers.verify import discover_projects, main, verify_projects
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def install_copy(target):
+    shutil.copytree(os.path.join(REPO_ROOT, ".factory"), os.path.join(target, ".factory"),
+                    ignore=shutil.ignore_patterns(".cache"))
+
+
+def test_discover_projects_streams_nested_trees(tmp_path):
+    """Test that every directory holding .factory is discovered once."""
+    for service in ("svc-a", "svc-b", "group/svc-c"):
+        (tmp_path / service / ".factory").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / ".factory").mkdir(parents=True)
+    (tmp_path / "plain").mkdir()
+
+    found = sorted(os.path.relpath(p, tmp_path) for p in discover_projects([str(tmp_path), str(tmp_path / "svc-a")]))
+
+    assert found == ["group/svc-c", "svc-a", "svc-b"]
+
+
+def test_discover_projects_expands_globs(tmp_path):
+    """Test that glob patterns select matching roots only."""
+    for service in ("svc-a", "svc-b", "other"):
+        (tmp_path / service / ".factory").mkdir(parents=True)
+
+    found = sorted(os.path.basename(p) for p in discover_projects([str(tmp_path / "svc-*")]))
+
+    assert found == ["svc-a", "svc-b"]
+
+
+def test_verify_projects_merges_reports(tmp_path):
+    """Test that results from several projects are merged into one report."""
+    install_copy(str(tmp_path / "good"))
+    install_copy(str(tmp_path / "broken"))
+    os.remove(tmp_path / "broken" / ".factory" / "droids" / "brainstorming.md")
+
+    report = verify_projects([str(tmp_path)], jobs=2, use_cache=False)
+
+    by_name = {os.path.basename(p.root): p for p in report.projects}
+    assert not report.ok
+    assert len(by_name["good"].results) == len(REQUIRED_DROIDS) + len(COMMAND_MAPPINGS)
+    assert not by_name["good"].failures
+    assert [r.message for r in by_name["broken"].failures] == ["Missing droid: brainstorming"]
+
+
+def test_main_json_report(tmp_path, capsys):
+    """Test that the entry point prints a JSON report and exit status."""
+    install_copy(str(tmp_path / "svc"))
+
+    status = main([str(tmp_path), "--json", "--jobs", "1"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert status == 0
+    assert report["ok"] is True
+    assert len(report["projects"]) == 1
+
+
+def test_main_fails_without_projects(tmp_path, capsys):
+    """Test that finding no .factory tree is reported as a failure."""
+    assert main([str(tmp_path), "--jobs", "1"]) == 1
+    assert "No .factory directories found" in capsys.readouterr().out
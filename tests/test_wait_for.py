@@ -0,0 +1,101 @@
+"""Test suite for the condition-based waiting helpers."""
+
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+from wait_for import Signal, WaitTimeout, set_reporter, wait_for, wait_for_file, wait_for_readable
+
+
+def later(delay, action):
+    timer = threading.Timer(delay, action)
+    timer.start()
+    return timer
+
+
+def test_wait_for_returns_first_truthy_result():
+    """Test that the condition's value is returned and checks back off."""
+    calls = []
+    recorded = []
+
+    result = wait_for(lambda: calls.append(1) or (len(calls) >= 4 and "ready"), "four calls",
+                      on_complete=recorded.append)
+
+    assert result == "ready"
+    assert recorded[0].satisfied and recorded[0].checks == 4 and recorded[0].mode == "poll"
+
+
+def test_wait_for_timeout_carries_stats():
+    """Test that a timeout raises with the wait's instrumentation attached."""
+    seen = []
+    set_reporter(seen.append)
+    try:
+        with pytest.raises(WaitTimeout) as error:
+            wait_for(lambda: False, "never", timeout=0.05)
+    finally:
+        set_reporter(None)
+
+    assert "Timeout waiting for never" in str(error.value)
+    assert error.value.stats == seen[0]
+    assert not seen[0].satisfied and seen[0].checks > 1
+
+
+def test_signal_wakes_without_polling():
+    """Test that an event wait checks only when the signal fires."""
+    box = []
+    with Signal() as done:
+        later(0.05, lambda: (box.append("event"), done.notify()))
+        recorded = []
+
+        assert wait_for(lambda: box, "event", timeout=2, wake=[done], on_complete=recorded.append) == ["event"]
+
+    assert recorded[0].mode == "event"
+    assert recorded[0].checks == 2 and recorded[0].wakes == 1
+
+
+def test_wait_for_file_wakes_on_creation(tmp_path):
+    """Test that waiting for a file returns once it is written."""
+    path = str(tmp_path / "ready.flag")
+    later(0.05, lambda: open(path, "w").close())
+    recorded = []
+
+    assert wait_for_file(path, timeout=2, on_complete=recorded.append) == path
+    assert recorded[0].satisfied
+    if sys.platform.startswith("linux"):
+        assert recorded[0].mode == "event"
+
+
+def test_wait_for_readable_socket():
+    """Test that a socket wait returns when data arrives."""
+    left, right = socket.socketpair()
+    with left, right:
+        later(0.02, lambda: right.sendall(b"x"))
+
+        assert wait_for_readable(left, timeout=2) is left
+        assert left.recv(1) == b"x"
+
+
+def test_wait_for_readable_signal_is_not_drained():
+    """Test that a notified Signal is seen as readable and keeps its wake-up."""
+    with Signal() as done:
+        later(0.05, done.notify)
+        recorded = []
+
+        assert wait_for_readable(done, timeout=2, on_complete=recorded.append) is done
+        assert os.read(done.fileno(), 1) == b"\0"
+
+    assert recorded[0].satisfied and recorded[0].wakes == 1
+
+
+def test_wait_for_file_missing_directory_falls_back_to_polling(tmp_path):
+    """Test that a file in a directory that does not exist yet is still found."""
+    path = str(tmp_path / "later" / "ready.flag")
+    later(0.05, lambda: (os.makedirs(os.path.dirname(path)), open(path, "w").close()))
+    recorded = []
+
+    wait_for_file(path, timeout=2, on_complete=recorded.append)
+
+    assert recorded[0].mode == "poll"
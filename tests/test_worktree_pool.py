@@ -0,0 +1,150 @@
+"""Test suite for the pre-warmed worktree pool."""
+
+import os
+import subprocess
+
+import pytest
+
+from worktree_pool import WorktreePool, detect_shared, has_editable_installs, share_tree
+
+
+@pytest.fixture
+def repo(git_repo, git):
+    root = git_repo
+    (root / "package.json").write_text("{}")
+    (root / ".gitignore").write_text("node_modules/\n.worktrees/\n")
+    git(root, "add", ".")
+    git(root, "commit", "-q", "-m", "initial")
+    (root / "node_modules" / "left-pad").mkdir(parents=True)
+    (root / "node_modules" / "left-pad" / "index.js").write_text("module.exports = 1;\n")
+    return str(root)
+
+
+def test_share_tree_links_files(tmp_path):
+    """Test that shared trees reuse the source files instead of copying data."""
+    src = tmp_path / "src"
+    (src / "pkg").mkdir(parents=True)
+    (src / "pkg" / "a.js").write_text("a")
+    os.symlink("pkg/a.js", src / "alias.js")
+
+    counts = share_tree(str(src), str(tmp_path / "dest"), "hardlink")
+
+    assert counts == {"hardlink": 1, "symlink": 1}
+    assert os.stat(src / "pkg" / "a.js").st_ino == os.stat(tmp_path / "dest" / "pkg" / "a.js").st_ino
+    assert os.readlink(tmp_path / "dest" / "alias.js") == "pkg/a.js"
+
+
+def test_detect_shared_directories(repo):
+    """Test that dependency directories are detected from project markers."""
+    venv = os.path.join(repo, ".venv")
+    os.makedirs(venv)
+    with open(os.path.join(repo, "pyproject.toml"), "w") as f:
+        f.write("[project]\n")
+
+    assert detect_shared(repo) == ["node_modules"]
+
+
+def test_venv_with_editable_installs_is_not_shared(repo):
+    """Test that an explicitly shared venv importing the main checkout is skipped."""
+    site = os.path.join(repo, ".venv", "lib", "python3", "site-packages")
+    os.makedirs(site)
+    assert not has_editable_installs(os.path.join(repo, ".venv"), repo)
+    with open(os.path.join(site, "__editable__.app-1.0.pth"), "w") as f:
+        f.write(os.path.join(repo, "src") + "\n")
+    assert has_editable_installs(os.path.join(repo, ".venv"), repo)
+
+    pool = WorktreePool(repo, shared=[".venv", "node_modules"], link_mode="copy")
+    path = pool.checkout()
+
+    assert not os.path.exists(os.path.join(path, ".venv"))
+    assert os.path.exists(os.path.join(path, "node_modules", "left-pad", "index.js"))
+    assert list(pool.skipped) == [".venv"]
+
+
+def test_default_mode_never_hardlinks(repo):
+    """Test that without reflink support directories are skipped rather than hardlinked."""
+    pool = WorktreePool(repo)
+    path = pool.checkout()
+
+    shared = os.path.join(path, "node_modules", "left-pad", "index.js")
+    original = os.path.join(repo, "node_modules", "left-pad", "index.js")
+    if "node_modules" in pool.skipped:
+        assert not os.path.exists(shared)
+    else:
+        assert os.stat(shared).st_ino != os.stat(original).st_ino
+
+
+def test_checkout_hands_out_warm_worktree(repo, git):
+    """Test that a leased worktree is on the branch with dependencies present."""
+    pool = WorktreePool(repo, link_mode="hardlink")
+    assert len(pool.fill(2)) == 2
+
+    path = pool.checkout("feature/login")
+
+    assert git(path, "branch", "--show-current").strip() == "feature/login"
+    assert os.path.exists(os.path.join(path, "node_modules", "left-pad", "index.js"))
+    statuses = sorted(entry["status"] for entry in pool.status().values())
+    assert statuses == ["leased", "ready"]
+
+
+def test_release_resets_worktree(repo):
+    """Test that released worktrees are cleaned but keep shared directories."""
+    pool = WorktreePool(repo, link_mode="copy")
+    path = pool.checkout("scratch")
+    with open(os.path.join(path, "stray.txt"), "w") as f:
+        f.write("leftover")
+    with open(os.path.join(path, "package.json"), "w") as f:
+        f.write('{"edited": true}')
+
+    pool.release(path)
+
+    assert not os.path.exists(os.path.join(path, "stray.txt"))
+    with open(os.path.join(path, "package.json")) as f:
+        assert f.read() == "{}"
+    assert os.path.isdir(os.path.join(path, "node_modules"))
+    assert [entry["status"] for entry in pool.status().values()] == ["ready"]
+
+
+def test_prune_keeps_leased_worktrees(repo):
+    """Test that prune removes ready worktrees and leaves leased ones."""
+    pool = WorktreePool(repo)
+    pool.fill(2)
+    leased = pool.checkout()
+
+    assert pool.prune() == 1
+    assert os.path.isdir(leased)
+    assert list(pool.status().values())[0]["status"] == "leased"
+
+
+def broken_reset(*args, **kwargs):
+    raise subprocess.CalledProcessError(128, ["git", "checkout", "--force", "-B", "taken"])
+
+
+def test_failed_checkout_does_not_strand_the_lease(repo, monkeypatch):
+    """Test that a git failure returns warm entries and drops cold ones."""
+    pool = WorktreePool(repo)
+    pool.fill(1)
+    monkeypatch.setattr(pool, "_reset", broken_reset)
+
+    with pytest.raises(subprocess.CalledProcessError):
+        pool.checkout("taken")
+    assert [entry["status"] for entry in pool.status().values()] == ["ready"]
+
+    pool.prune()
+    with pytest.raises(subprocess.CalledProcessError):
+        pool.checkout("taken")
+    assert pool.status() == {}
+    assert set(os.listdir(pool.pool_dir)) <= {"pool.lock", "pool.json"}
+
+
+def test_failed_release_does_not_strand_the_lease(repo, monkeypatch):
+    """Test that a worktree whose reset fails on release can be pruned."""
+    pool = WorktreePool(repo)
+    path = pool.checkout("scratch")
+    monkeypatch.setattr(pool, "_reset", broken_reset)
+
+    with pytest.raises(subprocess.CalledProcessError):
+        pool.release(path)
+
+    assert [entry["status"] for entry in pool.status().values()] == ["ready"]
+    assert pool.prune() == 1